@@ -7,9 +7,39 @@ NO tiene valores por defecto hardcodeados.
 Documentación oficial: https://doc.evolution-api.com/v2/
 """
 import os
+import re
+from functools import lru_cache
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, Dict, List, Any
 
+# Conexiones keep-alive por cliente
+_POOL_SIZE = int(os.getenv('EVOLUTION_HTTP_POOL') or 20)
+
+# Todo lo que no es dígito (espacios, guiones, paréntesis, '+', etc.)
+_NON_DIGITS = re.compile(r'\D+')
+
+
+@lru_cache(maxsize=8192)
+def _format_phone(phone: str, country_code: str) -> str:
+    """
+    Formatea un número al formato de WhatsApp (memoizado por número y país).
+
+    Los envíos suelen repetirse a un conjunto pequeño de destinatarios; la
+    función es pura, así que se comparte entre todos los clientes.
+    """
+    # Limpiar espacios y caracteres especiales en una sola pasada
+    phone = _NON_DIGITS.sub('', phone)
+
+    # Si ya tiene código de país, retornar
+    if phone.startswith(country_code):
+        return phone
+
+    # Agregar código de país
+    return f"{country_code}{phone}"
+
 
 class EvolutionClient:
     """
@@ -56,6 +86,45 @@ class EvolutionClient:
             "Content-Type": "application/json"
         }
 
+        # Sesión HTTP del cliente: reutiliza conexiones (keep-alive) para no
+        # repetir el handshake TCP+TLS en cada envío. GET/PUT/DELETE se
+        # reintentan ante 502/503/504; los POST (envíos) nunca se reintentan.
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=_POOL_SIZE,
+            pool_maxsize=_POOL_SIZE,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                raise_on_status=False
+            )
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+    def close(self) -> None:
+        """
+        Cierra las conexiones abiertas del cliente.
+
+        También se puede usar el cliente como context manager.
+
+        Example:
+            >>> client = EvolutionClient()
+            >>> client.close()
+            >>>
+            >>> with EvolutionClient() as client:
+            ...     client.list_instances()
+        """
+        self._session.close()
+
+    def __enter__(self) -> 'EvolutionClient':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def _request(
         self,
         method: str,
@@ -82,10 +151,9 @@ class EvolutionClient:
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
 
         try:
-            response = requests.request(
+            response = self._session.request(
                 method=method,
                 url=url,
-                headers=self.headers,
                 json=data,
                 params=params,
                 timeout=self.timeout
@@ -433,15 +501,7 @@ class EvolutionClient:
             >>> formatted = client._format_phone_number("5512345678")
             >>> print(formatted)  # "5215512345678"
         """
-        # Limpiar espacios y caracteres especiales
-        phone = ''.join(filter(str.isdigit, phone))
-
-        # Si ya tiene código de país, retornar
-        if phone.startswith(country_code):
-            return phone
-
-        # Agregar código de país
-        return f"{country_code}{phone}"
+        return _format_phone(phone, country_code)
 
     def is_instance_connected(self, instance_name: str) -> bool:
         """
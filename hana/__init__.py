@@ -10,6 +10,8 @@ Este módulo proporciona funciones organizadas según el estándar SQL:
 # DML - Data Manipulation Language (hana_dml.py)
 from .hana_dml import (
     get_hana_connection,
+    init_hana_pool,
+    close_hana_pool,
     insert,
     insert_many,
     select,
@@ -65,6 +67,8 @@ from .hana_dcl import (
 __all__ = [
     # Conexión
     "get_hana_connection",
+    "init_hana_pool",
+    "close_hana_pool",
 
     # === DML - Data Manipulation Language ===
     "insert",
@@ -10,6 +10,141 @@ Las credenciales se pasan como parámetros o se leen de variables de entorno.
 from hdbcli import dbapi
 from typing import Any, Dict, List, Optional, Tuple
 import os
+import queue
+
+
+# Pool opcional de conexiones (se activa con init_hana_pool)
+_POOL: queue.Queue | None = None
+_POOL_CONFIG: Dict[str, Any] = {}
+
+
+class _PooledConnection:
+    """
+    Conexión prestada del pool: close() la regresa al pool en vez de cerrarla.
+    """
+
+    def __init__(self, conn: dbapi.Connection, pool: queue.Queue, schema_set: bool):
+        self._conn = conn
+        self._pool = pool
+        self._schema_set = schema_set
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+
+        try:
+            # Dejar la conexión como recién abierta para el siguiente uso
+            conn.rollback()
+            conn.setautocommit(True)
+            if self._schema_set:
+                cursor = conn.cursor()
+                cursor.execute(f"SET SCHEMA {_POOL_CONFIG['default_schema']}")
+                cursor.close()
+        except Exception:
+            conn.close()
+            conn = None
+
+        if self._pool is _POOL:
+            self._pool.put(conn)
+        elif conn is not None:
+            conn.close()
+
+
+def _connect(host: str, port: int, user: str, password: str) -> dbapi.Connection:
+    return dbapi.connect(
+        address=host,
+        port=port,
+        user=user,
+        password=password
+    )
+
+
+def init_hana_pool(
+    size: int = 4,
+    host: str | None = None,
+    port: int | None = None,
+    user: str | None = None,
+    password: str | None = None
+) -> None:
+    """
+    Abre un pool de conexiones reutilizado por todas las funciones del módulo.
+
+    Mientras el pool esté activo, get_hana_connection() sin credenciales
+    explícitas presta una conexión abierta en lugar de hacer un nuevo
+    handshake con HANA; al cerrarla vuelve al pool. Si todas están en uso,
+    se abre una conexión adicional con las mismas credenciales, que se
+    cierra normalmente.
+
+    Args:
+        size: Número de conexiones del pool (default: 4)
+        host: Host del servidor HANA (opcional, lee de SAP_HANA_HOST si es None)
+        port: Puerto del servidor (opcional, lee de SAP_HANA_PORT si es None)
+        user: Usuario de HANA (opcional, lee de SAP_HANA_USER si es None)
+        password: Contraseña (opcional, lee de SAP_HANA_PASSWORD si es None)
+
+    Example:
+        init_hana_pool(size=4)
+        registros = select('PRODUCTOS', schema='MI_SCHEMA')
+        close_hana_pool()
+    """
+    global _POOL, _POOL_CONFIG
+
+    close_hana_pool()
+
+    config = {
+        'host': host or os.getenv('SAP_HANA_HOST'),
+        'port': port or int(os.getenv('SAP_HANA_PORT', '30015')),
+        'user': user or os.getenv('SAP_HANA_USER'),
+        'password': password or os.getenv('SAP_HANA_PASSWORD')
+    }
+    if not config['host'] or not config['user'] or not config['password']:
+        raise ValueError(
+            "Credenciales de SAP HANA no configuradas. "
+            "Proporcione los parámetros host, user y password, "
+            "o configure las variables de entorno: "
+            "SAP_HANA_HOST, SAP_HANA_USER, SAP_HANA_PASSWORD"
+        )
+
+    pool: queue.Queue = queue.Queue(maxsize=size)
+    for _ in range(size):
+        pool.put(_connect(**config))
+
+    # Schema por defecto de la sesión, para restaurarlo al devolver conexiones
+    conn = pool.get()
+    cursor = conn.cursor()
+    cursor.execute("SELECT CURRENT_SCHEMA FROM DUMMY")
+    config['default_schema'] = cursor.fetchone()[0]
+    cursor.close()
+    pool.put(conn)
+
+    _POOL_CONFIG = config
+    _POOL = pool
+
+
+def close_hana_pool() -> None:
+    """
+    Cierra todas las conexiones del pool y lo desactiva.
+
+    Example:
+        close_hana_pool()
+    """
+    global _POOL
+
+    pool, _POOL = _POOL, None
+    if pool is None:
+        return
+
+    while True:
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            break
+        if conn is not None:
+            conn.close()
 
 
 def get_hana_connection(
@@ -22,6 +157,9 @@ def get_hana_connection(
     """
     Obtiene conexión a SAP HANA.
 
+    Si hay un pool activo (init_hana_pool) y no se pasan credenciales, la
+    conexión se toma del pool y close() la devuelve.
+
     Args:
         schema: Nombre del schema (opcional)
         host: Host del servidor HANA (opcional, lee de SAP_HANA_HOST si es None)
@@ -45,6 +183,39 @@ def get_hana_connection(
             password='mi_password'
         )
     """
+    # Prestar conexión del pool si está activo
+    pool = _POOL
+    if pool is not None and not (host or port or user or password):
+        config = _POOL_CONFIG
+        try:
+            connection = pool.get_nowait()
+        except queue.Empty:
+            # Todas prestadas: conexión adicional con las credenciales del pool
+            # (no vuelve al pool; close() la cierra)
+            connection = _connect(config['host'], config['port'], config['user'], config['password'])
+            if schema:
+                try:
+                    cursor = connection.cursor()
+                    cursor.execute(f"SET SCHEMA {schema}")
+                    cursor.close()
+                except Exception:
+                    connection.close()
+                    raise
+            return connection
+
+        if connection is None:
+            connection = _connect(config['host'], config['port'], config['user'], config['password'])
+        pooled = _PooledConnection(connection, pool, bool(schema))
+        if schema:
+            try:
+                cursor = connection.cursor()
+                cursor.execute(f"SET SCHEMA {schema}")
+                cursor.close()
+            except Exception:
+                pooled.close()
+                raise
+        return pooled
+
     # Leer de parámetros o variables de entorno
     host = host or os.getenv('SAP_HANA_HOST')
     port = port or int(os.getenv('SAP_HANA_PORT', '30015'))
@@ -59,12 +230,7 @@ def get_hana_connection(
             "SAP_HANA_HOST, SAP_HANA_USER, SAP_HANA_PASSWORD"
         )
 
-    connection = dbapi.connect(
-        address=host,
-        port=port,
-        user=user,
-        password=password
-    )
+    connection = _connect(host, port, user, password)
 
     # Establecer schema si se proporciona
     if schema:
@@ -128,6 +294,10 @@ def insert_many(
     """
     Inserta múltiples registros en una tabla por lotes.
 
+    Cada lote se envía con un solo executemany (array binding de hdbcli) y
+    todos los lotes se confirman en una sola transacción: si uno falla, no
+    se inserta ninguno.
+
     Args:
         table: Nombre de la tabla
         columns: Lista de nombres de columnas
@@ -159,14 +329,20 @@ def insert_many(
         placeholders = ', '.join(['?' for _ in columns])
         query = f'INSERT INTO "{table}" ({columns_str}) VALUES ({placeholders})'
 
+        # Una sola transacción para todos los lotes (hdbcli usa autocommit)
+        conn.setautocommit(False)
+
         # Insertar por lotes
         for i in range(0, len(values_list), batch_size):
             batch = values_list[i:i + batch_size]
             cursor.executemany(query, batch)
-            conn.commit()
             total_inserted += cursor.rowcount
 
+        conn.commit()
         return total_inserted
+    except Exception:
+        conn.rollback()
+        raise
     finally:
         cursor.close()
         conn.close()
@@ -16,7 +16,8 @@ Requiere: pip install ldap3
 from .ldap_connection import (
     get_ldap_connection,
     test_ldap_connection,
-    close_ldap_connection
+    close_ldap_connection,
+    ldap_session
 )
 
 # AUTH - Autenticación
@@ -34,6 +35,8 @@ from .ldap_search import (
     search_custom,
     find_user_by_username,
     find_group_by_name,
+    find_users_by_usernames,
+    find_groups_by_names,
     get_user_groups,
     get_group_members
 )
@@ -65,6 +68,7 @@ from .ldap_groups import (
 # OUS - Gestión de unidades organizativas
 from .ldap_ous import (
     create_ou,
+    create_ous,
     delete_ou,
     update_ou,
     move_ou,
@@ -78,6 +82,7 @@ __all__ = [
     "get_ldap_connection",
     "test_ldap_connection",
     "close_ldap_connection",
+    "ldap_session",
 
     # === AUTH - Autenticación ===
     "authenticate_user",
@@ -91,6 +96,8 @@ __all__ = [
     "search_custom",
     "find_user_by_username",
     "find_group_by_name",
+    "find_users_by_usernames",
+    "find_groups_by_names",
     "get_user_groups",
     "get_group_members",
 
@@ -116,6 +123,7 @@ __all__ = [
 
     # === OUS - Gestión de unidades organizativas ===
     "create_ou",
+    "create_ous",
     "delete_ou",
     "update_ou",
     "move_ou",
@@ -0,0 +1,87 @@
+"""
+Caché en memoria para verificaciones de existencia (user/group/ou_exists).
+
+Guarda resultados positivos y negativos durante LDAP_CACHE_TTL segundos.
+Con LDAP_CACHE_TTL=0 (default) la caché está desactivada y cada verificación
+consulta al servidor.
+"""
+import os
+import time
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class ExistsCache:
+    """Diccionario con expiración por entrada (reloj monotónico)."""
+
+    def __init__(self, ttl: float = 0):
+        self._d: Dict[Hashable, Tuple[float, bool]] = {}
+        self._ttl = ttl
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0
+
+    def get(self, key: Hashable) -> Optional[bool]:
+        """Retorna el valor guardado, o None si no existe o ya expiró."""
+        with self._lock:
+            item = self._d.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if time.monotonic() >= expires:
+                del self._d[key]
+                return None
+            return value
+
+    def put(self, key: Hashable, value: bool) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._d[key] = (time.monotonic() + self._ttl, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._d.clear()
+
+
+exists_cache = ExistsCache(ttl=float(os.getenv('LDAP_CACHE_TTL') or 0))
+
+
+def user_key(username: str, username_attr: str = 'sAMAccountName', base_dn: Optional[str] = None) -> tuple:
+    return ('user', username_attr.lower(), username.lower(), base_dn)
+
+
+def group_key(group_name: str, base_dn: Optional[str] = None) -> tuple:
+    return ('group', group_name.lower(), base_dn)
+
+
+def ou_key(ou_name: str, parent_ou: Optional[str] = None, base_dn: Optional[str] = None) -> tuple:
+    return ('ou', ou_name.lower(), (parent_ou or '').lower(), base_dn)
+
+
+def cached_exists(key_func: Callable[..., tuple]) -> Callable:
+    """
+    Decorador para funciones *_exists que consulta exists_cache antes de ir al servidor.
+
+    Args:
+        key_func: Función con la misma firma que la decorada que construye la llave
+    """
+    def decorator(func: Callable[..., bool]) -> Callable[..., bool]:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> bool:
+            if not exists_cache.enabled:
+                return func(*args, **kwargs)
+
+            key = key_func(*args, **kwargs)
+            cached = exists_cache.get(key)
+            if cached is not None:
+                return cached
+
+            result = func(*args, **kwargs)
+            exists_cache.put(key, result)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,23 @@
+"""Utilidades internas para leer resultados de búsqueda LDAP."""
+from typing import Any, Dict
+
+
+def first(entry: Dict[str, Any], key: str, default: Any = 'N/A') -> Any:
+    """
+    Retorna el primer valor de un atributo, sea escalar o lista.
+
+    Args:
+        entry: Diccionario de resultado (search_users, search_groups, ...)
+        key: Nombre del atributo
+        default: Valor si el atributo no existe o está vacío
+
+    Example:
+        >>> first({'cn': ['Juan Pérez']}, 'cn')
+        'Juan Pérez'
+        >>> first({'mail': None}, 'mail')
+        'N/A'
+    """
+    value = entry.get(key)
+    if isinstance(value, (list, tuple)):
+        return value[0] if value else default
+    return default if value is None else value
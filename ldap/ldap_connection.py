@@ -7,8 +7,24 @@ usando variables de entorno o parámetros explícitos.
 Requiere: pip install ldap3
 """
 import os
-from typing import Optional
-from ldap3 import Server, Connection, ALL, SIMPLE, NTLM, ANONYMOUS
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from ldap3 import Server, Connection, ALL, SIMPLE, NTLM, ANONYMOUS, RESTARTABLE
+from ldap3.core.exceptions import LDAPBindError
+
+
+# Conexión compartida activa dentro de un bloque ldap_session()
+_shared_connection: ContextVar[Optional[Connection]] = ContextVar(
+    '_shared_connection', default=None
+)
+
+# Parámetros que obligan a abrir una conexión distinta a la compartida
+_EXPLICIT_PARAMS = ('server', 'port', 'use_ssl', 'bind_dn', 'bind_password', 'client_strategy')
+
+# Reintentos de la conexión de sesión si el servidor la cierra por inactividad
+_RESTARTABLE_TRIES = 3
+_RESTARTABLE_SLEEPTIME = 1
 
 
 def get_ldap_connection(
@@ -19,7 +35,8 @@ def get_ldap_connection(
     bind_password: Optional[str] = None,
     base_dn: Optional[str] = None,
     auth_type: str = 'SIMPLE',
-    auto_bind: bool = True
+    auto_bind: bool = True,
+    client_strategy: Optional[str] = None
 ) -> Connection:
     """
     Obtiene conexión a servidor LDAP/Active Directory.
@@ -35,6 +52,7 @@ def get_ldap_connection(
         base_dn: Base DN para búsquedas (ej: 'DC=empresa,DC=com')
         auth_type: Tipo de autenticación ('SIMPLE', 'NTLM', 'ANONYMOUS')
         auto_bind: Si True, realiza bind automáticamente
+        client_strategy: Estrategia de ldap3 (ej: ASYNC); default SYNC
 
     Returns:
         Objeto Connection de ldap3
@@ -67,7 +85,19 @@ def get_ldap_connection(
     Raises:
         ValueError: Si faltan parámetros requeridos
         LDAPException: Si falla la conexión
+
+    Nota:
+        Dentro de un bloque ldap_session() se retorna la conexión compartida
+        cuando no se pasan credenciales ni servidor explícitos.
     """
+    shared = _shared_connection.get()
+    if (
+        shared is not None
+        and auto_bind
+        and not (server or port or use_ssl or bind_dn or bind_password or client_strategy)
+    ):
+        return shared
+
     # Obtener configuración de variables de entorno o parámetros
     ldap_server = server or os.getenv('LDAP_SERVER')
     ldap_port = port or (int(os.getenv('LDAP_PORT')) if os.getenv('LDAP_PORT') else None)
@@ -131,7 +161,8 @@ def get_ldap_connection(
         user=ldap_bind_dn,
         password=ldap_bind_password,
         authentication=auth_method,
-        auto_bind=auto_bind
+        auto_bind=auto_bind,
+        **({'client_strategy': client_strategy} if client_strategy else {})
     )
 
     return conn
@@ -191,7 +222,7 @@ def test_ldap_connection(
             'user': conn.user
         }
 
-        conn.unbind()
+        close_ldap_connection(conn)
 
         return {
             'success': True,
@@ -220,5 +251,56 @@ def close_ldap_connection(conn: Connection) -> None:
         >>> finally:
         ...     close_ldap_connection(conn)
     """
-    if conn and conn.bound:
+    if conn is None or conn is _shared_connection.get():
+        return
+    if conn.bound:
+        conn.unbind()
+
+
+@contextmanager
+def ldap_session(**kwargs) -> Iterator[Connection]:
+    """
+    Mantiene una sola conexión LDAP abierta durante un bloque.
+
+    Dentro del bloque, las funciones del módulo que llaman a
+    get_ldap_connection() sin servidor ni credenciales explícitas reutilizan
+    esta conexión en lugar de abrir una nueva (TCP + TLS + bind) por operación,
+    y close_ldap_connection() no la cierra. Se cierra al salir del bloque.
+
+    La conexión usa la estrategia RESTARTABLE de ldap3: si el servidor la
+    cierra durante una pausa larga, se reabre y se repite el bind en la
+    siguiente operación.
+
+    Args:
+        **kwargs: Parámetros de get_ldap_connection() (server, port, use_ssl, ...)
+
+    Yields:
+        Objeto Connection compartido
+
+    Example:
+        >>> with ldap_session():
+        ...     search_users(limit=5)
+        ...     find_user_by_username('jperez')
+    """
+    shared = _shared_connection.get()
+    if shared is not None and not any(kwargs.get(name) for name in _EXPLICIT_PARAMS):
+        # Sesión anidada: reutilizar la sesión externa
+        yield shared
+        return
+
+    # RESTARTABLE reabre y vuelve a hacer bind si el servidor cerró la conexión
+    kwargs.pop('auto_bind', None)
+    kwargs.pop('client_strategy', None)
+    conn = get_ldap_connection(**kwargs, client_strategy=RESTARTABLE, auto_bind=False)
+    conn.strategy.restartable_tries = _RESTARTABLE_TRIES
+    conn.strategy.restartable_sleep_time = _RESTARTABLE_SLEEPTIME
+    if not conn.bind():
         conn.unbind()
+        raise LDAPBindError(f"Error en bind: {conn.result}")
+
+    token = _shared_connection.set(conn)
+    try:
+        yield conn
+    finally:
+        _shared_connection.reset(token)
+        close_ldap_connection(conn)
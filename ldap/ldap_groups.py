@@ -9,6 +9,7 @@ from typing import Optional, List
 from ldap3.core.exceptions import LDAPException
 from ldap3 import MODIFY_REPLACE, MODIFY_ADD, MODIFY_DELETE
 from .ldap_connection import get_ldap_connection, close_ldap_connection
+from ._cache import exists_cache, cached_exists, group_key
 
 
 def create_group(
@@ -77,6 +78,8 @@ def create_group(
         if not success:
             raise LDAPException(f"Error creando grupo: {conn.result}")
 
+        exists_cache.put(group_key(group_name, base_dn), True)
+
         return True
 
     except LDAPException as e:
@@ -126,6 +129,8 @@ def delete_group(
         if not success:
             raise LDAPException(f"Error eliminando grupo: {conn.result}")
 
+        exists_cache.put(group_key(group_name, base_dn), False)
+
         return True
 
     except LDAPException as e:
@@ -421,6 +426,8 @@ def update_group(
             if not success:
                 raise LDAPException(f"Error renombrando grupo: {conn.result}")
 
+        exists_cache.clear()
+
         return True
 
     except LDAPException as e:
@@ -430,6 +437,7 @@ def update_group(
             close_ldap_connection(conn)
 
 
+@cached_exists(group_key)
 def group_exists(
     group_name: str,
     base_dn: Optional[str] = None
@@ -5,10 +5,11 @@ Este módulo proporciona funciones CRUD para gestionar OUs.
 
 ⚠️ ADVERTENCIA: Las operaciones de modificación requieren permisos de administrador.
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from ldap3.core.exceptions import LDAPException
 from ldap3 import MODIFY_REPLACE
 from .ldap_connection import get_ldap_connection, close_ldap_connection
+from ._cache import exists_cache, cached_exists, ou_key
 
 
 def create_ou(
@@ -68,6 +69,8 @@ def create_ou(
         if not success:
             raise LDAPException(f"Error creando OU: {conn.result}")
 
+        exists_cache.put(ou_key(ou_name, parent_ou, base_dn), True)
+
         return True
 
     except LDAPException as e:
@@ -77,6 +80,70 @@ def create_ou(
             close_ldap_connection(conn)
 
 
+def create_ous(
+    ous: List[Tuple[str, Optional[str]]],
+    parent_ou: Optional[str] = None,
+    base_dn: Optional[str] = None
+) -> Dict[str, bool]:
+    """
+    Crea varias OUs bajo el mismo padre enviando todas las solicitudes antes
+    de esperar las respuestas (conexión ASYNC de ldap3).
+
+    ⚠️ Requiere permisos de administrador.
+
+    Args:
+        ous: Lista de tuplas (nombre, descripción)
+        parent_ou: OU padre donde crear las OUs (ej: 'OU=Departamentos')
+        base_dn: Base DN
+
+    Returns:
+        Dict {nombre: True si se creó, False si el servidor la rechazó}
+
+    Example:
+        >>> create_ous(
+        ...     [('Usuarios', 'Usuarios de prueba'), ('Grupos', 'Grupos de prueba')],
+        ...     parent_ou='OU=TestDemo'
+        ... )
+        {'Usuarios': True, 'Grupos': True}
+    """
+    if not ous:
+        return {}
+
+    conn = None
+    try:
+        from ldap3 import ASYNC
+
+        conn = get_ldap_connection(base_dn=base_dn, client_strategy=ASYNC)
+
+        ldap_base_dn = base_dn or conn.server.info.naming_contexts[0]
+        parent_dn = f'{parent_ou},{ldap_base_dn}' if parent_ou else ldap_base_dn
+        object_class = ['top', 'organizationalUnit']
+
+        # Enviar todas las solicitudes
+        message_ids = []
+        for ou_name, description in ous:
+            attributes = {'ou': ou_name}
+            if description:
+                attributes['description'] = description
+            message_ids.append(conn.add(f'OU={ou_name},{parent_dn}', object_class, attributes))
+
+        # Recoger las respuestas
+        results = {}
+        for (ou_name, _), message_id in zip(ous, message_ids):
+            _, result = conn.get_response(message_id)
+            results[ou_name] = result['result'] == 0
+            if results[ou_name]:
+                exists_cache.put(ou_key(ou_name, parent_ou, base_dn), True)
+
+        return results
+
+    except LDAPException as e:
+        raise Exception(f"Error creando OUs: {str(e)}")
+    finally:
+        if conn:
+            close_ldap_connection(conn)
+
+
 def delete_ou(
     ou_name: str,
     parent_ou: Optional[str] = None,
@@ -121,24 +188,34 @@ def delete_ou(
             ou_dn = f'OU={ou_name},{ldap_base_dn}'
 
         if recursive:
-            # Eliminar recursivamente (requiere control de árbol de eliminación)
-            from ldap3 import SUBTREE
+            from ldap3 import SUBTREE, ASYNC, NO_ATTRIBUTES
+            from ldap3.utils.dn import parse_dn
 
-            # Buscar todos los objetos dentro de la OU
+            # Un solo SUBTREE search con todos los objetos dentro de la OU
             conn.search(
                 search_base=ou_dn,
                 search_filter='(objectClass=*)',
                 search_scope=SUBTREE,
-                attributes=['objectClass']
+                attributes=[NO_ATTRIBUTES]
             )
 
-            # Eliminar objetos en orden inverso (de hojas a raíz)
-            dns_to_delete = [entry.entry_dn for entry in conn.entries]
-            dns_to_delete.reverse()
-
-            for dn in dns_to_delete:
-                if dn != ou_dn:  # No eliminar la OU todavía
-                    conn.delete(dn)
+            # Agrupar por profundidad (la OU se elimina al final)
+            levels: Dict[int, List[str]] = {}
+            for entry in conn.entries:
+                if entry.entry_dn.lower() != ou_dn.lower():
+                    levels.setdefault(len(parse_dn(entry.entry_dn)), []).append(entry.entry_dn)
+
+            # Eliminar de hojas a raíz: cada nivel se envía completo antes de
+            # esperar sus respuestas (un nivel no puede borrarse antes que sus hijos)
+            if levels:
+                async_conn = get_ldap_connection(base_dn=base_dn, client_strategy=ASYNC)
+                try:
+                    for depth in sorted(levels, reverse=True):
+                        message_ids = [async_conn.delete(dn) for dn in levels[depth]]
+                        for message_id in message_ids:
+                            async_conn.get_response(message_id)
+                finally:
+                    close_ldap_connection(async_conn)
 
         # Eliminar la OU
         success = conn.delete(ou_dn)
@@ -146,6 +223,9 @@ def delete_ou(
         if not success:
             raise LDAPException(f"Error eliminando OU: {conn.result}")
 
+        # Los objetos contenidos también dejan de existir
+        exists_cache.clear()
+
         return True
 
     except LDAPException as e:
@@ -211,6 +291,8 @@ def update_ou(
             if not success:
                 raise LDAPException(f"Error renombrando OU: {conn.result}")
 
+        exists_cache.clear()
+
         return True
 
     except LDAPException as e:
@@ -266,6 +348,8 @@ def move_ou(
         if not success:
             raise LDAPException(f"Error moviendo OU: {conn.result}")
 
+        exists_cache.clear()
+
         return True
 
     except LDAPException as e:
@@ -358,6 +442,7 @@ def list_ou_contents(
             close_ldap_connection(conn)
 
 
+@cached_exists(ou_key)
 def ou_exists(
     ou_name: str,
     parent_ou: Optional[str] = None,
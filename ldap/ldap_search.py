@@ -6,8 +6,51 @@ unidades organizativas y otros objetos en el directorio LDAP.
 """
 from typing import List, Dict, Optional, Any
 from ldap3.core.exceptions import LDAPException
+from ldap3.utils.conv import escape_filter_chars
 from .ldap_connection import get_ldap_connection, close_ldap_connection
 
+# Tamaño de página para búsquedas sin límite (Simple Paged Results)
+_PAGE_SIZE = 500
+
+
+def _search_entries(
+    conn,
+    search_base: str,
+    search_filter: str,
+    attributes: List[str],
+    limit: int = 0
+) -> List[tuple]:
+    """
+    Ejecuta la búsqueda y retorna [(dn, {atributo: valor})].
+
+    Con límite usa size_limit (el servidor corta al llegar al límite). Sin
+    límite usa Simple Paged Results para obtener más de MaxPageSize entradas
+    (1000 en Active Directory) sin recibir todo en una sola respuesta.
+    """
+    if limit:
+        conn.search(
+            search_base=search_base,
+            search_filter=search_filter,
+            attributes=attributes,
+            size_limit=limit
+        )
+        return [
+            (entry.entry_dn, {attr: entry[attr].value for attr in entry.entry_attributes})
+            for entry in conn.entries
+        ]
+
+    pages = conn.extend.standard.paged_search(
+        search_base=search_base,
+        search_filter=search_filter,
+        attributes=attributes,
+        paged_size=_PAGE_SIZE,
+        generator=True
+    )
+    return [
+        (item['dn'], {attr: value if value != [] else None for attr, value in item['attributes'].items()})
+        for item in pages if item['type'] == 'searchResEntry'
+    ]
+
 
 def search_users(
     filter_query: Optional[str] = None,
@@ -50,19 +93,13 @@ def search_users(
         search_base = base_dn or conn.server.info.naming_contexts[0]
 
         # Ejecutar búsqueda
-        conn.search(
-            search_base=search_base,
-            search_filter=search_filter,
-            attributes=search_attrs,
-            size_limit=limit
-        )
+        entries = _search_entries(conn, search_base, search_filter, search_attrs, limit)
 
         # Convertir resultados a lista de diccionarios
         results = []
-        for entry in conn.entries:
-            user_dict = {'dn': entry.entry_dn}
-            for attr in entry.entry_attributes:
-                value = entry[attr].value
+        for dn, attrs in entries:
+            user_dict = {'dn': dn}
+            for attr, value in attrs.items():
                 # Convertir listas de un elemento a valor único
                 if isinstance(value, list) and len(value) == 1:
                     value = value[0]
@@ -119,19 +156,13 @@ def search_groups(
         search_base = base_dn or conn.server.info.naming_contexts[0]
 
         # Ejecutar búsqueda
-        conn.search(
-            search_base=search_base,
-            search_filter=search_filter,
-            attributes=search_attrs,
-            size_limit=limit
-        )
+        entries = _search_entries(conn, search_base, search_filter, search_attrs, limit)
 
         # Convertir resultados
         results = []
-        for entry in conn.entries:
-            group_dict = {'dn': entry.entry_dn}
-            for attr in entry.entry_attributes:
-                value = entry[attr].value
+        for dn, attrs in entries:
+            group_dict = {'dn': dn}
+            for attr, value in attrs.items():
                 if isinstance(value, list) and len(value) == 1:
                     value = value[0]
                 group_dict[attr] = value
@@ -363,6 +394,94 @@ def find_group_by_name(
     return results[0] if results else None
 
 
+def _or_filter(attr: str, values: List[str]) -> str:
+    """Construye un filtro (|(attr=v1)(attr=v2)...) con los valores escapados."""
+    return '(|' + ''.join(f'({attr}={escape_filter_chars(v)})' for v in values) + ')'
+
+
+def _index_by(results: List[Dict[str, Any]], attr: str, names: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Asocia cada nombre solicitado con su resultado (sin distinguir mayúsculas)."""
+    by_value = {str(r.get(attr, '')).lower(): r for r in results}
+    return {name: by_value.get(name.lower()) for name in names}
+
+
+def find_users_by_usernames(
+    usernames: List[str],
+    username_attr: str = 'sAMAccountName',
+    attributes: Optional[List[str]] = None,
+    base_dn: Optional[str] = None
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Busca varios usuarios por nombre de usuario en una sola consulta.
+
+    Args:
+        usernames: Lista de nombres de usuario a buscar
+        username_attr: Atributo de username (default: 'sAMAccountName')
+        attributes: Atributos a retornar
+        base_dn: Base DN para búsqueda
+
+    Returns:
+        Dict {username: información del usuario o None si no se encuentra}
+
+    Example:
+        >>> users = find_users_by_usernames(['jperez', 'mgarcia'])
+        >>> for username, user in users.items():
+        ...     print(username, user['dn'] if user else 'no encontrado')
+    """
+    names = list(dict.fromkeys(usernames))
+    if not names:
+        return {}
+
+    search_attrs = list(attributes or ['cn', 'sAMAccountName', 'mail', 'memberOf'])
+    if username_attr not in search_attrs:
+        search_attrs.append(username_attr)
+
+    results = search_users(
+        filter_query=_or_filter(username_attr, names),
+        attributes=search_attrs,
+        base_dn=base_dn
+    )
+
+    return _index_by(results, username_attr, names)
+
+
+def find_groups_by_names(
+    group_names: List[str],
+    attributes: Optional[List[str]] = None,
+    base_dn: Optional[str] = None
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Busca varios grupos por nombre en una sola consulta.
+
+    Args:
+        group_names: Lista de nombres de grupo
+        attributes: Atributos a retornar
+        base_dn: Base DN para búsqueda
+
+    Returns:
+        Dict {nombre: información del grupo o None si no se encuentra}
+
+    Example:
+        >>> groups = find_groups_by_names(['Ventas', 'Compras'])
+        >>> faltantes = [name for name, group in groups.items() if group is None]
+    """
+    names = list(dict.fromkeys(group_names))
+    if not names:
+        return {}
+
+    search_attrs = list(attributes or ['cn', 'sAMAccountName', 'description', 'member'])
+    if 'cn' not in search_attrs:
+        search_attrs.append('cn')
+
+    results = search_groups(
+        filter_query=_or_filter('cn', names),
+        attributes=search_attrs,
+        base_dn=base_dn
+    )
+
+    return _index_by(results, 'cn', names)
+
+
 def get_user_groups(
     username: str,
     username_attr: str = 'sAMAccountName',
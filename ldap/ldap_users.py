@@ -10,6 +10,7 @@ from typing import Dict, Optional, List, Any
 from ldap3.core.exceptions import LDAPException
 from ldap3 import MODIFY_REPLACE, MODIFY_ADD, MODIFY_DELETE
 from .ldap_connection import get_ldap_connection, close_ldap_connection
+from ._cache import exists_cache, cached_exists, user_key
 
 
 def create_user(
@@ -93,6 +94,8 @@ def create_user(
         # Habilitar cuenta (userAccountControl = 512 = cuenta normal habilitada)
         conn.modify(user_dn, {'userAccountControl': [(MODIFY_REPLACE, [512])]})
 
+        exists_cache.put(user_key(username, base_dn=base_dn), True)
+
         return True
 
     except LDAPException as e:
@@ -206,6 +209,8 @@ def delete_user(
         if not success:
             raise LDAPException(f"Error eliminando usuario: {conn.result}")
 
+        exists_cache.put(user_key(username, username_attr, base_dn), False)
+
         return True
 
     except LDAPException as e:
@@ -422,6 +427,8 @@ def move_user(
         if not success:
             raise LDAPException(f"Error moviendo usuario: {conn.result}")
 
+        exists_cache.clear()
+
         return True
 
     except LDAPException as e:
@@ -431,6 +438,7 @@ def move_user(
             close_ldap_connection(conn)
 
 
+@cached_exists(user_key)
 def user_exists(
     username: str,
     username_attr: str = 'sAMAccountName',
@@ -10,6 +10,7 @@ Este módulo proporciona funciones organizadas según el estándar SQL:
 # DML - Data Manipulation Language (mssql_dml.py)
 from .mssql_dml import (
     get_mssql_connection,
+    mssql_session,
     insert,
     insert_many,
     select,
@@ -69,12 +70,14 @@ from .mssql_dcl import (
     get_active_connections,
     kill_connection,
     kill_all_connections,
-    get_connection_count
+    get_connection_count,
+    get_connection_counts_by_database
 )
 
 __all__ = [
     # Conexión
     "get_mssql_connection",
+    "mssql_session",
 
     # === DML - Data Manipulation Language ===
     "insert",
@@ -135,5 +138,6 @@ __all__ = [
     "get_active_connections",
     "kill_connection",
     "kill_all_connections",
-    "get_connection_count"
+    "get_connection_count",
+    "get_connection_counts_by_database"
 ]
@@ -897,3 +897,37 @@ def get_connection_count(database: str | None = None) -> int:
     finally:
         cursor.close()
         conn.close()
+
+
+def get_connection_counts_by_database() -> Dict[str, int]:
+    """
+    Obtiene el número de conexiones activas por base de datos en una sola consulta.
+
+    Returns:
+        Diccionario {base_de_datos: conexiones}, ordenado de mayor a menor.
+        Las sesiones sin base de datos se agrupan como 'NULL'.
+
+    Example:
+        conteos = get_connection_counts_by_database()
+        print(f"Conexiones totales: {sum(conteos.values())}")
+        for db, count in list(conteos.items())[:5]:
+            print(f"{db}: {count}")
+    """
+    conn = get_mssql_connection(database='master')
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            SELECT
+                ISNULL(DB_NAME(database_id), 'NULL') as database_name,
+                COUNT(*) as connections
+            FROM sys.dm_exec_sessions
+            WHERE is_user_process = 1
+            GROUP BY DB_NAME(database_id)
+            ORDER BY COUNT(*) DESC
+        """)
+
+        return {row.database_name: row.connections for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+        conn.close()
@@ -9,9 +9,11 @@ y pueden ser irreversibles. Usar con precaución.
 """
 import pyodbc
 from typing import List, Dict, Any
-from .mssql_dml import get_mssql_connection
+from .mssql_dml import get_mssql_connection, _close_idle_connections
+from ._cache import exists_cache, cached_exists, database_key, table_key
 
 
+@cached_exists(database_key)
 def database_exists(database: str) -> bool:
     """
     Verifica si una base de datos existe en SQL Server.
@@ -66,6 +68,7 @@ def create_database(database: str, if_not_exists: bool = True) -> bool:
 
         # Crear base de datos
         cursor.execute(f"CREATE DATABASE [{database}]")
+        exists_cache.put(database_key(database), True)
         return True
     finally:
         cursor.close()
@@ -98,6 +101,9 @@ def drop_database(database: str, if_exists: bool = True, force: bool = False) ->
         if if_exists and not database_exists(database):
             return False
 
+        # Las conexiones inactivas del pool a esa base impedirían eliminarla
+        _close_idle_connections(database)
+
         # Forzar cierre de conexiones si se solicita
         if force:
             cursor.execute(f"""
@@ -109,6 +115,9 @@ def drop_database(database: str, if_exists: bool = True, force: bool = False) ->
 
         # Eliminar base de datos
         cursor.execute(f"DROP DATABASE [{database}]")
+        # Las tablas de la base eliminada también dejan de existir
+        exists_cache.clear()
+        exists_cache.put(database_key(database), False)
         return True
     finally:
         cursor.close()
@@ -143,6 +152,7 @@ def recreate_database(database: str) -> bool:
     return True
 
 
+@cached_exists(table_key)
 def table_exists(table: str, database: str | None = None) -> bool:
     """
     Verifica si una tabla existe en la base de datos.
@@ -233,6 +243,7 @@ def create_table(
 
         cursor.execute(create_sql)
         conn.commit()
+        exists_cache.put(table_key(table, database), True)
         return True
     finally:
         cursor.close()
@@ -275,6 +286,7 @@ def drop_table(
             cursor.execute(f"DROP TABLE {table}")
 
         conn.commit()
+        exists_cache.put(table_key(table, database), False)
         return True
     finally:
         cursor.close()
@@ -283,7 +295,8 @@ def drop_table(
 
 def execute_ddl(
     ddl_statement: str,
-    database: str | None = None
+    database: str | None = None,
+    autocommit: bool = False
 ) -> None:
     """
     Ejecuta una sentencia DDL (CREATE, ALTER, DROP, etc.).
@@ -291,6 +304,8 @@ def execute_ddl(
     Args:
         ddl_statement: Sentencia DDL completa
         database: Base de datos opcional
+        autocommit: Si True, ejecuta fuera de transacción; necesario para
+            sentencias como BACKUP/RESTORE DATABASE (default: False)
 
     Example:
         # Crear tabla con DDL personalizado
@@ -307,13 +322,25 @@ def execute_ddl(
 
         # Alterar tabla
         execute_ddl('ALTER TABLE MiTabla ADD email NVARCHAR(100)')
+
+        # Respaldo (no admite transacción)
+        execute_ddl("BACKUP DATABASE [MiBD] TO DISK = N'/tmp/MiBD.bak' WITH INIT",
+                    database='master', autocommit=True)
     """
     conn = get_mssql_connection(database)
+    if autocommit:
+        conn.autocommit = True
     cursor = conn.cursor()
 
     try:
         cursor.execute(ddl_statement)
+        # BACKUP/RESTORE envían mensajes de progreso: consumirlos para
+        # esperar a que la sentencia termine en el servidor
+        while cursor.nextset():
+            pass
         conn.commit()
+        # DDL arbitrario: no se sabe qué objetos cambiaron
+        exists_cache.clear()
     finally:
         cursor.close()
         conn.close()
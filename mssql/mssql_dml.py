@@ -9,7 +9,207 @@ Las credenciales se pasan como parámetros o se leen de variables de entorno.
 """
 import pyodbc
 import os
-from typing import Any, Dict, List, Optional, Tuple
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from ._cache import exists_cache
+
+
+# Máximo de sentencias (cursores preparados) que conserva una sesión
+_STATEMENT_CACHE_SIZE = 64
+
+# Conexiones inactivas que conserva el pool de select_one por base de datos (0 = sin pool)
+_POOL_SIZE = int(os.getenv('MSSQL_POOL_MAX') or 10)
+# Segundos que una conexión puede quedar inactiva antes de descartarla
+_POOL_IDLE_TIMEOUT = 300
+
+# (base de datos, cadena de conexión) -> pila de (conexión, momento en que se devolvió)
+_POOLS: Dict[Tuple[str, str], 'queue.LifoQueue[Tuple[pyodbc.Connection, float]]'] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _get_pool(database: str, connection_string: str) -> 'queue.LifoQueue[Tuple[pyodbc.Connection, float]]':
+    with _POOLS_LOCK:
+        pool = _POOLS.get((database, connection_string))
+        if pool is None:
+            pool = _POOLS[(database, connection_string)] = queue.LifoQueue(maxsize=_POOL_SIZE)
+        return pool
+
+
+def _close_idle_connections(database: str) -> None:
+    """
+    Cierra las conexiones inactivas del pool hacia una base de datos.
+
+    Llamar antes de eliminarla, restaurarla o ponerla en SINGLE_USER: esas
+    operaciones matan o se bloquean con las sesiones abiertas.
+    """
+    with _POOLS_LOCK:
+        pools = [pool for (db, _), pool in _POOLS.items() if db.lower() == database.lower()]
+    for pool in pools:
+        while True:
+            try:
+                conn, _ = pool.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.close()
+            except pyodbc.Error:
+                pass
+
+
+def _acquire_pooled(database: str, connection_string: str) -> Tuple[pyodbc.Connection, bool]:
+    """
+    Toma una conexión inactiva del pool de select_one o abre una nueva.
+
+    Returns:
+        (conexión, True si viene del pool y pudo quedar inválida)
+    """
+    pool = _get_pool(database, connection_string)
+    while True:
+        try:
+            conn, released = pool.get_nowait()
+        except queue.Empty:
+            return pyodbc.connect(connection_string), False
+        # Las que llevan demasiado tiempo sin usarse pudieron ser cerradas por el servidor
+        if time.monotonic() - released < _POOL_IDLE_TIMEOUT:
+            return conn, True
+        try:
+            conn.close()
+        except pyodbc.Error:
+            pass
+
+
+def _is_connection_lost(error: pyodbc.Error) -> bool:
+    """True si el error indica conexión perdida (OperationalError o SQLSTATE 08xxx)."""
+    if isinstance(error, pyodbc.OperationalError):
+        return True
+    sqlstate = error.args[0] if error.args else ''
+    return isinstance(sqlstate, str) and sqlstate.startswith('08')
+
+
+def _release_pooled(database: str, connection_string: str, conn: pyodbc.Connection) -> None:
+    """Devuelve una conexión al pool de select_one (o la cierra si está lleno)."""
+    try:
+        conn.rollback()
+        _get_pool(database, connection_string).put_nowait((conn, time.monotonic()))
+    except (pyodbc.Error, queue.Full):
+        try:
+            conn.close()
+        except pyodbc.Error:
+            pass
+
+
+class _SessionCursor:
+    """
+    Cursor de sesión que reutiliza un cursor pyodbc por texto SQL.
+
+    pyodbc omite el prepare cuando un cursor vuelve a ejecutar el mismo SQL,
+    así que repetir una consulta parametrizada dentro de la sesión solo envía
+    los parámetros. close() no cierra nada: los cursores viven con la sesión.
+    """
+
+    def __init__(self, session: '_SessionConnection'):
+        object.__setattr__(self, '_session', session)
+        object.__setattr__(self, '_current', None)
+        object.__setattr__(self, '_options', {})
+
+    def _cursor_for(self, sql: str) -> pyodbc.Cursor:
+        cursor = self._session._statement_cursor(sql)
+        for name, value in self._options.items():
+            setattr(cursor, name, value)
+        object.__setattr__(self, '_current', cursor)
+        return cursor
+
+    def execute(self, sql: str, *params: Any) -> '_SessionCursor':
+        self._cursor_for(sql).execute(sql, *params)
+        return self
+
+    def executemany(self, sql: str, params: Any) -> None:
+        self._cursor_for(sql).executemany(sql, params)
+
+    def close(self) -> None:
+        pass
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._current, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Opciones como fast_executemany se aplican al cursor de cada sentencia
+        self._options[name] = value
+
+
+class _SessionConnection:
+    """Conexión compartida de mssql_session(); close() no la cierra."""
+
+    def __init__(self, conn: pyodbc.Connection):
+        self._conn = conn
+        self._statements: 'OrderedDict[str, pyodbc.Cursor]' = OrderedDict()
+        self._active: Optional[pyodbc.Cursor] = None
+        self._rollback_only = False
+
+    def _statement_cursor(self, sql: str) -> pyodbc.Cursor:
+        cursor = self._statements.pop(sql, None)
+        if cursor is None:
+            cursor = self._conn.cursor()
+            if len(self._statements) >= _STATEMENT_CACHE_SIZE:
+                _, oldest = self._statements.popitem(last=False)
+                if oldest is self._active:
+                    self._active = None
+                oldest.close()
+        self._statements[sql] = cursor
+
+        # Sin MARS, SQL Server rechaza una sentencia mientras otro cursor de la
+        # misma conexión tenga filas pendientes: descartarlas antes de cambiar
+        if self._active is not None and self._active is not cursor:
+            try:
+                while self._active.nextset():
+                    pass
+            except pyodbc.Error:
+                pass
+        self._active = cursor
+        return cursor
+
+    def cursor(self) -> _SessionCursor:
+        return _SessionCursor(self)
+
+    def commit(self) -> None:
+        # En un bloque rollback=True nada se confirma hasta el rollback final
+        if not self._rollback_only:
+            self._conn.commit()
+
+    def close(self) -> None:
+        pass
+
+    def _close(self) -> None:
+        for cursor in self._statements.values():
+            cursor.close()
+        self._statements.clear()
+        self._active = None
+        self._conn.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in ('_conn', '_statements', '_active', '_rollback_only'):
+            object.__setattr__(self, name, value)
+        elif name == 'autocommit' and self._rollback_only:
+            # Activar autocommit confirmaría la transacción del bloque
+            # rollback=True; las sentencias que no admiten transacción
+            # (CREATE/DROP DATABASE, BACKUP) fallan en lugar de confirmarla
+            pass
+        else:
+            setattr(self._conn, name, value)
+
+
+# Sesión activa dentro de un bloque mssql_session(): (base de datos, conexión)
+_shared_session: ContextVar[Optional[Tuple[str, _SessionConnection]]] = ContextVar(
+    '_shared_session', default=None
+)
 
 
 def get_mssql_connection(
@@ -47,12 +247,28 @@ def get_mssql_connection(
     """
     # Leer de parámetros o variables de entorno
     db = database or os.getenv('MSSQL_DATABASE', 'master')
+
+    # Dentro de mssql_session() reutilizar la conexión de la misma base de datos
+    shared = _shared_session.get()
+    if shared is not None and shared[0] == db and not (host or port or user or password):
+        return shared[1]
+
+    return pyodbc.connect(_connection_string(db, host, port, user, password))
+
+
+def _connection_string(
+    db: str,
+    host: str | None = None,
+    port: int | None = None,
+    user: str | None = None,
+    password: str | None = None
+) -> str:
     host = host or os.getenv('MSSQL_HOST', 'localhost')
     port = port or int(os.getenv('MSSQL_PORT', '1433'))
     user = user or os.getenv('MSSQL_USER', 'sa')
     password = password or os.getenv('MSSQL_PASSWORD', '')
 
-    connection_string = (
+    return (
         f"DRIVER={{ODBC Driver 18 for SQL Server}};"
         f"SERVER={host},{port};"
         f"DATABASE={db};"
@@ -60,7 +276,73 @@ def get_mssql_connection(
         f"PWD={password};"
         f"TrustServerCertificate=yes;"
     )
-    return pyodbc.connect(connection_string)
+
+
+@contextmanager
+def mssql_session(
+    database: str | None = None,
+    rollback: bool = False
+) -> Iterator[_SessionConnection]:
+    """
+    Mantiene una sola conexión abierta a una base de datos durante un bloque.
+
+    Dentro del bloque, las funciones del módulo que piden conexión a la misma
+    base de datos (sin credenciales explícitas) reutilizan esta conexión en
+    lugar de abrir una nueva por llamada, y cada sentencia SQL conserva su
+    cursor preparado, de modo que repetirla solo envía los parámetros. Las
+    llamadas a otra base de datos (por ejemplo 'master') abren su propia
+    conexión como siempre.
+
+    Con rollback=True los commit() de las funciones no confirman nada y al
+    salir del bloque se revierte todo lo hecho en él, incluido el DDL (SQL
+    Server lo admite dentro de una transacción). Útil para pruebas que no
+    deben dejar rastro.
+
+    Args:
+        database: Base de datos de la sesión (default: MSSQL_DATABASE)
+        rollback: Si True, revierte todos los cambios del bloque al salir (default: False)
+
+    Yields:
+        Conexión compartida
+
+    Example:
+        with mssql_session('API_MCP'):
+            for codigo in codigos:
+                select_one('SAP_PROVEEDORES', where='CardCode = ?', where_params=(codigo,))
+
+        # Crear y probar una tabla sin dejarla en la base de datos
+        with mssql_session('test_db', rollback=True):
+            create_table('TMP', {'id': 'INT'}, database='test_db')
+    """
+    db = database or os.getenv('MSSQL_DATABASE', 'master')
+    shared = _shared_session.get()
+    if shared is not None and shared[0] == db:
+        # Sesión anidada sobre la misma base de datos
+        session, token = shared[1], None
+    else:
+        session = _SessionConnection(get_mssql_connection(db))
+        token = _shared_session.set((db, session))
+
+    previous_rollback_only = session._rollback_only
+    previous_autocommit = session._conn.autocommit
+    if rollback:
+        # Confirmar lo pendiente para que el rollback solo afecte a este bloque
+        session.commit()
+        session._conn.autocommit = False
+        session._rollback_only = True
+
+    try:
+        yield session
+    finally:
+        if rollback:
+            session._conn.rollback()
+            session._rollback_only = previous_rollback_only
+            session._conn.autocommit = previous_autocommit
+            # Los objetos creados/eliminados en el bloque volvieron a su estado
+            exists_cache.clear()
+        if token is not None:
+            _shared_session.reset(token)
+            session._close()
 
 
 def insert(
@@ -110,8 +392,9 @@ def insert_many(
     columns: List[str],
     values_list: List[Tuple],
     database: str | None = None,
-    batch_size: int = 1000
-) -> int:
+    batch_size: int = 1000,
+    returning: List[str] | Tuple[str, ...] | None = None
+) -> int | List[pyodbc.Row]:
     """
     Inserta múltiples registros en una tabla por lotes.
 
@@ -121,9 +404,12 @@ def insert_many(
         values_list: Lista de tuplas con valores
         database: Base de datos opcional
         batch_size: Tamaño del lote para inserción (default: 1000)
+        returning: Columnas a devolver de las filas insertadas (OUTPUT INSERTED),
+            por ejemplo ('id',) para obtener los IDENTITY generados
 
     Returns:
-        Total de filas insertadas
+        Total de filas insertadas, o la lista de filas con las columnas de
+        returning si se especifica
 
     Example:
         insert_many(
@@ -134,24 +420,46 @@ def insert_many(
                 ('EMPRESA01', 'P002', 'Proveedor 2'),
             ]
         )
+
+        # Obtener los IDs generados en el mismo round-trip
+        filas = insert_many('CLIENTES', ['nombre'], [('A',), ('B',)], returning=('id',))
+        ids = [fila.id for fila in filas]
     """
     conn = get_mssql_connection(database)
     cursor = conn.cursor()
+    # Enviar cada lote como un solo arreglo de parámetros (no una fila por round-trip)
+    cursor.fast_executemany = True
     total_inserted = 0
+    returned_rows = []
 
     try:
         columns_str = ', '.join(columns)
         placeholders = ', '.join(['?' for _ in columns])
         query = f"INSERT INTO {table} ({columns_str}) VALUES ({placeholders})"
 
+        if returning:
+            # executemany no devuelve result sets: un INSERT multi-fila por lote.
+            # SQL Server admite 1000 filas por VALUES y 2100 parámetros por sentencia
+            batch_size = min(batch_size, 1000, 2099 // len(columns))
+            output_str = ', '.join(f"INSERTED.{col}" for col in returning)
+
         # Insertar por lotes
         for i in range(0, len(values_list), batch_size):
             batch = values_list[i:i + batch_size]
-            cursor.executemany(query, batch)
+            if returning:
+                rows_sql = ', '.join([f"({placeholders})"] * len(batch))
+                cursor.execute(
+                    f"INSERT INTO {table} ({columns_str}) OUTPUT {output_str} VALUES {rows_sql}",
+                    [value for row in batch for value in row]
+                )
+                returned_rows.extend(cursor.fetchall())
+            else:
+                cursor.executemany(query, batch)
+                # Con fast_executemany el rowcount puede ser -1
+                total_inserted += cursor.rowcount if cursor.rowcount >= 0 else len(batch)
             conn.commit()
-            total_inserted += cursor.rowcount
 
-        return total_inserted
+        return returned_rows if returning else total_inserted
     finally:
         cursor.close()
         conn.close()
@@ -246,6 +554,15 @@ def select_one(
     Returns:
         Primera fila encontrada o None
 
+    Fuera de mssql_session() usa un pool de conexiones propio (MSSQL_POOL_MAX,
+    default: 10; 0 = sin pool), pensado para consultas repetidas como la
+    validación de usuarios: evita el login y el handshake TLS de cada
+    llamada. Esas conexiones solo ejecutan este SELECT, así que no arrastran
+    tablas temporales ni opciones SET de otros usos. Si una conexión del pool
+    se perdió (servidor reiniciado, sesión terminada con KILL o SINGLE_USER)
+    se descarta y la consulta se repite una vez con una conexión nueva; los
+    demás errores se propagan sin reintentar.
+
     Example:
         select_one(
             'SAP_EMPRESAS',
@@ -253,25 +570,59 @@ def select_one(
             where_params=('EMPRESA01',)
         )
     """
-    conn = get_mssql_connection(database)
-    cursor = conn.cursor()
-
-    try:
-        columns_str = ', '.join(columns) if columns else '*'
-        query = f"SELECT TOP 1 {columns_str} FROM {table}"
-
-        if where:
-            query += f" WHERE {where}"
+    columns_str = ', '.join(columns) if columns else '*'
+    query = f"SELECT TOP 1 {columns_str} FROM {table}"
 
-        if where_params:
-            cursor.execute(query, where_params)
-        else:
-            cursor.execute(query)
+    if where:
+        query += f" WHERE {where}"
 
-        return cursor.fetchone()
-    finally:
-        cursor.close()
-        conn.close()
+    db = database or os.getenv('MSSQL_DATABASE', 'master')
+    shared = _shared_session.get()
+    if _POOL_SIZE <= 0 or (shared is not None and shared[0] == db):
+        conn = get_mssql_connection(database)
+        cursor = conn.cursor()
+        try:
+            if where_params:
+                cursor.execute(query, where_params)
+            else:
+                cursor.execute(query)
+
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+
+    connection_string = _connection_string(db)
+    conn, reused = _acquire_pooled(db, connection_string)
+    while True:
+        try:
+            cursor = conn.cursor()
+            try:
+                if where_params:
+                    cursor.execute(query, where_params)
+                else:
+                    cursor.execute(query)
+                row = cursor.fetchone()
+            finally:
+                cursor.close()
+        except pyodbc.Error as e:
+            if not _is_connection_lost(e):
+                # Error de la consulta (columna, WHERE, permisos): la conexión sigue sirviendo
+                _release_pooled(db, connection_string, conn)
+                raise
+            try:
+                conn.close()
+            except pyodbc.Error:
+                pass
+            if not reused:
+                raise
+            # Conexión del pool inválida: las demás inactivas probablemente
+            # también lo estén; descartarlas y reintentar una vez con una nueva
+            _close_idle_connections(db)
+            conn, reused = pyodbc.connect(connection_string), False
+            continue
+        _release_pooled(db, connection_string, conn)
+        return row
 
 
 def update(
@@ -10,6 +10,8 @@ Este módulo proporciona funciones organizadas según el estándar SQL:
 # DML - Data Manipulation Language (postgres_dml.py)
 from .postgres_dml import (
     get_postgres_connection,
+    release_postgres_connection,
+    postgres_session,
     insert,
     insert_many,
     select,
@@ -79,6 +81,8 @@ from .postgres_dcl import (
 __all__ = [
     # Conexión
     "get_postgres_connection",
+    "release_postgres_connection",
+    "postgres_session",
 
     # === DML - Data Manipulation Language ===
     "insert",
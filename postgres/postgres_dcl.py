@@ -14,7 +14,7 @@ rol con privilegio LOGIN.
 """
 import psycopg2
 from typing import List, Dict, Any
-from .postgres_dml import get_postgres_connection
+from .postgres_dml import get_postgres_connection, release_postgres_connection
 
 
 # ============================================================================
@@ -48,7 +48,7 @@ def role_exists(role_name: str, database: str | None = None) -> bool:
         return result[0] > 0
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def create_role(
@@ -117,7 +117,7 @@ def create_role(
         return True
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def create_user(
@@ -187,7 +187,7 @@ def drop_role(
         return True
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def drop_user(username: str, if_exists: bool = True, database: str | None = None) -> bool:
@@ -232,7 +232,7 @@ def alter_role_password(
         cursor.execute(f"ALTER ROLE {role_name} WITH PASSWORD '{new_password}'")
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 # ============================================================================
@@ -271,7 +271,7 @@ def grant_database_privileges(
         cursor.execute(f"GRANT {privs} ON DATABASE {database} TO {role_name}")
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def revoke_database_privileges(
@@ -305,7 +305,7 @@ def revoke_database_privileges(
         cursor.execute(f"REVOKE {privs} ON DATABASE {database} FROM {role_name}")
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def grant_schema_privileges(
@@ -340,7 +340,7 @@ def grant_schema_privileges(
         cursor.execute(f"GRANT {privs} ON SCHEMA {schema} TO {role_name}")
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def revoke_schema_privileges(
@@ -374,7 +374,7 @@ def revoke_schema_privileges(
         cursor.execute(f"REVOKE {privs} ON SCHEMA {schema} FROM {role_name}")
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def grant_table_privileges(
@@ -413,7 +413,7 @@ def grant_table_privileges(
         cursor.execute(f"GRANT {privs} ON TABLE {table_name} TO {role_name}")
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def revoke_table_privileges(
@@ -451,7 +451,7 @@ def revoke_table_privileges(
         cursor.execute(f"REVOKE {privs} ON TABLE {table_name} FROM {role_name}")
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def grant_all_tables_in_schema(
@@ -486,7 +486,7 @@ def grant_all_tables_in_schema(
         cursor.execute(f"GRANT {privs} ON ALL TABLES IN SCHEMA {schema} TO {role_name}")
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def grant_role_to_user(
@@ -513,7 +513,7 @@ def grant_role_to_user(
         cursor.execute(f"GRANT {role_name} TO {user_name}")
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def revoke_role_from_user(
@@ -540,7 +540,7 @@ def revoke_role_from_user(
         cursor.execute(f"REVOKE {role_name} FROM {user_name}")
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def get_role_privileges(
@@ -580,7 +580,7 @@ def get_role_privileges(
         return [dict(zip(columns, row)) for row in cursor.fetchall()]
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def get_user_roles(
@@ -617,7 +617,7 @@ def get_user_roles(
         return [row[0] for row in cursor.fetchall()]
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 # ============================================================================
@@ -733,7 +733,7 @@ def get_active_connections(database: str | None = None) -> List[Dict[str, Any]]:
         return [dict(zip(columns, row)) for row in cursor.fetchall()]
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def get_connection_count(database: str | None = None) -> int:
@@ -777,7 +777,7 @@ def terminate_connection(pid: int, database: str | None = None) -> bool:
         return result[0] if result else False
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def terminate_all_connections(
@@ -816,4 +816,4 @@ def terminate_all_connections(
         return cursor.rowcount
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
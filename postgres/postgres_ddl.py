@@ -9,7 +9,7 @@ y pueden ser irreversibles. Usar con precaución.
 """
 import psycopg2
 from typing import List, Dict, Any
-from .postgres_dml import get_postgres_connection
+from .postgres_dml import get_postgres_connection, release_postgres_connection
 
 
 def database_exists(database: str, host: str | None = None) -> bool:
@@ -39,7 +39,7 @@ def database_exists(database: str, host: str | None = None) -> bool:
         return result[0] > 0
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def create_database(
@@ -85,7 +85,7 @@ def create_database(
         return True
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def drop_database(
@@ -132,7 +132,7 @@ def drop_database(
         return True
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def recreate_database(database: str, owner: str | None = None) -> bool:
@@ -194,7 +194,7 @@ def schema_exists(
         return result[0] > 0
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def create_schema(
@@ -237,7 +237,7 @@ def create_schema(
         return True
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def drop_schema(
@@ -282,7 +282,7 @@ def drop_schema(
         return True
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def table_exists(
@@ -319,7 +319,7 @@ def table_exists(
         return result[0] > 0
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def create_table(
@@ -389,7 +389,7 @@ def create_table(
         return True
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def drop_table(
@@ -438,7 +438,7 @@ def drop_table(
         return True
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def truncate_table(
@@ -480,7 +480,7 @@ def truncate_table(
         cursor.execute(query)
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def execute_ddl(
@@ -505,7 +505,7 @@ def execute_ddl(
         cursor.execute(ddl)
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def create_index(
@@ -576,7 +576,7 @@ def create_index(
         return True
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def drop_index(
@@ -631,4 +631,4 @@ def drop_index(
         return True
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
@@ -9,8 +9,117 @@ Las credenciales se pasan como parámetros o se leen de variables de entorno.
 """
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
 import os
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# Un pool por combinación (host, port, database, user, password); se crean al
+# primer uso. POSTGRES_POOL_MAX limita las conexiones abiertas de cada pool.
+_POOLS: Dict[Tuple, psycopg2.pool.ThreadedConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _get_pool(dsn: Tuple) -> psycopg2.pool.ThreadedConnectionPool:
+    pool = _POOLS.get(dsn)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(dsn)
+            if pool is None:
+                host, port, database, user, password = dsn
+                pool = psycopg2.pool.ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=int(os.getenv('POSTGRES_POOL_MAX', '10')),
+                    host=host,
+                    port=port,
+                    database=database,
+                    user=user,
+                    password=password
+                )
+                _POOLS[dsn] = pool
+    return pool
+
+
+class _PooledConnection:
+    """
+    Conexión prestada por el pool; close() la devuelve en lugar de cerrarla.
+
+    Al devolverla se revierte lo no confirmado (igual que al cerrar una
+    conexión psycopg2). Un segundo close() no hace nada.
+    """
+
+    def __init__(self, conn: psycopg2.extensions.connection, pool: psycopg2.pool.ThreadedConnectionPool):
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_pool', pool)
+
+    @property
+    def closed(self) -> int:
+        return 1 if self._conn is None else self._conn.closed
+
+    def close(self) -> None:
+        conn = self._conn
+        if conn is None:
+            return
+        object.__setattr__(self, '_conn', None)
+        if not conn.closed:
+            try:
+                if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                conn.autocommit = False
+            except psycopg2.Error:
+                # Conexión rota: putconn() la descarta
+                conn.close()
+        self._pool.putconn(conn)
+
+    def __enter__(self) -> '_PooledConnection':
+        # Igual que psycopg2: el bloque with confirma o revierte, no cierra
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc: Any) -> Any:
+        return self._conn.__exit__(*exc)
+
+    def __getattr__(self, name: str) -> Any:
+        if self._conn is None:
+            raise psycopg2.InterfaceError('connection already closed')
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._conn, name, value)
+
+
+class _SessionConnection:
+    """Conexión compartida de postgres_session(); commit() y close() se difieren al final del bloque."""
+
+    def __init__(self, conn: psycopg2.extensions.connection):
+        self._conn = conn
+
+    def commit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    @property
+    def autocommit(self) -> bool:
+        return False
+
+    @autocommit.setter
+    def autocommit(self, value: bool) -> None:
+        # La sesión es una sola transacción; el DDL de Postgres es transaccional
+        pass
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+
+# Sesión activa dentro de un bloque postgres_session(): (base de datos, conexión)
+_shared_session: ContextVar[Optional[Tuple[str, _SessionConnection]]] = ContextVar(
+    '_shared_session', default=None
+)
 
 
 def get_postgres_connection(
@@ -31,11 +140,15 @@ def get_postgres_connection(
         password: Contraseña (opcional, lee de POSTGRES_PASSWORD si es None)
 
     Returns:
-        Conexión psycopg2 activa
+        Conexión psycopg2 activa, tomada del pool; conn.close() la devuelve al pool
 
     Example:
         # Usando variables de entorno
         conn = get_postgres_connection(database='mi_db')
+        try:
+            ...
+        finally:
+            conn.close()
 
         # Pasando credenciales directamente
         conn = get_postgres_connection(
@@ -48,18 +161,99 @@ def get_postgres_connection(
     """
     # Leer de parámetros o variables de entorno
     db = database or os.getenv('POSTGRES_DATABASE', 'postgres')
+
+    # Dentro de postgres_session() reutilizar la conexión de la misma base de datos
+    shared = _shared_session.get()
+    if shared is not None and shared[0] == db and not (host or port or user or password):
+        return shared[1]
+
     host = host or os.getenv('POSTGRES_HOST', 'localhost')
     port = port or int(os.getenv('POSTGRES_PORT', '5432'))
     user = user or os.getenv('POSTGRES_USER', 'postgres')
     password = password or os.getenv('POSTGRES_PASSWORD', '')
 
-    return psycopg2.connect(
-        host=host,
-        port=port,
-        database=db,
-        user=user,
-        password=password
-    )
+    pool = _get_pool((host, port, db, user, password))
+    try:
+        conn = pool.getconn()
+    except psycopg2.pool.PoolError as e:
+        # getconn() no espera: falla en cuanto hay POSTGRES_POOL_MAX conexiones prestadas
+        raise psycopg2.pool.PoolError(
+            f"Pool de PostgreSQL agotado ({os.getenv('POSTGRES_POOL_MAX', '10')} conexiones "
+            "prestadas). Cierra las conexiones con conn.close() o "
+            "release_postgres_connection() al terminar de usarlas"
+        ) from e
+    conn.autocommit = False
+    return _PooledConnection(conn, pool)
+
+
+def release_postgres_connection(conn: psycopg2.extensions.connection) -> None:
+    """
+    Devuelve al pool una conexión obtenida con get_postgres_connection().
+
+    Equivale a conn.close(): lo pendiente sin confirmar se revierte y la
+    conexión vuelve al pool. Dentro de postgres_session() no hace nada: la
+    conexión de la sesión se devuelve al salir del bloque. Una conexión que
+    no salió del pool (creada con psycopg2.connect) se cierra, y devolver dos
+    veces la misma conexión no tiene efecto.
+
+    Args:
+        conn: Conexión a devolver
+
+    Example:
+        conn = get_postgres_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+        finally:
+            release_postgres_connection(conn)
+    """
+    if isinstance(conn, _SessionConnection):
+        return
+    conn.close()
+
+
+@contextmanager
+def postgres_session(database: str | None = None) -> Iterator[_SessionConnection]:
+    """
+    Ejecuta un bloque sobre una sola conexión del pool y una sola transacción.
+
+    Dentro del bloque, las funciones del módulo que piden conexión a la misma
+    base de datos (sin credenciales explícitas) reutilizan esta conexión y sus
+    commit() se difieren: todo se confirma al salir del bloque, o se revierte
+    si el bloque lanza una excepción. Las llamadas a otra base de datos abren
+    su propia conexión como siempre.
+
+    CREATE/DROP DATABASE no pueden ejecutarse dentro de una transacción, así
+    que no deben llamarse sobre la base de datos de la sesión.
+
+    Args:
+        database: Base de datos de la sesión (default: POSTGRES_DATABASE)
+
+    Yields:
+        Conexión compartida
+
+    Example:
+        with postgres_session('mi_db'):
+            insert_many('empresas', ['codigo', 'nombre'], filas, database='mi_db')
+            update('empresas', {'activo': True}, where='codigo = %s',
+                   where_params=('EMP01',), database='mi_db')
+    """
+    db = database or os.getenv('POSTGRES_DATABASE', 'postgres')
+    shared = _shared_session.get()
+    if shared is not None and shared[0] == db:
+        # Sesión anidada sobre la misma base de datos
+        yield shared[1]
+        return
+
+    conn = get_postgres_connection(db)
+    session = _SessionConnection(conn)
+    token = _shared_session.set((db, session))
+    try:
+        yield session
+        conn.commit()
+    finally:
+        _shared_session.reset(token)
+        release_postgres_connection(conn)
 
 
 def insert(
@@ -121,7 +315,7 @@ def insert(
             return cursor.rowcount
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def insert_many(
@@ -135,13 +329,16 @@ def insert_many(
     """
     Inserta múltiples registros en una tabla por lotes.
 
+    Cada lote se envía como un solo INSERT multi-fila (execute_values) y
+    todos los lotes se confirman en una sola transacción.
+
     Args:
         table: Nombre de la tabla
         columns: Lista de nombres de columnas
         values_list: Lista de tuplas con valores
         database: Base de datos opcional
         schema: Schema opcional (default: public)
-        batch_size: Tamaño del lote para inserción (default: 1000)
+        batch_size: Filas por INSERT multi-fila (default: 1000)
 
     Returns:
         Total de filas insertadas
@@ -165,20 +362,22 @@ def insert_many(
         table_name = f"{schema}.{table}" if schema else table
 
         columns_str = ', '.join(columns)
-        placeholders = ', '.join(['%s' for _ in columns])
-        query = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
+        template = '(' + ', '.join(['%s' for _ in columns]) + ')'
+        query = f"INSERT INTO {table_name} ({columns_str}) VALUES %s"
 
-        # Insertar por lotes
+        # Insertar por lotes: un INSERT multi-fila por lote, un solo commit
         for i in range(0, len(values_list), batch_size):
             batch = values_list[i:i + batch_size]
-            cursor.executemany(query, batch)
-            conn.commit()
+            psycopg2.extras.execute_values(
+                cursor, query, batch, template=template, page_size=batch_size
+            )
             total_inserted += cursor.rowcount
 
+        conn.commit()
         return total_inserted
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def select(
@@ -257,7 +456,7 @@ def select(
         return [dict(row) for row in cursor.fetchall()]
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def select_one(
@@ -348,7 +547,7 @@ def update(
         return cursor.rowcount
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def delete(
@@ -392,7 +591,7 @@ def delete(
         return cursor.rowcount
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def exists(
@@ -474,7 +673,7 @@ def count(
         return cursor.fetchone()[0]
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def execute_query(
@@ -529,7 +728,7 @@ def execute_query(
             return cursor.rowcount
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def upsert(
@@ -593,7 +792,7 @@ def upsert(
         return cursor.rowcount
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def truncate(
@@ -635,7 +834,7 @@ def truncate(
         conn.commit()
     finally:
         cursor.close()
-        conn.close()
+        release_postgres_connection(conn)
 
 
 def get_table_columns(
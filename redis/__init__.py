@@ -16,6 +16,8 @@ from .redis_connection import (
     set_value,
     get_value,
     delete_keys,
+    mset,
+    mget,
     exists,
     expire,
     ttl,
@@ -27,6 +29,7 @@ from .redis_connection import (
     cache_clear,
     # Operaciones de Hash
     hset,
+    hset_multi,
     hget,
     hgetall,
     hdel,
@@ -53,14 +56,20 @@ from .redis_connection import (
     info
 )
 
+# Cliente asíncrono (redis_async.py)
+from .redis_async import get_async_redis_connection
+
 __all__ = [
     # Conexión
     "get_redis_connection",
+    "get_async_redis_connection",
 
     # Operaciones básicas (Strings)
     "set_value",
     "get_value",
     "delete_keys",
+    "mset",
+    "mget",
     "exists",
     "expire",
     "ttl",
@@ -74,6 +83,7 @@ __all__ = [
 
     # Operaciones de Hash
     "hset",
+    "hset_multi",
     "hget",
     "hgetall",
     "hdel",
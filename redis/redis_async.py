@@ -0,0 +1,67 @@
+"""
+Cliente asíncrono de Redis (redis.asyncio).
+
+Permite que operaciones independientes se ejecuten de forma concurrente con
+asyncio.gather, solapando los round trips en lugar de sumarlos.
+
+⚠️ MÓDULO GENÉRICO: No depende de ningún archivo de configuración específico.
+Las credenciales se pasan como parámetros o se leen de variables de entorno.
+"""
+import os
+from redis import asyncio as aioredis
+
+
+def get_async_redis_connection(
+    host: str | None = None,
+    port: int | None = None,
+    db: int | None = None,
+    password: str | None = None,
+    decode_responses: bool = True,
+    max_connections: int | None = None
+) -> aioredis.Redis:
+    """
+    Obtiene un cliente asíncrono de Redis con su propio pool de conexiones.
+
+    El pool queda ligado al event loop en que se usa: crear el cliente dentro
+    de la corrutina principal y reutilizarlo en todas las tareas concurrentes.
+
+    Args:
+        host: Host del servidor Redis (opcional, lee de REDIS_HOST si es None)
+        port: Puerto del servidor (opcional, lee de REDIS_PORT si es None)
+        db: Número de base de datos (opcional, lee de REDIS_DB si es None)
+        password: Contraseña (opcional, lee de REDIS_PASSWORD si es None)
+        decode_responses: Si True, decodifica respuestas a strings (default: True)
+        max_connections: Máximo de conexiones del pool (opcional, lee de
+            REDIS_MAX_CONNECTIONS si es None, default: 16)
+
+    Returns:
+        Cliente redis.asyncio (cerrar con await client.aclose())
+
+    Example:
+        async def main():
+            client = get_async_redis_connection()
+            try:
+                nombre, visitas = await asyncio.gather(
+                    client.get('usuario:1:nombre'),
+                    client.incr('pagina:visitas')
+                )
+            finally:
+                await client.aclose()
+    """
+    # Leer de parámetros o variables de entorno
+    host = host or os.getenv('REDIS_HOST', 'localhost')
+    port = port or int(os.getenv('REDIS_PORT', '6379'))
+    db = db if db is not None else int(os.getenv('REDIS_DB', '0'))
+    password = password or os.getenv('REDIS_PASSWORD', None)
+    max_connections = max_connections or int(os.getenv('REDIS_MAX_CONNECTIONS', '16'))
+
+    pool = aioredis.ConnectionPool(
+        host=host,
+        port=port,
+        db=db,
+        password=password,
+        decode_responses=decode_responses,
+        max_connections=max_connections
+    )
+    # from_pool(): aclose() también cierra el pool
+    return aioredis.Redis.from_pool(pool)
@@ -158,6 +158,56 @@ def delete_keys(*keys: str) -> int:
     return redis_client.delete(*keys)
 
 
+def mset(mapping: Dict[str, Any]) -> bool:
+    """
+    Establece varias claves en un solo comando (MSET).
+
+    Args:
+        mapping: Diccionario clave -> valor (dict/list se serializan a JSON)
+
+    Returns:
+        True si se establecieron
+
+    Example:
+        mset({'usuario:1:nombre': 'Juan', 'usuario:2:nombre': 'Ana'})
+    """
+    redis_client = get_redis_connection()
+    mapping = {
+        k: json.dumps(v) if isinstance(v, (dict, list)) else v
+        for k, v in mapping.items()
+    }
+    return redis_client.mset(mapping)
+
+
+def mget(keys: List[str], as_json: bool = False) -> List[Any]:
+    """
+    Obtiene los valores de varias claves en un solo comando (MGET).
+
+    Args:
+        keys: Lista de claves
+        as_json: Si True, deserializa cada valor como JSON
+
+    Returns:
+        Lista de valores en el mismo orden que keys (None si la clave no existe)
+
+    Example:
+        nombres = mget(['usuario:1:nombre', 'usuario:2:nombre'])
+    """
+    redis_client = get_redis_connection()
+    values = redis_client.mget(keys)
+
+    if as_json:
+        result = []
+        for value in values:
+            try:
+                result.append(json.loads(value) if value is not None else None)
+            except json.JSONDecodeError:
+                result.append(value)
+        return result
+
+    return values
+
+
 def exists(*keys: str) -> int:
     """
     Verifica si una o más claves existen.
@@ -348,6 +398,28 @@ def hset(name: str, key: str, value: Any) -> int:
     return redis_client.hset(name, key, value)
 
 
+def hset_multi(name: str, mapping: Dict[str, Any]) -> int:
+    """
+    Establece varios campos de un hash en un solo comando (HSET multi-campo).
+
+    Args:
+        name: Nombre del hash
+        mapping: Diccionario campo -> valor (dict/list se serializan a JSON)
+
+    Returns:
+        Número de campos nuevos creados
+
+    Example:
+        hset_multi('usuario:1', {'nombre': 'Juan Pérez', 'email': 'juan@email.com'})
+    """
+    redis_client = get_redis_connection()
+    mapping = {
+        k: json.dumps(v) if isinstance(v, (dict, list)) else v
+        for k, v in mapping.items()
+    }
+    return redis_client.hset(name, mapping=mapping)
+
+
 def hget(name: str, key: str, as_json: bool = False) -> Any:
     """
     Obtiene el valor de un campo de un hash.
@@ -28,6 +28,7 @@ from .sl_auth import (
 from .sl_crud import (
     get_entity,
     query_entities,
+    query_entities_iter,
     create_entity,
     update_entity,
     delete_entity,
@@ -53,6 +54,7 @@ __all__ = [
     # === CRUD ===
     "get_entity",
     "query_entities",
+    "query_entities_iter",
     "create_entity",
     "update_entity",
     "delete_entity",
@@ -5,13 +5,46 @@ Gestiona el login, logout y sesiones con Service Layer.
 """
 import os
 import requests
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
 from typing import Dict, Optional
 from datetime import datetime, timedelta
 import urllib3
+from urllib3.util.retry import Retry
 
 # Deshabilitar warnings SSL (Service Layer usa certificados auto-firmados)
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Conexiones keep-alive reutilizables hacia el Service Layer
+_POOL_SIZE = int(os.getenv('SAP_B1_HTTP_POOL') or 20)
+
+
+@lru_cache(maxsize=1)
+def _get_http_session() -> requests.Session:
+    """
+    Sesión HTTP compartida por todas las llamadas al Service Layer.
+
+    Mantiene las conexiones abiertas (keep-alive) para que login, consultas y
+    CRUD no repitan el handshake TCP+TLS en cada llamada. Los GET/DELETE se
+    reintentan hasta 3 veces ante 502/503/504; los POST y PATCH no se
+    reintentan (no están en los métodos idempotentes de urllib3).
+    """
+    session = requests.Session()
+    session.verify = False  # Service Layer usa certificados auto-firmados
+    adapter = HTTPAdapter(
+        pool_connections=_POOL_SIZE,
+        pool_maxsize=_POOL_SIZE,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
 
 # Caché global de sesión (evita login múltiple en misma ejecución)
 _session_cache = {
@@ -125,7 +158,7 @@ def login(
 
     # Realizar login
     try:
-        response = requests.post(
+        response = _get_http_session().post(
             login_url,
             json=payload,
             verify=False,  # Service Layer usa certificados auto-firmados
@@ -205,7 +238,7 @@ def logout(
         cookies['ROUTEID'] = _session_cache['route_id']
 
     try:
-        response = requests.post(
+        response = _get_http_session().post(
             logout_url,
             cookies=cookies,
             verify=False,
@@ -216,7 +249,8 @@ def logout(
         # Ignorar errores de logout (sesión puede estar expirada)
         pass
 
-    # Limpiar caché
+    # Limpiar caché (y la cookie B1SESSION guardada por la sesión HTTP)
+    _get_http_session().cookies.clear()
     _session_cache['session_id'] = None
     _session_cache['route_id'] = None
     _session_cache['expires_at'] = None
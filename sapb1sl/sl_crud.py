@@ -3,10 +3,9 @@ Operaciones CRUD para SAP Business One Service Layer.
 
 Proporciona funciones genéricas para GET, POST, PATCH, DELETE.
 """
-import requests
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Union
 import urllib3
-from .sl_auth import get_session
+from .sl_auth import get_session, _get_http_session
 
 # Deshabilitar warnings SSL
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -79,7 +78,7 @@ def get_entity(
     }
 
     # Realizar GET
-    response = requests.get(
+    response = _get_http_session().get(
         entity_url,
         params=params,
         cookies=cookies,
@@ -176,7 +175,7 @@ def query_entities(
     }
 
     # Realizar GET
-    response = requests.get(
+    response = _get_http_session().get(
         entity_url,
         params=params,
         cookies=cookies,
@@ -202,6 +201,85 @@ def query_entities(
     return result
 
 
+def query_entities_iter(
+    entity_name: str,
+    filter: Optional[str] = None,
+    select: Optional[str] = None,
+    orderby: Optional[str] = None,
+    expand: Optional[str] = None,
+    page_size: int = 100,
+    url: Optional[str] = None,
+    session: Optional[Dict] = None
+) -> Iterator[Dict]:
+    """
+    Recorre entidades página por página sin cargarlas todas en memoria (GET).
+
+    Pide páginas de page_size registros (Prefer: odata.maxpagesize) y sigue el
+    enlace odata.nextLink que devuelve el Service Layer. Solo se pide la
+    siguiente página cuando se consumió la anterior, así que cortar la
+    iteración (break) evita descargar el resto.
+
+    Args:
+        entity_name: Nombre de la entidad (ej: 'BusinessPartners')
+        filter: Filtro OData (ej: "CardType eq 'S'")
+        select: Campos a seleccionar (ej: 'CardCode,CardName')
+        orderby: Ordenamiento (ej: 'CardCode asc')
+        expand: Relaciones a expandir
+        page_size: Registros por página (default: 100)
+        url: URL base del Service Layer (opcional)
+        session: Sesión activa (opcional)
+
+    Yields:
+        Diccionario con cada entidad
+
+    Example:
+        >>> for bp in query_entities_iter('BusinessPartners', filter="CardType eq 'S'"):
+        ...     procesar(bp)
+    """
+    # Obtener sesión
+    if session is None:
+        session = get_session(url=url)
+
+    base_url = session['base_url']
+    cookies = _get_cookies(session)
+
+    params = {}
+    if filter:
+        params['$filter'] = filter
+    if select:
+        params['$select'] = select
+    if orderby:
+        params['$orderby'] = orderby
+    if expand:
+        params['$expand'] = expand
+
+    headers = {
+        'Prefer': f'odata.maxpagesize={page_size}'
+    }
+
+    next_url = f"{base_url}/{entity_name}"
+    while next_url:
+        response = _get_http_session().get(
+            next_url,
+            params=params,
+            cookies=cookies,
+            headers=headers,
+            verify=False,
+            timeout=30
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        yield from result.get('value', [])
+
+        # El nextLink ya incluye los parámetros de la consulta y el $skip
+        next_link = result.get('odata.nextLink') or result.get('@odata.nextLink')
+        if next_link and not next_link.startswith('http'):
+            next_link = f"{base_url}/{next_link}"
+        next_url = next_link
+        params = None
+
+
 def create_entity(
     entity_name: str,
     data: Dict,
@@ -244,7 +322,7 @@ def create_entity(
     entity_url = f"{base_url}/{entity_name}"
 
     # Realizar POST
-    response = requests.post(
+    response = _get_http_session().post(
         entity_url,
         json=data,
         cookies=cookies,
@@ -298,7 +376,7 @@ def update_entity(
         entity_url = f"{base_url}/{entity_name}({key})"
 
     # Realizar PATCH
-    response = requests.patch(
+    response = _get_http_session().patch(
         entity_url,
         json=data,
         cookies=cookies,
@@ -349,7 +427,7 @@ def delete_entity(
         entity_url = f"{base_url}/{entity_name}({key})"
 
     # Realizar DELETE
-    response = requests.delete(
+    response = _get_http_session().delete(
         entity_url,
         cookies=cookies,
         verify=False,
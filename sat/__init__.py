@@ -33,6 +33,9 @@ Variables de entorno opcionales:
     SAT_FIEL_CER
     SAT_FIEL_KEY
     SAT_FIEL_PASSWORD
+
+    # Lectura de PDF de CSF (auto, pypdfium2, pymupdf, pdfplumber)
+    SAT_CSF_PDF_BACKEND
 """
 
 # Generación de CFDI
@@ -47,6 +50,7 @@ from .cfdi_generator import (
 # Validación de CFDI
 from .cfdi_validator import (
     validate_cfdi_structure,
+    validate_cfdi_batch,
     validate_digital_seal,
     validate_cfdi_with_sat,
     extract_cfdi_data,
@@ -63,10 +67,13 @@ from .cfdi_stamping import (
 # Descarga masiva SAT
 from .sat_download import (
     request_download,
+    request_download_range,
     check_download_status,
     download_packages,
     extract_packages,
-    download_cfdi_full_process
+    download_cfdi_full_process,
+    download_cfdi_full_process_async,
+    close_sat_session
 )
 
 # Validación de RFC y listas negras
@@ -76,7 +83,9 @@ from .rfc_validator import (
     check_rfc_status_in_sat,
     check_multiple_rfcs,
     download_blacklist_69b,
-    is_rfc_safe_to_transact
+    load_blacklist_69b,
+    is_rfc_safe_to_transact,
+    clear_rfc_cache
 )
 
 # Constancia de Situación Fiscal
@@ -103,8 +112,9 @@ __all__ = [
     'create_cfdi_nomina',
     'xml_to_dict',
 
-    # Validación (5 funciones)
+    # Validación (6 funciones)
     'validate_cfdi_structure',
+    'validate_cfdi_batch',
     'validate_digital_seal',
     'validate_cfdi_with_sat',
     'extract_cfdi_data',
@@ -115,20 +125,25 @@ __all__ = [
     'cancel_cfdi',
     'get_stamp_status',
 
-    # Descarga masiva (5 funciones)
+    # Descarga masiva (8 funciones)
     'request_download',
+    'request_download_range',
     'check_download_status',
     'download_packages',
     'extract_packages',
     'download_cfdi_full_process',
+    'download_cfdi_full_process_async',
+    'close_sat_session',
 
-    # RFC y listas (6 funciones)
+    # RFC y listas (8 funciones)
     'validate_rfc_format',
     'check_rfc_in_blacklist_69b',
     'check_rfc_status_in_sat',
     'check_multiple_rfcs',
     'download_blacklist_69b',
+    'load_blacklist_69b',
     'is_rfc_safe_to_transact',
+    'clear_rfc_cache',
 
     # CSF (4 funciones)
     'get_csf',
@@ -142,4 +157,4 @@ __all__ = [
     'validate_csf_full',
 ]
 
-# Total: 31 funciones exportadas
+# Total: 37 funciones exportadas
@@ -6,16 +6,93 @@ estructura XML y cumplimiento con especificaciones del SAT.
 """
 import os
 import re
-from typing import Dict, List, Optional, Any
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 
+try:
+    import requests
+except ImportError:
+    requests = None
 
-def validate_cfdi_structure(xml_string: str) -> Dict[str, Any]:
+# Sesión keep-alive compartida con los demás web services del SAT
+from .sat_download import _get_session
+
+
+# Namespaces de CFDI 4.0 y 3.3
+_NS_CFDI_40 = '{http://www.sat.gob.mx/cfd/4}'
+_NS_CFDI_33 = '{http://www.sat.gob.mx/cfd/3}'
+
+# Rutas de búsqueda precalculadas por namespace
+_NODE_PATHS = {
+    ns: {
+        nodo: f'.//{ns}{nodo}'
+        for nodo in ('Emisor', 'Receptor', 'Conceptos', 'Concepto')
+    }
+    for ns in (_NS_CFDI_40, _NS_CFDI_33)
+}
+
+# RFC Persona Física: 13 caracteres (4 letras + 6 dígitos + 3 dígitos/letras)
+_PATTERN_RFC_PF = re.compile(r'^[A-ZÑ&]{4}\d{6}[A-Z0-9]{3}$')
+
+# RFC Persona Moral: 12 caracteres (3 letras + 6 dígitos + 3 dígitos/letras)
+_PATTERN_RFC_PM = re.compile(r'^[A-ZÑ&]{3}\d{6}[A-Z0-9]{3}$')
+
+# Ruta del complemento Timbre Fiscal Digital
+_TFD_PATH = './/{http://www.sat.gob.mx/TimbreFiscalDigital}TimbreFiscalDigital'
+
+# Atributos obligatorios del nodo Comprobante
+_REQUIRED_ATTRS = (
+    'Fecha', 'Sello', 'FormaPago', 'NoCertificado',
+    'Certificado', 'SubTotal', 'Total', 'TipoDeComprobante',
+    'LugarExpedicion'
+)
+
+
+def _find_cfdi_node(root: ET.Element, nodo: str) -> Optional[ET.Element]:
+    """
+    Busca un nodo del CFDI probando primero el namespace 4.0 y luego el 3.3.
+
+    Se compara contra None porque un Element sin hijos evalúa como falso.
+    """
+    for ns in (_NS_CFDI_40, _NS_CFDI_33):
+        elem = root.find(_NODE_PATHS[ns][nodo])
+        if elem is not None:
+            return elem
+    return None
+
+
+def _is_valid_fecha(fecha: str) -> bool:
+    """
+    Verifica que la fecha de un CFDI sea válida.
+
+    El atributo Fecha del SAT siempre tiene la forma AAAA-MM-DDTHH:MM:SS
+    (19 caracteres). En ese caso se verifica directamente sin crear copias
+    del string; cualquier otro formato usa el parser ISO 8601 completo.
+    """
+    if (len(fecha) == 19 and fecha[4] == '-' and fecha[7] == '-'
+            and fecha[10] == 'T' and fecha[13] == ':' and fecha[16] == ':'):
+        try:
+            datetime.fromisoformat(fecha)
+            return True
+        except ValueError:
+            return False
+
+    try:
+        datetime.fromisoformat(fecha.replace('Z', '+00:00'))
+        return True
+    except ValueError:
+        return False
+
+
+def validate_cfdi_structure(xml_string: Union[str, ET.Element]) -> Dict[str, Any]:
     """
     Valida la estructura XML de un CFDI según especificaciones del SAT.
 
     Args:
-        xml_string: String con el XML del CFDI
+        xml_string: String con el XML del CFDI, o su elemento raíz ya parseado
+            (para no volver a parsear si después se llama a extract_cfdi_data)
 
     Returns:
         Dict con resultado de validación y lista de errores si existen
@@ -31,11 +108,9 @@ def validate_cfdi_structure(xml_string: str) -> Dict[str, Any]:
     warnings = []
 
     try:
-        import xml.etree.ElementTree as ET
-
-        # Parsear XML
+        # Parsear XML (salvo que ya venga parseado)
         try:
-            root = ET.fromstring(xml_string)
+            root = xml_string if isinstance(xml_string, ET.Element) else ET.fromstring(xml_string)
         except ET.ParseError as e:
             return {
                 'valid': False,
@@ -43,35 +118,39 @@ def validate_cfdi_structure(xml_string: str) -> Dict[str, Any]:
                 'warnings': []
             }
 
-        # Validar namespace
+        # Validar namespace (si no es un CFDI no tiene caso seguir validando)
         if 'http://www.sat.gob.mx/cfd/' not in root.tag:
-            errors.append("Namespace del SAT no encontrado")
+            return {
+                'valid': False,
+                'errors': ["Namespace del SAT no encontrado"],
+                'warnings': [],
+                'version': root.get('Version')
+            }
 
         # Validar versión
         version = root.get('Version')
         if not version:
-            errors.append("Atributo 'Version' no encontrado")
+            return {
+                'valid': False,
+                'errors': ["Atributo 'Version' no encontrado"],
+                'warnings': [],
+                'version': None
+            }
         elif version not in ['3.3', '4.0']:
             warnings.append(f"Versión {version} no es estándar (3.3 o 4.0)")
 
         # Validar atributos obligatorios
-        required_attrs = [
-            'Fecha', 'Sello', 'FormaPago', 'NoCertificado',
-            'Certificado', 'SubTotal', 'Total', 'TipoDeComprobante',
-            'LugarExpedicion'
-        ]
-
-        for attr in required_attrs:
-            if not root.get(attr):
-                errors.append(f"Atributo obligatorio '{attr}' no encontrado")
+        attrib = root.attrib
+        errors.extend(
+            f"Atributo obligatorio '{attr}' no encontrado"
+            for attr in _REQUIRED_ATTRS
+            if not attrib.get(attr)
+        )
 
         # Validar formato de fecha
         fecha = root.get('Fecha')
-        if fecha:
-            try:
-                datetime.fromisoformat(fecha.replace('Z', '+00:00'))
-            except ValueError:
-                errors.append(f"Formato de fecha inválido: {fecha}")
+        if fecha and not _is_valid_fecha(fecha):
+            errors.append(f"Formato de fecha inválido: {fecha}")
 
         # Validar totales
         try:
@@ -89,8 +168,7 @@ def validate_cfdi_structure(xml_string: str) -> Dict[str, Any]:
             errors.append("SubTotal o Total no son números válidos")
 
         # Validar Emisor
-        emisor = root.find('.//{http://www.sat.gob.mx/cfd/4}Emisor') or \
-                 root.find('.//{http://www.sat.gob.mx/cfd/3}Emisor')
+        emisor = _find_cfdi_node(root, 'Emisor')
 
         if emisor is None:
             errors.append("Nodo 'Emisor' no encontrado")
@@ -101,8 +179,7 @@ def validate_cfdi_structure(xml_string: str) -> Dict[str, Any]:
                 errors.append("Nombre del Emisor no encontrado")
 
         # Validar Receptor
-        receptor = root.find('.//{http://www.sat.gob.mx/cfd/4}Receptor') or \
-                   root.find('.//{http://www.sat.gob.mx/cfd/3}Receptor')
+        receptor = _find_cfdi_node(root, 'Receptor')
 
         if receptor is None:
             errors.append("Nodo 'Receptor' no encontrado")
@@ -113,8 +190,7 @@ def validate_cfdi_structure(xml_string: str) -> Dict[str, Any]:
                 errors.append("Nombre del Receptor no encontrado")
 
         # Validar Conceptos
-        conceptos = root.find('.//{http://www.sat.gob.mx/cfd/4}Conceptos') or \
-                    root.find('.//{http://www.sat.gob.mx/cfd/3}Conceptos')
+        conceptos = _find_cfdi_node(root, 'Conceptos')
 
         if conceptos is None:
             errors.append("Nodo 'Conceptos' no encontrado")
@@ -138,6 +214,37 @@ def validate_cfdi_structure(xml_string: str) -> Dict[str, Any]:
         }
 
 
+def validate_cfdi_batch(
+    xml_strings: List[str],
+    workers: Optional[int] = None,
+    chunksize: int = 32
+) -> List[Dict[str, Any]]:
+    """
+    Valida la estructura de varios CFDIs en paralelo usando múltiples procesos.
+
+    Cada documento se valida de forma independiente con validate_cfdi_structure(),
+    repartiendo el trabajo entre los núcleos disponibles.
+
+    Args:
+        xml_strings: Lista de strings con el XML de cada CFDI
+        workers: Número de procesos (default: número de CPUs)
+        chunksize: Documentos enviados a cada proceso por lote (default: 32)
+
+    Returns:
+        Lista de resultados de validación, en el mismo orden que xml_strings
+
+    Example:
+        >>> resultados = validate_cfdi_batch(lista_xml)
+        >>> invalidos = [r for r in resultados if not r['valid']]
+        >>> print(f"CFDIs inválidos: {len(invalidos)}")
+    """
+    if not xml_strings:
+        return []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(validate_cfdi_structure, xml_strings, chunksize=chunksize))
+
+
 def validate_digital_seal(xml_string: str, cer_file: Optional[str] = None) -> Dict[str, Any]:
     """
     Valida el sello digital de un CFDI.
@@ -179,6 +286,33 @@ def validate_digital_seal(xml_string: str, cer_file: Optional[str] = None) -> Di
         }
 
 
+# Nodos de interés en la respuesta del servicio de consulta del SAT
+_SAT_RESPONSE_TAGS = frozenset(('Estado', 'CodigoEstatus', 'EsCancelable'))
+
+
+def _scan_sat_response(stream) -> Dict[str, Optional[str]]:
+    """
+    Recorre la respuesta XML del SAT de forma incremental.
+
+    Deja de leer el stream en cuanto se encontraron todos los nodos de interés.
+
+    Args:
+        stream: Objeto tipo archivo con el cuerpo de la respuesta
+
+    Returns:
+        Dict con el texto de cada nodo encontrado, indexado por nombre de nodo
+    """
+    nodos = {}
+
+    for _, elem in ET.iterparse(stream, events=('end',)):
+        if elem.tag in _SAT_RESPONSE_TAGS and elem.tag not in nodos:
+            nodos[elem.tag] = elem.text
+            if len(nodos) == len(_SAT_RESPONSE_TAGS):
+                break
+
+    return nodos
+
+
 def validate_cfdi_with_sat(uuid: str, rfc_emisor: str, rfc_receptor: str, total: float) -> Dict[str, Any]:
     """
     Valida un CFDI contra el sistema del SAT usando el web service.
@@ -201,10 +335,13 @@ def validate_cfdi_with_sat(uuid: str, rfc_emisor: str, rfc_receptor: str, total:
         ... )
         >>> print(result['estado_cfdi'])  # Vigente, Cancelado, No encontrado
     """
-    try:
-        import requests
-        from xml.etree import ElementTree as ET
+    if requests is None:
+        return {
+            'valid': False,
+            'error': "La librería requests no está instalada"
+        }
 
+    try:
         # URL del servicio del SAT
         url = "https://consultaqr.facturaelectronica.sat.gob.mx/ConsultaCFDIService.svc"
 
@@ -216,30 +353,29 @@ def validate_cfdi_with_sat(uuid: str, rfc_emisor: str, rfc_receptor: str, total:
             'tt': f"{total:.6f}".replace('.', '')[-10:]
         }
 
-        # Realizar consulta
-        response = requests.get(url, params=params, timeout=30)
+        # Realizar consulta por la sesión keep-alive compartida con los demás
+        # web services del SAT (la respuesta se lee en streaming)
+        with _get_session().get(url, params=params, timeout=30, stream=True) as response:
+            if response.status_code != 200:
+                return {
+                    'valid': False,
+                    'error': f"Error HTTP {response.status_code}",
+                    'message': 'No se pudo consultar el CFDI en el SAT'
+                }
 
-        if response.status_code == 200:
-            # Parsear respuesta XML
-            root = ET.fromstring(response.content)
+            # Parsear respuesta XML de forma incremental
+            response.raw.decode_content = True
+            nodos = _scan_sat_response(response.raw)
 
-            # Extraer estado
-            estado = root.find('.//Estado')
-            codigo_estado = root.find('.//CodigoEstatus')
+        estado = nodos.get('Estado')
 
-            return {
-                'valid': True,
-                'encontrado': estado.text if estado is not None else 'No encontrado',
-                'estado_cfdi': estado.text if estado is not None else None,
-                'codigo_estado': codigo_estado.text if codigo_estado is not None else None,
-                'es_cancelable': root.find('.//EsCancelable') is not None
-            }
-        else:
-            return {
-                'valid': False,
-                'error': f"Error HTTP {response.status_code}",
-                'message': 'No se pudo consultar el CFDI en el SAT'
-            }
+        return {
+            'valid': True,
+            'encontrado': estado if estado is not None else 'No encontrado',
+            'estado_cfdi': estado,
+            'codigo_estado': nodos.get('CodigoEstatus'),
+            'es_cancelable': 'EsCancelable' in nodos
+        }
 
     except requests.RequestException as e:
         return {
@@ -253,12 +389,12 @@ def validate_cfdi_with_sat(uuid: str, rfc_emisor: str, rfc_receptor: str, total:
         }
 
 
-def extract_cfdi_data(xml_string: str) -> Dict[str, Any]:
+def extract_cfdi_data(xml_string: Union[str, ET.Element]) -> Dict[str, Any]:
     """
     Extrae los datos principales de un CFDI.
 
     Args:
-        xml_string: String con el XML del CFDI
+        xml_string: String con el XML del CFDI, o su elemento raíz ya parseado
 
     Returns:
         Dict con los datos extraídos del CFDI
@@ -267,19 +403,17 @@ def extract_cfdi_data(xml_string: str) -> Dict[str, Any]:
         >>> data = extract_cfdi_data(xml_cfdi)
         >>> print(f"Total: ${data['total']}")
         >>> print(f"Emisor: {data['emisor']['nombre']}")
+        >>>
+        >>> # Parsear una sola vez para validar y extraer
+        >>> root = ET.fromstring(xml_cfdi)
+        >>> if validate_cfdi_structure(root)['valid']:
+        ...     data = extract_cfdi_data(root)
     """
     try:
-        import xml.etree.ElementTree as ET
+        root = xml_string if isinstance(xml_string, ET.Element) else ET.fromstring(xml_string)
 
-        root = ET.fromstring(xml_string)
-
-        # Namespace para CFDI 4.0 y 3.3
-        ns40 = '{http://www.sat.gob.mx/cfd/4}'
-        ns33 = '{http://www.sat.gob.mx/cfd/3}'
-        ns_tfd = '{http://www.sat.gob.mx/TimbreFiscalDigital}'
-
-        # Determinar namespace
-        ns = ns40 if ns40 in root.tag else ns33
+        # Determinar rutas según namespace (CFDI 4.0 o 3.3)
+        paths = _NODE_PATHS[_NS_CFDI_40 if _NS_CFDI_40 in root.tag else _NS_CFDI_33]
 
         # Datos del comprobante
         cfdi_data = {
@@ -299,7 +433,7 @@ def extract_cfdi_data(xml_string: str) -> Dict[str, Any]:
         }
 
         # Datos del emisor
-        emisor = root.find(f'.//{ns}Emisor')
+        emisor = root.find(paths['Emisor'])
         if emisor is not None:
             cfdi_data['emisor'] = {
                 'rfc': emisor.get('Rfc'),
@@ -308,7 +442,7 @@ def extract_cfdi_data(xml_string: str) -> Dict[str, Any]:
             }
 
         # Datos del receptor
-        receptor = root.find(f'.//{ns}Receptor')
+        receptor = root.find(paths['Receptor'])
         if receptor is not None:
             cfdi_data['receptor'] = {
                 'rfc': receptor.get('Rfc'),
@@ -319,7 +453,7 @@ def extract_cfdi_data(xml_string: str) -> Dict[str, Any]:
             }
 
         # Conceptos
-        conceptos = root.findall(f'.//{ns}Concepto')
+        conceptos = root.findall(paths['Concepto'])
         cfdi_data['conceptos'] = []
 
         for concepto in conceptos:
@@ -336,7 +470,7 @@ def extract_cfdi_data(xml_string: str) -> Dict[str, Any]:
             })
 
         # Timbre Fiscal Digital
-        timbre = root.find(f'.//{ns_tfd}TimbreFiscalDigital')
+        timbre = root.find(_TFD_PATH)
         if timbre is not None:
             cfdi_data['timbre'] = {
                 'uuid': timbre.get('UUID'),
@@ -369,22 +503,14 @@ def validate_rfc_format(rfc: str) -> Dict[str, bool]:
         >>> if result['valid']:
         ...     print(f"RFC válido: {result['tipo']}")
     """
-    # RFC Persona Física: 13 caracteres (4 letras + 6 dígitos + 3 dígitos/letras)
-    # RFC Persona Moral: 12 caracteres (3 letras + 6 dígitos + 3 dígitos/letras)
-
     if not rfc:
         return {'valid': False, 'error': 'RFC vacío'}
 
     rfc = rfc.upper().strip()
 
-    # Persona Física
-    pattern_pf = r'^[A-ZÑ&]{4}\d{6}[A-Z0-9]{3}$'
-    # Persona Moral
-    pattern_pm = r'^[A-ZÑ&]{3}\d{6}[A-Z0-9]{3}$'
-
-    if re.match(pattern_pf, rfc):
+    if _PATTERN_RFC_PF.match(rfc):
         return {'valid': True, 'tipo': 'Persona Física', 'longitud': 13}
-    elif re.match(pattern_pm, rfc):
+    elif _PATTERN_RFC_PM.match(rfc):
         return {'valid': True, 'tipo': 'Persona Moral', 'longitud': 12}
     else:
         return {
@@ -5,15 +5,42 @@ Este módulo permite obtener y validar la Constancia de Situación Fiscal de con
 La CSF es el documento que acredita la inscripción en el RFC y los datos fiscales del contribuyente.
 """
 import os
+import re
+import base64
+import importlib.util
 from typing import Dict, Optional, Any
 from datetime import datetime
 
 
+# Patrón del RFC en el texto de la CSF (compilado una sola vez)
+_RFC_RE = re.compile(r'RFC:\s*([A-Z0-9]{12,13})')
+
+
+def _extract_nombre(text: str) -> Optional[str]:
+    """
+    Extrae el nombre de la línea que contiene 'Nombre' en el texto de la CSF.
+
+    Usa un recorrido lineal con str.find en lugar de una expresión regular
+    con cuantificador perezoso, evitando el backtracking en texto mal formado.
+    """
+    idx = text.find('Nombre')
+    while idx != -1:
+        fin = text.find('\n', idx)
+        linea = text[idx:] if fin == -1 else text[idx:fin]
+        _, sep, valor = linea.partition(':')
+        valor = valor.strip()
+        if sep and valor:
+            return valor
+        idx = text.find('Nombre', idx + 6)
+    return None
+
+
 def get_csf(
     rfc: str,
     certificado: Optional[str] = None,
     key_file: Optional[str] = None,
-    key_password: Optional[str] = None
+    key_password: Optional[str] = None,
+    return_bytes: bool = False
 ) -> Dict[str, Any]:
     """
     Obtiene la Constancia de Situación Fiscal de un contribuyente.
@@ -25,9 +52,11 @@ def get_csf(
         certificado: Ruta al .cer de la FIEL
         key_file: Ruta al .key de la FIEL
         key_password: Contraseña de la llave
+        return_bytes: Si es True, 'pdf' contiene los bytes del PDF en lugar
+            de base64 (evita codificar y decodificar en procesos internos)
 
     Returns:
-        Dict con la CSF (PDF en base64) y datos fiscales
+        Dict con la CSF (PDF en base64 o bytes) y datos fiscales
 
     Example:
         >>> csf = get_csf(
@@ -39,6 +68,12 @@ def get_csf(
         >>> if csf['success']:
         ...     with open('csf.pdf', 'wb') as f:
         ...         f.write(base64.b64decode(csf['pdf']))
+
+        >>> # Obtener directamente los bytes del PDF
+        >>> csf = get_csf(rfc='XAXX010101000', return_bytes=True)
+        >>> if csf['success']:
+        ...     with open('csf.pdf', 'wb') as f:
+        ...         f.write(csf['pdf'])
     """
     # Usar variables de entorno como fallback
     certificado = certificado or os.getenv('SAT_FIEL_CER')
@@ -54,11 +89,13 @@ def get_csf(
     try:
         # Autenticarse en el portal del SAT y obtener CSF
         # Esto requeriría automatización web o API del SAT
+        pdf_bytes = b''  # Contenido binario del PDF devuelto por el SAT
 
         return {
             'success': True,
             'rfc': rfc,
-            'pdf': 'BASE64_ENCODED_PDF',  # PDF en base64
+            # Solo se codifica en base64 si el llamador no pidió los bytes
+            'pdf': pdf_bytes if return_bytes else base64.b64encode(pdf_bytes).decode('ascii'),
             'fecha_emision': datetime.now().isoformat(),
             'datos_fiscales': {
                 'nombre_razon_social': 'CONTRIBUYENTE GENERICO',
@@ -102,12 +139,58 @@ def get_csf(
         }
 
 
-def parse_csf_pdf(pdf_file: str) -> Dict[str, Any]:
+def _extract_text_pypdfium2(pdf_file: str) -> str:
+    """Extrae el texto del PDF con pypdfium2."""
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(pdf_file)
+    try:
+        return '\n'.join(page.get_textpage().get_text_range() for page in pdf) + '\n'
+    finally:
+        pdf.close()
+
+
+def _extract_text_pymupdf(pdf_file: str) -> str:
+    """Extrae el texto del PDF con PyMuPDF."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_file) as pdf:
+        return '\n'.join(page.get_text() for page in pdf) + '\n'
+
+
+def _extract_text_pdfplumber(pdf_file: str) -> str:
+    """Extrae el texto del PDF con pdfplumber."""
+    import pdfplumber
+
+    with pdfplumber.open(pdf_file) as pdf:
+        # Acumular páginas en lista y unir al final (evita concatenación cuadrática)
+        return '\n'.join(page.extract_text() or '' for page in pdf.pages) + '\n'
+
+
+def _module_available(name: str) -> bool:
+    """Indica si un módulo está instalado sin importarlo."""
+    return importlib.util.find_spec(name) is not None
+
+
+# Backends de extracción de texto, en orden de preferencia para 'auto'
+# (pypdfium2 y PyMuPDF son mucho más rápidos que pdfplumber en texto plano).
+# Cada librería se importa sólo al usarse, no al cargar el módulo.
+_PDF_BACKENDS = {
+    'pypdfium2': (lambda: _module_available('pypdfium2'), _extract_text_pypdfium2),
+    'pymupdf': (lambda: _module_available('fitz'), _extract_text_pymupdf),
+    'pdfplumber': (lambda: _module_available('pdfplumber'), _extract_text_pdfplumber),
+}
+
+
+def parse_csf_pdf(pdf_file: str, backend: Optional[str] = None) -> Dict[str, Any]:
     """
     Extrae información de un archivo PDF de CSF.
 
     Args:
         pdf_file: Ruta al archivo PDF de la CSF
+        backend: Librería para extraer el texto: 'pypdfium2', 'pymupdf',
+            'pdfplumber' o 'auto' (default: SAT_CSF_PDF_BACKEND o 'auto',
+            que usa la primera librería instalada en ese orden)
 
     Returns:
         Dict con datos extraídos de la CSF
@@ -117,33 +200,45 @@ def parse_csf_pdf(pdf_file: str) -> Dict[str, Any]:
         >>> print(f"RFC: {datos['rfc']}")
         >>> print(f"Régimen: {datos['regimen']}")
     """
-    try:
-        # Extraer texto del PDF usando PyPDF2 o pdfplumber
-        import pdfplumber
-
-        with pdfplumber.open(pdf_file) as pdf:
-            text = ''
-            for page in pdf.pages:
-                text += page.extract_text() + '\n'
+    backend = (backend or os.getenv('SAT_CSF_PDF_BACKEND') or 'auto').lower()
+
+    if backend == 'auto':
+        extract_text = next(
+            (extract for disponible, extract in _PDF_BACKENDS.values() if disponible()),
+            None
+        )
+        if extract_text is None:
+            return {
+                'success': False,
+                'error': 'Ninguna librería de PDF instalada: pip install pypdfium2 (o pymupdf, pdfplumber)'
+            }
+    elif backend in _PDF_BACKENDS:
+        disponible, extract_text = _PDF_BACKENDS[backend]
+        if not disponible():
+            return {
+                'success': False,
+                'error': f'Librería {backend} no instalada: pip install {backend}'
+            }
+    else:
+        return {
+            'success': False,
+            'error': f"Backend de PDF no soportado: {backend}. Use: auto, {', '.join(_PDF_BACKENDS)}"
+        }
 
-        # Extraer datos usando expresiones regulares
-        import re
+    try:
+        # Extraer texto del PDF
+        text = extract_text(pdf_file)
 
-        rfc_match = re.search(r'RFC:\s*([A-Z0-9]{12,13})', text)
-        nombre_match = re.search(r'Nombre.*?:\s*(.+)', text)
+        # Extraer datos
+        rfc_match = _RFC_RE.search(text)
 
         return {
             'success': True,
             'rfc': rfc_match.group(1) if rfc_match else None,
-            'nombre': nombre_match.group(1).strip() if nombre_match else None,
+            'nombre': _extract_nombre(text),
             'texto_completo': text
         }
 
-    except ImportError:
-        return {
-            'success': False,
-            'error': 'Librería pdfplumber no instalada: pip install pdfplumber'
-        }
     except Exception as e:
         return {
             'success': False,
@@ -197,12 +292,14 @@ def validate_csf(
         except ValueError:
             warnings.append('Formato de fecha inválido')
 
+    datos_fiscales = csf_data.get('datos_fiscales') or {}
+
     # Validar que tenga régimen fiscal
-    if not csf_data.get('datos_fiscales', {}).get('regimenes'):
+    if not datos_fiscales.get('regimenes'):
         errors.append('No se encontraron regímenes fiscales')
 
     # Validar situación del contribuyente
-    situacion = csf_data.get('datos_fiscales', {}).get('situacion_contribuyente')
+    situacion = datos_fiscales.get('situacion_contribuyente')
     if situacion and situacion != 'Activo':
         errors.append(f'Contribuyente no activo: {situacion}')
 
@@ -241,36 +338,58 @@ def get_fiscal_situation_summary(rfc: str) -> Dict[str, Any]:
         status = check_rfc_status_in_sat(rfc)
         lista_69b = check_rfc_in_blacklist_69b(rfc)
 
-        # Detectar riesgos
-        riesgos = []
-        if lista_69b.get('en_lista'):
-            riesgos.append('En lista 69-B')
-        if status.get('no_localizado'):
-            riesgos.append('No localizado')
-        if not status.get('certificados_vigentes'):
-            riesgos.append('Sin certificados vigentes')
-
-        # Determinar estado general
-        if not status.get('activo'):
-            estado = 'Inactivo'
-        elif riesgos:
-            estado = 'Activo con alertas'
-        else:
-            estado = 'Activo sin alertas'
-
-        return {
-            'success': True,
-            'rfc': rfc,
-            'estado': estado,
-            'activo': status.get('activo'),
-            'riesgos': riesgos,
-            'nombre': status.get('nombre'),
-            'regimenes': status.get('regimen_fiscal'),
-            'fecha_consulta': datetime.now().isoformat()
-        }
+        return _summarize_fiscal_situation(rfc, status, lista_69b)
 
     except Exception as e:
         return {
             'success': False,
             'error': str(e)
         }
+
+
+def _summarize_fiscal_situation(
+    rfc: str,
+    status: Dict[str, Any],
+    lista_69b: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Construye el resumen de situación fiscal a partir de consultas ya hechas al SAT.
+
+    Permite reutilizar los resultados de check_rfc_status_in_sat() y
+    check_rfc_in_blacklist_69b() sin volver a consultar al SAT.
+
+    Args:
+        rfc: RFC del contribuyente
+        status: Resultado de check_rfc_status_in_sat()
+        lista_69b: Resultado de check_rfc_in_blacklist_69b()
+
+    Returns:
+        Dict con el mismo formato que get_fiscal_situation_summary()
+    """
+    # Detectar riesgos
+    riesgos = []
+    if lista_69b.get('en_lista'):
+        riesgos.append('En lista 69-B')
+    if status.get('no_localizado'):
+        riesgos.append('No localizado')
+    if not status.get('certificados_vigentes'):
+        riesgos.append('Sin certificados vigentes')
+
+    # Determinar estado general
+    if not status.get('activo'):
+        estado = 'Inactivo'
+    elif riesgos:
+        estado = 'Activo con alertas'
+    else:
+        estado = 'Activo sin alertas'
+
+    return {
+        'success': True,
+        'rfc': rfc,
+        'estado': estado,
+        'activo': status.get('activo'),
+        'riesgos': riesgos,
+        'nombre': status.get('nombre'),
+        'regimenes': status.get('regimen_fiscal'),
+        'fecha_consulta': datetime.now().isoformat()
+    }
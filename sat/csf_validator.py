@@ -10,7 +10,7 @@ Funciones principales:
 - validate_csf_full: Proceso completo de validación con reporte HTML
 
 Dependencias:
-    pip install pdfplumber
+    pip install pdfplumber  (o pypdfium2 / pymupdf, más rápidos)
 
 Uso básico:
     from paquetes.sat.csf_validator import validate_csf_full
@@ -25,9 +25,187 @@ Uso básico:
         print(f"Reporte generado: {result['html_file']}")
 """
 import os
-from typing import Dict, Optional, Any
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
+from string import Template
+
+
+# Tabla de escape HTML para valores insertados en el reporte
+_HTML_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;'
+})
+
+
+def _escape(valor: Any) -> str:
+    """Escapa un valor para insertarlo de forma segura en el HTML del reporte."""
+    return '' if valor is None else str(valor).translate(_HTML_ESCAPE)
+
+
+# Formato de un elemento de lista HTML
+_LI_FORMAT = '<li>{}</li>'.format
+
+
+def _template_to_format(texto: str) -> str:
+    """
+    Convierte una plantilla con marcadores $nombre en un string para str.format.
+
+    La conversión se hace una sola vez al importar el módulo; al generar cada
+    reporte solo se ejecuta str.format (implementado en C), sin volver a
+    recorrer la plantilla con expresiones regulares.
+    """
+    def marcador(match):
+        if match.group('escaped') is not None:
+            return '$'
+        return '{' + (match.group('named') or match.group('braced')) + '}'
+
+    return Template.pattern.sub(marcador, texto.replace('{', '{{').replace('}', '}}'))
+
+
+# Plantillas del reporte HTML (se preparan una sola vez al importar el módulo).
+# El reporte se escribe por partes: encabezado, secciones de la CSF y resumen final.
+_REPORT_HEADER = _template_to_format('''<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Reporte CSF - $rfc</title>
+    <style>
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body { font-family: 'Segoe UI', sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 20px; color: #333; }
+        .container { max-width: 1200px; margin: 0 auto; background: white; border-radius: 12px; box-shadow: 0 10px 40px rgba(0,0,0,0.2); overflow: hidden; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; }
+        .header h1 { font-size: 2em; margin-bottom: 10px; }
+        .header .rfc { font-size: 1.5em; font-weight: bold; letter-spacing: 2px; margin: 15px 0; }
+        .header .fecha { opacity: 0.9; font-size: 0.9em; }
+        .content { padding: 30px; }
+        .seccion { margin-bottom: 30px; border-left: 4px solid #667eea; padding-left: 20px; }
+        .seccion h2 { color: #667eea; margin-bottom: 15px; font-size: 1.5em; }
+        .card { background: #f8f9fa; border-radius: 8px; padding: 20px; margin-bottom: 15px; }
+        .status-badge { display: inline-block; padding: 8px 16px; border-radius: 20px; font-weight: bold; font-size: 0.9em; margin: 10px 0; }
+        .badge-success { background: #d4edda; color: #155724; }
+        .badge-warning { background: #fff3cd; color: #856404; }
+        .badge-danger { background: #f8d7da; color: #721c24; }
+        .info-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 15px; margin-top: 15px; }
+        .info-item { background: white; padding: 15px; border-radius: 6px; border-left: 3px solid #667eea; }
+        .info-item .label { font-size: 0.85em; color: #666; margin-bottom: 5px; text-transform: uppercase; font-weight: 600; }
+        .info-item .value { font-size: 1.1em; color: #333; font-weight: 500; }
+        .lista { list-style: none; margin-top: 10px; }
+        .lista li { padding: 8px 0; border-bottom: 1px solid #eee; }
+        .lista li:before { content: "✓ "; color: #28a745; font-weight: bold; margin-right: 8px; }
+        .lista.riesgos li:before { content: "⚠ "; color: #ffc107; }
+        .lista.errores li:before { content: "✗ "; color: #dc3545; }
+        .resumen { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 25px; border-radius: 8px; margin-top: 30px; }
+        .resumen h3 { margin-bottom: 15px; font-size: 1.3em; }
+        .resumen-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin-top: 15px; }
+        .resumen-item { background: rgba(255,255,255,0.1); padding: 15px; border-radius: 6px; }
+        .resumen-item .label { font-size: 0.85em; opacity: 0.9; margin-bottom: 5px; }
+        .resumen-item .value { font-size: 1.3em; font-weight: bold; }
+        .footer { text-align: center; padding: 20px; background: #f8f9fa; color: #666; font-size: 0.9em; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>📋 Reporte de Validación CSF</h1>
+            <div class="rfc">$rfc</div>
+            <div class="fecha">Generado: $fecha</div>
+        </div>
+        <div class="content">
+            <div class="seccion">
+                <h2>1. Validación de RFC</h2>
+                <div class="card">
+                    <span class="status-badge $badge_formato">
+                        $texto_formato
+                    </span>
+                    <div class="info-grid">
+                        <div class="info-item"><div class="label">RFC</div><div class="value">$rfc</div></div>
+                        <div class="info-item"><div class="label">Tipo</div><div class="value">$tipo_persona</div></div>
+                        <div class="info-item"><div class="label">Longitud</div><div class="value">$longitud caracteres</div></div>
+                    </div>
+                </div>
+            </div>
+            <div class="seccion">
+                <h2>2. Situación Fiscal</h2>
+                <div class="card">
+                    <span class="status-badge $badge_activo">
+                        $estado
+                    </span>
+                    <div class="info-grid">
+                        $nombre_html
+                        <div class="info-item"><div class="label">Contribuyente</div><div class="value">$contribuyente</div></div>
+                    </div>
+                    $regimenes_html
+                </div>
+            </div>
+            <div class="seccion">
+                <h2>3. Validación para Transacciones</h2>
+                <div class="card">
+                    <span class="status-badge $badge_transaccion">
+                        $texto_transaccion
+                    </span>
+                    $riesgos_html
+                </div>
+            </div>
+            ''')
+
+_REPORT_FOOTER = _template_to_format('''
+            <div class="resumen">
+                <h3>📊 Resumen Final</h3>
+                <div class="resumen-grid">
+                    <div class="resumen-item"><div class="label">RFC</div><div class="value">$rfc</div></div>
+                    <div class="resumen-item"><div class="label">Tipo</div><div class="value">$tipo_persona</div></div>
+                    <div class="resumen-item"><div class="label">Estado</div><div class="value">$estado</div></div>
+                    <div class="resumen-item"><div class="label">Transacciones</div><div class="value">$resumen_transaccion</div></div>
+                </div>
+                $resumen_riesgos
+            </div>
+        </div>
+        <div class="footer">
+            <p>Reporte generado por Sistema de Validación CSF</p>
+            <p>$fecha</p>
+        </div>
+    </div>
+</body>
+</html>''')
+
+
+@dataclass(slots=True)
+class _CSFValidation:
+    """
+    Datos de validación que se van llenando en validate_csf_from_pdf().
+
+    Se convierte a dict con to_dict() al final, que es el formato que
+    reciben los llamadores y generate_html_report().
+    """
+    success: bool = False
+    fecha_validacion: Optional[str] = None
+    archivo_pdf: Optional[str] = None
+    formato_valido: bool = False
+    rfc: Optional[str] = None
+    error: Optional[str] = None
+    csf_rfc: Optional[str] = None
+    csf_nombre: Optional[str] = None
+    tipo_persona: Optional[str] = None
+    longitud: Optional[int] = None
+    seguro_transaccionar: Optional[bool] = None
+    estado: Optional[str] = None
+    activo: Optional[bool] = None
+    nombre: Optional[str] = None
+    regimenes: Optional[List[str]] = None
+    riesgos: Optional[List[str]] = None
+    csf_valida: Optional[bool] = None
+    csf_errores: Optional[List[str]] = None
+    csf_warnings: Optional[List[str]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte a dict con todos los campos (None en los que no se llenaron)."""
+        return asdict(self)
 
 
 def validate_csf_from_pdf(
@@ -71,68 +249,72 @@ def validate_csf_from_pdf(
         from paquetes.sat import (
             parse_csf_pdf,
             validate_csf,
-            get_fiscal_situation_summary,
             validate_rfc_format,
             is_rfc_safe_to_transact
         )
+        from paquetes.sat.csf import _summarize_fiscal_situation
     except ImportError as e:
         return {
             'success': False,
             'error': f'Error al importar módulo SAT: {e}'
         }
 
-    resultado = {
-        'success': False,
-        'fecha_validacion': datetime.now().isoformat(),
-        'archivo_pdf': pdf_file,
-        'formato_valido': False,
-        'rfc': expected_rfc or 'Desconocido'
-    }
+    resultado = _CSFValidation(
+        fecha_validacion=datetime.now().isoformat(),
+        archivo_pdf=pdf_file,
+        rfc=expected_rfc or 'Desconocido'
+    )
 
     # Verificar que el archivo existe
-    if not os.path.exists(pdf_file):
-        resultado['error'] = f'Archivo no encontrado: {pdf_file}'
-        return resultado
+    try:
+        os.stat(pdf_file)
+    except FileNotFoundError:
+        resultado.error = f'Archivo no encontrado: {pdf_file}'
+        return resultado.to_dict()
+    except OSError as e:
+        # Permisos, ruta inválida, etc.
+        resultado.error = f'No se pudo acceder al archivo {pdf_file}: {e}'
+        return resultado.to_dict()
 
     # Paso 1: Extraer datos del PDF
     csf_datos = parse_csf_pdf(pdf_file)
     if not csf_datos['success']:
-        resultado['error'] = f"Error al leer PDF: {csf_datos['error']}"
-        return resultado
+        resultado.error = f"Error al leer PDF: {csf_datos['error']}"
+        return resultado.to_dict()
 
     # Obtener RFC del PDF o usar el esperado
     rfc = csf_datos.get('rfc') or expected_rfc
     if not rfc:
-        resultado['error'] = 'RFC no encontrado en PDF ni proporcionado'
-        return resultado
+        resultado.error = 'RFC no encontrado en PDF ni proporcionado'
+        return resultado.to_dict()
 
-    resultado['rfc'] = rfc
-    resultado['csf_rfc'] = csf_datos.get('rfc')
-    resultado['csf_nombre'] = csf_datos.get('nombre')
+    resultado.rfc = rfc
+    resultado.csf_rfc = csf_datos.get('rfc')
+    resultado.csf_nombre = csf_datos.get('nombre')
 
     # Paso 2: Validar formato de RFC
     formato = validate_rfc_format(rfc)
-    resultado['formato_valido'] = formato['valid']
+    resultado.formato_valido = formato['valid']
 
     if not formato['valid']:
-        resultado['error'] = f"RFC inválido: {formato['error']}"
-        return resultado
-
-    resultado['tipo_persona'] = formato['tipo']
-    resultado['longitud'] = formato['longitud']
-
-    # Paso 3: Obtener situación fiscal
-    resumen = get_fiscal_situation_summary(rfc)
-    if resumen['success']:
-        resultado['estado'] = resumen['estado']
-        resultado['activo'] = resumen['activo']
-        resultado['nombre'] = resumen.get('nombre')
-        resultado['regimenes'] = resumen.get('regimenes', [])
-        resultado['riesgos'] = resumen.get('riesgos', [])
-
-    # Paso 4: Validar para transacciones
+        resultado.error = f"RFC inválido: {formato['error']}"
+        return resultado.to_dict()
+
+    resultado.tipo_persona = formato['tipo']
+    resultado.longitud = formato['longitud']
+
+    # Paso 3: Validar para transacciones (consulta lista 69-B y estado en el SAT)
     seguridad = is_rfc_safe_to_transact(rfc)
-    resultado['seguro_transaccionar'] = seguridad['seguro']
+    resultado.seguro_transaccionar = seguridad['seguro']
+
+    # Paso 4: Obtener situación fiscal reutilizando las consultas del paso 3
+    detalles = seguridad['detalles']
+    resumen = _summarize_fiscal_situation(rfc, detalles['status_sat'], detalles['lista_69b'])
+    resultado.estado = resumen['estado']
+    resultado.activo = resumen['activo']
+    resultado.nombre = resumen.get('nombre')
+    resultado.regimenes = resumen.get('regimenes', [])
+    resultado.riesgos = resumen.get('riesgos', [])
 
     # Paso 5: Validar la CSF
     validacion_csf = validate_csf(
@@ -141,80 +323,60 @@ def validate_csf_from_pdf(
         fecha_emision=None
     )
 
-    resultado['csf_valida'] = validacion_csf['valid']
-    resultado['csf_errores'] = validacion_csf.get('errors', [])
-    resultado['csf_warnings'] = validacion_csf.get('warnings', [])
+    resultado.csf_valida = validacion_csf['valid']
+    resultado.csf_errores = validacion_csf.get('errors', [])
+    resultado.csf_warnings = validacion_csf.get('warnings', [])
 
-    resultado['success'] = True
-    return resultado
+    resultado.success = True
+    return resultado.to_dict()
 
 
-def generate_html_report(
-    validation_data: Dict[str, Any],
-    output_file: str
-) -> Dict[str, Any]:
-    """
-    Genera un reporte HTML profesional a partir de los datos de validación.
+# Fragmentos fijos cuando no se detectaron riesgos
+_SIN_RIESGOS_HTML = '<p style="margin-top: 15px; color: #28a745;">✓ Sin riesgos detectados</p>'
+_SIN_RIESGOS_RESUMEN = '<div style="margin-top: 20px; background: rgba(255,255,255,0.1); padding: 15px; border-radius: 6px;">✓ Sin riesgos - Seguro para transacciones</div>'
 
-    Args:
-        validation_data: Diccionario retornado por validate_csf_from_pdf()
-        output_file: Ruta del archivo HTML de salida
 
-    Returns:
-        Dict con resultado:
-        {
-            'success': bool,
-            'html_file': str,
-            'size_bytes': int
-        }
+def _build_seccion_csf(datos: Dict[str, Any]) -> str:
+    """Sección 4 del reporte: datos extraídos del PDF de la CSF."""
+    archivo_pdf = datos.get('archivo_pdf')
+    archivo_info = f'<div style="margin-top: 20px;"><strong>Archivo PDF:</strong><br>{_escape(archivo_pdf)}</div>' if archivo_pdf else ''
 
-    Example:
-        >>> data = validate_csf_from_pdf('constancia.pdf')
-        >>> result = generate_html_report(data, 'reporte.html')
-        >>> print(f"Reporte: {result['html_file']}")
-    """
-    try:
-        datos = validation_data
-
-        # Construir secciones HTML dinámicas
-        seccion_csf = ""
-        if datos.get('csf_rfc'):
-            archivo_info = f'<div style="margin-top: 20px;"><strong>Archivo PDF:</strong><br>{datos.get("archivo_pdf")}</div>' if datos.get('archivo_pdf') else ''
-            seccion_csf = f'''
+    return f'''
                 <div class="seccion">
                     <h2>4. Datos Extraídos de la CSF</h2>
                     <div class="card">
                         <div class="info-grid">
                             <div class="info-item">
                                 <div class="label">RFC en CSF</div>
-                                <div class="value">{datos.get('csf_rfc', 'N/A')}</div>
+                                <div class="value">{_escape(datos.get('csf_rfc') or 'N/A')}</div>
                             </div>
                             <div class="info-item">
                                 <div class="label">Nombre en CSF</div>
-                                <div class="value">{datos.get('csf_nombre', 'N/A')}</div>
+                                <div class="value">{_escape(datos.get('csf_nombre') or 'N/A')}</div>
                             </div>
                         </div>
                         {archivo_info}
                     </div>
                 </div>'''
 
-        # Sección de validación CSF
-        seccion_validacion_csf = ""
-        if datos.get('csf_valida') is not None:
-            badge_class = 'badge-success' if datos.get('csf_valida') else 'badge-danger'
-            badge_text = '✓ CSF Válida' if datos.get('csf_valida') else '✗ CSF Inválida'
 
-            errores_html = ""
-            if datos.get('csf_errores'):
-                errores_items = ''.join([f'<li>{error}</li>' for error in datos['csf_errores']])
-                errores_html = f'<div style="margin-top: 15px;"><strong>Errores:</strong><ul class="lista errores">{errores_items}</ul></div>'
+def _build_seccion_validacion_csf(datos: Dict[str, Any]) -> str:
+    """Sección 5 del reporte: resultado de validate_csf()."""
+    csf_valida = datos.get('csf_valida')
+    badge_class = 'badge-success' if csf_valida else 'badge-danger'
+    badge_text = '✓ CSF Válida' if csf_valida else '✗ CSF Inválida'
 
-            warnings_html = ""
-            if datos.get('csf_warnings'):
-                warnings_items = ''.join([f'<li>{warning}</li>' for warning in datos['csf_warnings']])
-                warnings_html = f'<div style="margin-top: 15px;"><strong>Advertencias:</strong><ul class="lista riesgos">{warnings_items}</ul></div>'
+    errores_html = ""
+    if datos.get('csf_errores'):
+        errores_items = ''.join(map(_LI_FORMAT, map(_escape, datos['csf_errores'])))
+        errores_html = f'<div style="margin-top: 15px;"><strong>Errores:</strong><ul class="lista errores">{errores_items}</ul></div>'
 
-            seccion_validacion_csf = f'''
+    warnings_html = ""
+    if datos.get('csf_warnings'):
+        warnings_items = ''.join(map(_LI_FORMAT, map(_escape, datos['csf_warnings'])))
+        warnings_html = f'<div style="margin-top: 15px;"><strong>Advertencias:</strong><ul class="lista riesgos">{warnings_items}</ul></div>'
+
+    return f'''
                 <div class="seccion">
                     <h2>5. Validación de la CSF</h2>
                     <div class="card">
@@ -224,143 +386,104 @@ def generate_html_report(
                     </div>
                 </div>'''
 
-        # Sección de regímenes
-        regimenes_html = ""
-        if datos.get('regimenes'):
-            regimenes_items = ''.join([f'<li>{reg}</li>' for reg in datos['regimenes']])
-            regimenes_html = f'<div style="margin-top: 20px;"><strong>Regímenes Fiscales:</strong><ul class="lista">{regimenes_items}</ul></div>'
 
-        # Sección de riesgos
-        riesgos_html = ""
-        if datos.get('riesgos'):
-            riesgos_items = ''.join([f'<li>{riesgo}</li>' for riesgo in datos['riesgos']])
-            riesgos_html = f'<div style="margin-top: 15px;"><strong>Riesgos:</strong><ul class="lista riesgos">{riesgos_items}</ul></div>'
-        else:
-            riesgos_html = '<p style="margin-top: 15px; color: #28a745;">✓ Sin riesgos detectados</p>'
+def _build_regimenes_html(regimenes: list) -> str:
+    """Lista de regímenes fiscales de la sección 2."""
+    regimenes_items = ''.join(map(_LI_FORMAT, map(_escape, regimenes)))
+    return f'<div style="margin-top: 20px;"><strong>Regímenes Fiscales:</strong><ul class="lista">{regimenes_items}</ul></div>'
 
-        # Resumen de riesgos
-        resumen_riesgos = ""
-        if datos.get('riesgos'):
-            riesgos_lista = '<br>'.join([f'• {r}' for r in datos['riesgos']])
-            resumen_riesgos = f'<div style="margin-top: 20px; background: rgba(255,255,255,0.1); padding: 15px; border-radius: 6px;"><strong>⚠ Riesgos:</strong><br>{riesgos_lista}</div>'
-        else:
-            resumen_riesgos = '<div style="margin-top: 20px; background: rgba(255,255,255,0.1); padding: 15px; border-radius: 6px;">✓ Sin riesgos - Seguro para transacciones</div>'
 
-        # Nombre opcional
-        nombre_html = ""
-        if datos.get('nombre'):
-            nombre_html = f'<div class="info-item"><div class="label">Nombre / Razón Social</div><div class="value">{datos["nombre"]}</div></div>'
+def _build_riesgos_html(riesgos: list) -> str:
+    """Lista de riesgos de la sección 3."""
+    riesgos_items = ''.join(map(_LI_FORMAT, map(_escape, riesgos)))
+    return f'<div style="margin-top: 15px;"><strong>Riesgos:</strong><ul class="lista riesgos">{riesgos_items}</ul></div>'
 
-        # Generar HTML completo
-        html = f'''<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Reporte CSF - {datos['rfc']}</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ font-family: 'Segoe UI', sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 20px; color: #333; }}
-        .container {{ max-width: 1200px; margin: 0 auto; background: white; border-radius: 12px; box-shadow: 0 10px 40px rgba(0,0,0,0.2); overflow: hidden; }}
-        .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; }}
-        .header h1 {{ font-size: 2em; margin-bottom: 10px; }}
-        .header .rfc {{ font-size: 1.5em; font-weight: bold; letter-spacing: 2px; margin: 15px 0; }}
-        .header .fecha {{ opacity: 0.9; font-size: 0.9em; }}
-        .content {{ padding: 30px; }}
-        .seccion {{ margin-bottom: 30px; border-left: 4px solid #667eea; padding-left: 20px; }}
-        .seccion h2 {{ color: #667eea; margin-bottom: 15px; font-size: 1.5em; }}
-        .card {{ background: #f8f9fa; border-radius: 8px; padding: 20px; margin-bottom: 15px; }}
-        .status-badge {{ display: inline-block; padding: 8px 16px; border-radius: 20px; font-weight: bold; font-size: 0.9em; margin: 10px 0; }}
-        .badge-success {{ background: #d4edda; color: #155724; }}
-        .badge-warning {{ background: #fff3cd; color: #856404; }}
-        .badge-danger {{ background: #f8d7da; color: #721c24; }}
-        .info-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 15px; margin-top: 15px; }}
-        .info-item {{ background: white; padding: 15px; border-radius: 6px; border-left: 3px solid #667eea; }}
-        .info-item .label {{ font-size: 0.85em; color: #666; margin-bottom: 5px; text-transform: uppercase; font-weight: 600; }}
-        .info-item .value {{ font-size: 1.1em; color: #333; font-weight: 500; }}
-        .lista {{ list-style: none; margin-top: 10px; }}
-        .lista li {{ padding: 8px 0; border-bottom: 1px solid #eee; }}
-        .lista li:before {{ content: "✓ "; color: #28a745; font-weight: bold; margin-right: 8px; }}
-        .lista.riesgos li:before {{ content: "⚠ "; color: #ffc107; }}
-        .lista.errores li:before {{ content: "✗ "; color: #dc3545; }}
-        .resumen {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 25px; border-radius: 8px; margin-top: 30px; }}
-        .resumen h3 {{ margin-bottom: 15px; font-size: 1.3em; }}
-        .resumen-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin-top: 15px; }}
-        .resumen-item {{ background: rgba(255,255,255,0.1); padding: 15px; border-radius: 6px; }}
-        .resumen-item .label {{ font-size: 0.85em; opacity: 0.9; margin-bottom: 5px; }}
-        .resumen-item .value {{ font-size: 1.3em; font-weight: bold; }}
-        .footer {{ text-align: center; padding: 20px; background: #f8f9fa; color: #666; font-size: 0.9em; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>📋 Reporte de Validación CSF</h1>
-            <div class="rfc">{datos['rfc']}</div>
-            <div class="fecha">Generado: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>
-        </div>
-        <div class="content">
-            <div class="seccion">
-                <h2>1. Validación de RFC</h2>
-                <div class="card">
-                    <span class="status-badge {'badge-success' if datos['formato_valido'] else 'badge-danger'}">
-                        {'✓ RFC Válido' if datos['formato_valido'] else '✗ RFC Inválido'}
-                    </span>
-                    <div class="info-grid">
-                        <div class="info-item"><div class="label">RFC</div><div class="value">{datos['rfc']}</div></div>
-                        <div class="info-item"><div class="label">Tipo</div><div class="value">{datos.get('tipo_persona', 'N/A')}</div></div>
-                        <div class="info-item"><div class="label">Longitud</div><div class="value">{datos.get('longitud', 'N/A')} caracteres</div></div>
-                    </div>
-                </div>
-            </div>
-            <div class="seccion">
-                <h2>2. Situación Fiscal</h2>
-                <div class="card">
-                    <span class="status-badge {'badge-success' if datos.get('activo') else 'badge-danger'}">
-                        {datos.get('estado', 'Desconocido')}
-                    </span>
-                    <div class="info-grid">
-                        {nombre_html}
-                        <div class="info-item"><div class="label">Contribuyente</div><div class="value">{'Activo' if datos.get('activo') else 'Inactivo'}</div></div>
-                    </div>
-                    {regimenes_html}
-                </div>
-            </div>
-            <div class="seccion">
-                <h2>3. Validación para Transacciones</h2>
-                <div class="card">
-                    <span class="status-badge {'badge-success' if datos.get('seguro_transaccionar') else 'badge-warning'}">
-                        {'✓ Aprobado' if datos.get('seguro_transaccionar') else '⚠ Con Riesgos'}
-                    </span>
-                    {riesgos_html}
-                </div>
-            </div>
-            {seccion_csf}
-            {seccion_validacion_csf}
-            <div class="resumen">
-                <h3>📊 Resumen Final</h3>
-                <div class="resumen-grid">
-                    <div class="resumen-item"><div class="label">RFC</div><div class="value">{datos['rfc']}</div></div>
-                    <div class="resumen-item"><div class="label">Tipo</div><div class="value">{datos.get('tipo_persona', 'N/A')}</div></div>
-                    <div class="resumen-item"><div class="label">Estado</div><div class="value">{datos.get('estado', 'Desconocido')}</div></div>
-                    <div class="resumen-item"><div class="label">Transacciones</div><div class="value">{'✓ Aprobado' if datos.get('seguro_transaccionar') else '⚠ Riesgos'}</div></div>
-                </div>
-                {resumen_riesgos}
-            </div>
-        </div>
-        <div class="footer">
-            <p>Reporte generado por Sistema de Validación CSF</p>
-            <p>{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        </div>
-    </div>
-</body>
-</html>'''
 
-        # Guardar HTML
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html)
+def _build_resumen_riesgos(riesgos: list) -> str:
+    """Riesgos en el resumen final."""
+    riesgos_lista = '• ' + '<br>• '.join(map(_escape, riesgos))
+    return f'<div style="margin-top: 20px; background: rgba(255,255,255,0.1); padding: 15px; border-radius: 6px;"><strong>⚠ Riesgos:</strong><br>{riesgos_lista}</div>'
+
 
-        file_size = os.path.getsize(output_file)
+def _build_nombre_html(nombre: str) -> str:
+    """Nombre o razón social de la sección 2."""
+    return f'<div class="info-item"><div class="label">Nombre / Razón Social</div><div class="value">{_escape(nombre)}</div></div>'
+
+
+def generate_html_report(
+    validation_data: Dict[str, Any],
+    output_file: str
+) -> Dict[str, Any]:
+    """
+    Genera un reporte HTML profesional a partir de los datos de validación.
+
+    Args:
+        validation_data: Diccionario retornado por validate_csf_from_pdf()
+        output_file: Ruta del archivo HTML de salida
+
+    Returns:
+        Dict con resultado:
+        {
+            'success': bool,
+            'html_file': str,
+            'size_bytes': int
+        }
+
+    Example:
+        >>> data = validate_csf_from_pdf('constancia.pdf')
+        >>> result = generate_html_report(data, 'reporte.html')
+        >>> print(f"Reporte: {result['html_file']}")
+    """
+    try:
+        datos = validation_data
+        fecha_generacion = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        # Construir secciones HTML dinámicas (solo las que tienen datos)
+        seccion_csf = _build_seccion_csf(datos) if datos.get('csf_rfc') else ''
+        seccion_validacion_csf = (
+            _build_seccion_validacion_csf(datos) if datos.get('csf_valida') is not None else ''
+        )
+        regimenes_html = _build_regimenes_html(datos['regimenes']) if datos.get('regimenes') else ''
+        nombre_html = _build_nombre_html(datos['nombre']) if datos.get('nombre') else ''
+
+        if datos.get('riesgos'):
+            riesgos_html = _build_riesgos_html(datos['riesgos'])
+            resumen_riesgos = _build_resumen_riesgos(datos['riesgos'])
+        else:
+            riesgos_html = _SIN_RIESGOS_HTML
+            resumen_riesgos = _SIN_RIESGOS_RESUMEN
+
+        # Escribir el HTML directamente al archivo, sección por sección
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            f.write(_REPORT_HEADER.format(
+                rfc=_escape(datos['rfc']),
+                fecha=fecha_generacion,
+                badge_formato='badge-success' if datos['formato_valido'] else 'badge-danger',
+                texto_formato='✓ RFC Válido' if datos['formato_valido'] else '✗ RFC Inválido',
+                tipo_persona=_escape(datos.get('tipo_persona') or 'N/A'),
+                longitud=_escape(datos.get('longitud') or 'N/A'),
+                badge_activo='badge-success' if datos.get('activo') else 'badge-danger',
+                estado=_escape(datos.get('estado') or 'Desconocido'),
+                nombre_html=nombre_html,
+                contribuyente='Activo' if datos.get('activo') else 'Inactivo',
+                regimenes_html=regimenes_html,
+                badge_transaccion='badge-success' if datos.get('seguro_transaccionar') else 'badge-warning',
+                texto_transaccion='✓ Aprobado' if datos.get('seguro_transaccionar') else '⚠ Con Riesgos',
+                riesgos_html=riesgos_html
+            ))
+            f.write(seccion_csf)
+            f.write('\n            ')
+            f.write(seccion_validacion_csf)
+            f.write(_REPORT_FOOTER.format(
+                rfc=_escape(datos['rfc']),
+                tipo_persona=_escape(datos.get('tipo_persona') or 'N/A'),
+                estado=_escape(datos.get('estado') or 'Desconocido'),
+                resumen_transaccion='✓ Aprobado' if datos.get('seguro_transaccionar') else '⚠ Riesgos',
+                resumen_riesgos=resumen_riesgos,
+                fecha=fecha_generacion
+            ))
+            f.flush()
+            file_size = os.fstat(f.fileno()).st_size
 
         return {
             'success': True,
@@ -424,7 +547,7 @@ def validate_csf_full(
     if not validation_data['success']:
         return {
             'success': False,
-            'error': validation_data.get('error', 'Error desconocido'),
+            'error': validation_data.get('error') or 'Error desconocido',
             'validation_data': validation_data
         }
 
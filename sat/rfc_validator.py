@@ -6,9 +6,71 @@ del SAT (lista negra 69B, contribuyentes no localizados, certificados cancelados
 """
 import os
 import re
+import csv
+import copy
+import time
+import hashlib
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+# Sesión keep-alive compartida con los demás web services del SAT
+from .sat_download import _get_session
+
+
+# Número máximo de RFCs distintos que se mantienen en caché por consulta
+_CACHE_SIZE = 4096
+
+# Segundos que se reutiliza el estado de un RFC consultado al SAT (0 = sin caché).
+# La situación fiscal cambia en días, no en segundos.
+_RFC_STATUS_TTL = int(os.getenv('SAT_RFC_TTL') or 86400)
+
+# Lista 69-B cargada en memoria: RFC -> situación (None si no se ha cargado)
+_BLACKLIST_69B: Optional[Dict[str, Optional[str]]] = None
+
+# Tamaño de bloque para descargas en streaming (64 KiB)
+_DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+# Persona Física: 13 caracteres (4 letras + 6 dígitos + 3 homoclave)
+_PATTERN_PF = re.compile(r'^[A-ZÑ&]{4}\d{6}[A-Z0-9]{3}$')
+
+# Persona Moral: 12 caracteres (3 letras + 6 dígitos + 3 homoclave)
+_PATTERN_PM = re.compile(r'^[A-ZÑ&]{3}\d{6}[A-Z0-9]{3}$')
+
+# RFC genéricos (público en general y extranjeros)
+_RFC_GENERICOS = frozenset(('XAXX010101000', 'XEXX010101000'))
+
+# Resultados base de validate_rfc_format (se copian y se completa 'rfc')
+_RESULTADO_GENERICO = {
+    'valid': True,
+    'tipo': 'RFC Genérico',
+    'longitud': 13,
+    'rfc': None,
+    'es_generico': True
+}
+_RESULTADO_PF = {
+    'valid': True,
+    'tipo': 'Persona Física',
+    'longitud': 13,
+    'rfc': None,
+    'es_generico': False
+}
+_RESULTADO_PM = {
+    'valid': True,
+    'tipo': 'Persona Moral',
+    'longitud': 12,
+    'rfc': None,
+    'es_generico': False
+}
+
+
+def _normalize_rfc(rfc: Optional[str]) -> str:
+    """Normaliza un RFC (mayúsculas, sin espacios) una sola vez en la entrada de la API."""
+    return rfc.upper().strip() if rfc else ''
+
 
 def validate_rfc_format(rfc: str) -> Dict[str, Any]:
     """
@@ -25,51 +87,32 @@ def validate_rfc_format(rfc: str) -> Dict[str, Any]:
         >>> if result['valid']:
         ...     print(f"RFC válido: {result['tipo']}")
     """
-    if not rfc:
-        return {'valid': False, 'error': 'RFC vacío'}
-
-    rfc = rfc.upper().strip()
+    return _validate_rfc_format(_normalize_rfc(rfc))
 
-    # Persona Física: 13 caracteres (4 letras + 6 dígitos + 3 homoclave)
-    pattern_pf = r'^[A-ZÑ&]{4}\d{6}[A-Z0-9]{3}$'
 
-    # Persona Moral: 12 caracteres (3 letras + 6 dígitos + 3 homoclave)
-    pattern_pm = r'^[A-ZÑ&]{3}\d{6}[A-Z0-9]{3}$'
+def _validate_rfc_format(rfc: str) -> Dict[str, Any]:
+    """Valida el formato de un RFC ya normalizado con _normalize_rfc()."""
+    if not rfc:
+        return {'valid': False, 'error': 'RFC vacío'}
 
-    # RFC genérico
-    rfc_genericos = ['XAXX010101000', 'XEXX010101000']
+    longitud = len(rfc)
 
-    if rfc in rfc_genericos:
-        return {
-            'valid': True,
-            'tipo': 'RFC Genérico',
-            'longitud': len(rfc),
-            'rfc': rfc,
-            'es_generico': True
-        }
-    elif re.match(pattern_pf, rfc):
-        return {
-            'valid': True,
-            'tipo': 'Persona Física',
-            'longitud': 13,
-            'rfc': rfc,
-            'es_generico': False
-        }
-    elif re.match(pattern_pm, rfc):
-        return {
-            'valid': True,
-            'tipo': 'Persona Moral',
-            'longitud': 12,
-            'rfc': rfc,
-            'es_generico': False
-        }
+    if rfc in _RFC_GENERICOS:
+        resultado = _RESULTADO_GENERICO.copy()
+    elif longitud == 13 and _PATTERN_PF.match(rfc):
+        resultado = _RESULTADO_PF.copy()
+    elif longitud == 12 and _PATTERN_PM.match(rfc):
+        resultado = _RESULTADO_PM.copy()
     else:
         return {
             'valid': False,
-            'error': f'Formato de RFC inválido. Longitud: {len(rfc)}',
+            'error': f'Formato de RFC inválido. Longitud: {longitud}',
             'rfc': rfc
         }
 
+    resultado['rfc'] = rfc
+    return resultado
+
 
 def check_rfc_in_blacklist_69b(rfc: str) -> Dict[str, Any]:
     """
@@ -80,6 +123,9 @@ def check_rfc_in_blacklist_69b(rfc: str) -> Dict[str, Any]:
     - Realizan operaciones simuladas (EDO = Operaciones Simuladas)
     - Transmiten indebidamente pérdidas fiscales
 
+    El resultado se cachea por RFC; usar clear_rfc_cache() para forzar
+    una nueva consulta.
+
     Args:
         rfc: RFC a verificar
 
@@ -92,34 +138,116 @@ def check_rfc_in_blacklist_69b(rfc: str) -> Dict[str, Any]:
         ...     print(f"Alerta: RFC en lista 69-B")
         ...     print(f"Situación: {result['situacion']}")
     """
+    return _check_blacklist_69b(_normalize_rfc(rfc))
+
+
+def _check_blacklist_69b(rfc: str) -> Dict[str, Any]:
+    """Consulta la lista 69-B para un RFC ya normalizado con _normalize_rfc()."""
     try:
-        import requests
-        from xml.etree import ElementTree as ET
+        return copy.deepcopy(_query_blacklist_69b(rfc))
 
-        # El SAT publica las listas en su portal
-        # URL del servicio (puede variar)
-        url = "https://omawww.sat.gob.mx/cifras_sat/Paginas/datos/vinculo.html?page=ListCompleta69B.html"
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'rfc': rfc
+        }
 
-        # En producción, se debe descargar y cachear el archivo
-        # Por ahora retornamos estructura de ejemplo
 
-        # Nota: El SAT publica archivos .zip con las listas actualizadas
-        # Se debe descargar, descomprimir y buscar en el archivo
+@lru_cache(maxsize=_CACHE_SIZE)
+def _query_blacklist_69b(rfc: str) -> Dict[str, Any]:
+    """
+    Consulta la lista 69-B para un RFC normalizado (resultado cacheado).
+
+    Las excepciones no se cachean, por lo que un error se reintenta
+    en la siguiente consulta.
+    """
+    # Nota: El SAT publica archivos .zip con las listas actualizadas.
+    # Se descargan con download_blacklist_69b() y se cargan en memoria con
+    # load_blacklist_69b(); la búsqueda es entonces O(1) por RFC.
+    situacion = _BLACKLIST_69B.get(rfc) if _BLACKLIST_69B is not None else None
+
+    return {
+        'success': True,
+        'en_lista': _BLACKLIST_69B is not None and rfc in _BLACKLIST_69B,
+        'rfc': rfc,
+        'situacion': situacion,  # 'Presunto', 'Desvirtuado', 'Definitivo'
+        'fecha_publicacion': None,
+        'supuesto': None  # EDO, Presunción 69-B
+    }
+
+
+def load_blacklist_69b(csv_file: str = './lista_69b.csv') -> Dict[str, Any]:
+    """
+    Carga en memoria la lista 69-B descargada con download_blacklist_69b().
+
+    Una vez cargada, check_rfc_in_blacklist_69b() busca en un diccionario
+    en memoria en lugar de recorrer el archivo en cada consulta.
+
+    Args:
+        csv_file: Archivo CSV de la lista 69-B
+
+    Returns:
+        Dict con resultado de la carga
+
+    Example:
+        >>> download_blacklist_69b('./listas_sat/69b.csv')
+        >>> result = load_blacklist_69b('./listas_sat/69b.csv')
+        >>> if result['success']:
+        ...     print(f"Cargados {result['total_registros']} registros")
+    """
+    global _BLACKLIST_69B
+
+    try:
+        indice = {}
+
+        # El SAT publica el CSV en Latin-1 con algunas líneas de encabezado
+        with open(csv_file, 'r', encoding='latin-1', newline='') as f:
+            col_rfc = None
+            col_situacion = None
+
+            for fila in csv.reader(f):
+                if col_rfc is None:
+                    columnas = [c.strip().upper() for c in fila]
+                    if 'RFC' in columnas:
+                        col_rfc = columnas.index('RFC')
+                        col_situacion = next(
+                            (i for i, c in enumerate(columnas) if c.startswith('SITUACI')),
+                            None
+                        )
+                    continue
+
+                if len(fila) <= col_rfc:
+                    continue
+
+                rfc = _normalize_rfc(fila[col_rfc])
+                if not rfc:
+                    continue
+
+                situacion = None
+                if col_situacion is not None and len(fila) > col_situacion:
+                    situacion = fila[col_situacion].strip() or None
+                indice[rfc] = situacion
+
+        if col_rfc is None:
+            return {
+                'success': False,
+                'error': f'No se encontró la columna RFC en {csv_file}'
+            }
+
+        _BLACKLIST_69B = indice
+        _query_blacklist_69b.cache_clear()
 
         return {
             'success': True,
-            'en_lista': False,  # Se determina tras buscar en el archivo
-            'rfc': rfc,
-            'situacion': None,  # 'Presunto', 'Desvirtuado', 'Definitivo'
-            'fecha_publicacion': None,
-            'supuesto': None  # EDO, Presunción 69-B
+            'archivo': csv_file,
+            'total_registros': len(indice)
         }
 
     except Exception as e:
         return {
             'success': False,
-            'error': str(e),
-            'rfc': rfc
+            'error': str(e)
         }
 
 
@@ -133,6 +261,9 @@ def check_rfc_status_in_sat(rfc: str) -> Dict[str, Any]:
     - Si tiene certificados vigentes
     - Si está en lista de no localizados
 
+    El resultado se cachea por RFC hasta SAT_RFC_TTL segundos (default: 1 día);
+    usar clear_rfc_cache() para forzar una nueva consulta.
+
     Args:
         rfc: RFC a consultar
 
@@ -146,24 +277,19 @@ def check_rfc_status_in_sat(rfc: str) -> Dict[str, Any]:
         >>> if result['no_localizado']:
         ...     print("Alerta: Contribuyente no localizado")
     """
-    try:
-        # Consultar servicio del SAT
-        # El SAT tiene diferentes servicios para validar RFCs
+    return _check_rfc_status(_normalize_rfc(rfc))
 
-        return {
-            'success': True,
-            'rfc': rfc,
-            'existe': True,
-            'activo': True,
-            'nombre': 'CONTRIBUYENTE GENERICO',
-            'tipo_persona': 'Física',
-            'situacion_fiscal': 'Activo',
-            'fecha_alta': '2001-01-01',
-            'regimen_fiscal': ['612 - Personas Físicas con Actividades Empresariales'],
-            'no_localizado': False,
-            'certificados_vigentes': True,
-            'en_lista_69b': False
-        }
+
+def _check_rfc_status(rfc: str) -> Dict[str, Any]:
+    """Consulta el estado en el SAT para un RFC ya normalizado con _normalize_rfc()."""
+    try:
+        if _RFC_STATUS_TTL > 0:
+            # La ventana forma parte de la llave: al cambiar, la entrada anterior
+            # deja de usarse y el LRU la descarta
+            status = _query_rfc_status(rfc, int(time.monotonic() // _RFC_STATUS_TTL))
+        else:
+            status = _query_rfc_status.__wrapped__(rfc, 0)
+        return copy.deepcopy(status)
 
     except Exception as e:
         return {
@@ -173,12 +299,101 @@ def check_rfc_status_in_sat(rfc: str) -> Dict[str, Any]:
         }
 
 
-def check_multiple_rfcs(rfcs: List[str]) -> Dict[str, Any]:
+@lru_cache(maxsize=_CACHE_SIZE)
+def _query_rfc_status(rfc: str, ventana: int) -> Dict[str, Any]:
+    """
+    Consulta el estado de un RFC normalizado en el SAT (resultado cacheado).
+
+    ventana solo distingue periodos de SAT_RFC_TTL segundos en la llave del
+    caché; no se usa en la consulta.
+
+    Las excepciones no se cachean, por lo que un error se reintenta
+    en la siguiente consulta.
+    """
+    # Consultar servicio del SAT
+    # El SAT tiene diferentes servicios para validar RFCs
+
+    return {
+        'success': True,
+        'rfc': rfc,
+        'existe': True,
+        'activo': True,
+        'nombre': 'CONTRIBUYENTE GENERICO',
+        'tipo_persona': 'Física',
+        'situacion_fiscal': 'Activo',
+        'fecha_alta': '2001-01-01',
+        'regimen_fiscal': ['612 - Personas Físicas con Actividades Empresariales'],
+        'no_localizado': False,
+        'certificados_vigentes': True,
+        'en_lista_69b': False
+    }
+
+
+def clear_rfc_cache() -> None:
+    """
+    Limpia el caché de consultas al SAT (lista 69-B y estado de RFC).
+
+    Example:
+        >>> clear_rfc_cache()  # Forzar nuevas consultas al SAT
+    """
+    _query_blacklist_69b.cache_clear()
+    _query_rfc_status.cache_clear()
+
+
+def _check_single_rfc(rfc: str) -> Dict[str, Any]:
+    """
+    Verifica un RFC en las listas del SAT (usado por check_multiple_rfcs).
+
+    Args:
+        rfc: RFC a verificar
+
+    Returns:
+        Dict con el resultado de la verificación del RFC
+    """
+    rfc = _normalize_rfc(rfc)
+
+    # Validar formato
+    formato = _validate_rfc_format(rfc)
+
+    if not formato['valid']:
+        return {
+            'valido': False,
+            'error': formato['error']
+        }
+
+    # Verificar en listas
+    lista_69b = _check_blacklist_69b(rfc)
+    status = _check_rfc_status(rfc)
+
+    # Detectar alertas
+    alertas = []
+    if lista_69b.get('en_lista'):
+        alertas.append('RFC en lista 69-B')
+    if status.get('no_localizado'):
+        alertas.append('Contribuyente no localizado')
+    if not status.get('certificados_vigentes'):
+        alertas.append('Sin certificados vigentes')
+
+    return {
+        'valido': True,
+        'tipo': formato['tipo'],
+        'activo': status.get('activo'),
+        'en_lista_69b': lista_69b.get('en_lista'),
+        'no_localizado': status.get('no_localizado'),
+        'alertas': alertas
+    }
+
+
+def check_multiple_rfcs(rfcs: List[str], max_workers: int = 16) -> Dict[str, Any]:
     """
     Verifica múltiples RFCs en las listas del SAT.
 
+    Las consultas se realizan en paralelo con un pool de hilos, ya que el
+    tiempo se va en esperar las respuestas del SAT.
+
     Args:
         rfcs: Lista de RFCs a verificar
+        max_workers: Número máximo de consultas simultáneas (default: 16)
 
     Returns:
         Dict con resultados de cada RFC
@@ -191,44 +406,20 @@ def check_multiple_rfcs(rfcs: List[str]) -> Dict[str, Any]:
         ...         print(f"{rfc}: {data['alertas']}")
     """
     resultados = {}
+    con_alertas = 0
 
-    for rfc in rfcs:
-        # Validar formato
-        formato = validate_rfc_format(rfc)
-
-        if not formato['valid']:
-            resultados[rfc] = {
-                'valido': False,
-                'error': formato['error']
-            }
-            continue
-
-        # Verificar en listas
-        lista_69b = check_rfc_in_blacklist_69b(rfc)
-        status = check_rfc_status_in_sat(rfc)
-
-        # Detectar alertas
-        alertas = []
-        if lista_69b.get('en_lista'):
-            alertas.append('RFC en lista 69-B')
-        if status.get('no_localizado'):
-            alertas.append('Contribuyente no localizado')
-        if not status.get('certificados_vigentes'):
-            alertas.append('Sin certificados vigentes')
-
-        resultados[rfc] = {
-            'valido': True,
-            'tipo': formato['tipo'],
-            'activo': status.get('activo'),
-            'en_lista_69b': lista_69b.get('en_lista'),
-            'no_localizado': status.get('no_localizado'),
-            'alertas': alertas
-        }
+    if rfcs:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map conserva el orden de entrada de los RFCs
+            for rfc, resultado in zip(rfcs, executor.map(_check_single_rfc, rfcs)):
+                resultados[rfc] = resultado
+                if resultado.get('alertas'):
+                    con_alertas += 1
 
     return {
         'success': True,
         'total': len(rfcs),
-        'con_alertas': sum(1 for r in resultados.values() if r.get('alertas')),
+        'con_alertas': con_alertas,
         'resultados': resultados
     }
 
@@ -238,46 +429,56 @@ def download_blacklist_69b(output_file: str = './lista_69b.csv') -> Dict[str, An
     Descarga la lista actualizada del artículo 69-B del SAT.
 
     Args:
-        output_file: Archivo donde guardar la lista
+        output_file: Archivo CSV donde guardar la lista (el ZIP descargado
+            se conserva junto a él, con extensión .zip añadida)
 
     Returns:
-        Dict con resultado de la descarga
+        Dict con resultado de la descarga (incluye el SHA-256 del ZIP descargado)
 
     Example:
         >>> result = download_blacklist_69b('./listas_sat/69b.csv')
         >>> if result['success']:
         ...     print(f"Descargados {result['total_registros']} registros")
+        ...     print(f"SHA-256: {result['sha256']}")
     """
     try:
-        import requests
-
         # URL oficial del SAT (actualizar según disponibilidad)
         url = "https://omawww.sat.gob.mx/cifras_sat/Documents/Listado_Completo_69-B.zip"
 
-        # Descargar archivo
-        response = requests.get(url, timeout=60)
+        # Descargar archivo en bloques, calculando el SHA-256 al vuelo
+        zip_file = output_file + '.zip'
+        sha256 = hashlib.sha256()
+
+        with _get_session().get(url, timeout=60, stream=True) as response:
+            if response.status_code != 200:
+                return {
+                    'success': False,
+                    'error': f'Error HTTP {response.status_code}'
+                }
+
+            with open(zip_file, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    sha256.update(chunk)
+
+        # Copiar el CSV del ZIP a output_file, para cargarlo con load_blacklist_69b()
+        with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+            miembro = next((n for n in zip_ref.namelist() if n.lower().endswith('.csv')), None)
+            if miembro is None:
+                return {
+                    'success': False,
+                    'error': f'El ZIP descargado no contiene un archivo CSV: {zip_file}'
+                }
+            with zip_ref.open(miembro) as origen, open(output_file, 'wb') as destino:
+                shutil.copyfileobj(origen, destino, _DOWNLOAD_CHUNK_SIZE)
 
-        if response.status_code == 200:
-            # Guardar y extraer
-            with open(output_file + '.zip', 'wb') as f:
-                f.write(response.content)
-
-            # Extraer ZIP
-            import zipfile
-            with zipfile.ZipFile(output_file + '.zip', 'r') as zip_ref:
-                zip_ref.extractall(os.path.dirname(output_file) or '.')
-
-            return {
-                'success': True,
-                'archivo': output_file,
-                'fecha_descarga': datetime.now().isoformat(),
-                'total_registros': 0  # Se contaría tras procesar
-            }
-        else:
-            return {
-                'success': False,
-                'error': f'Error HTTP {response.status_code}'
-            }
+        return {
+            'success': True,
+            'archivo': output_file,
+            'fecha_descarga': datetime.now().isoformat(),
+            'sha256': sha256.hexdigest(),
+            'total_registros': 0  # Se contaría tras procesar
+        }
 
     except Exception as e:
         return {
@@ -310,8 +511,10 @@ def is_rfc_safe_to_transact(rfc: str) -> Dict[str, Any]:
         >>> else:
         ...     print(f"Riesgos: {result['riesgos']}")
     """
+    rfc = _normalize_rfc(rfc)
+
     # Validar formato
-    formato = validate_rfc_format(rfc)
+    formato = _validate_rfc_format(rfc)
     if not formato['valid']:
         return {
             'seguro': False,
@@ -321,8 +524,8 @@ def is_rfc_safe_to_transact(rfc: str) -> Dict[str, Any]:
         }
 
     # Verificar en listas
-    lista_69b = check_rfc_in_blacklist_69b(rfc)
-    status = check_rfc_status_in_sat(rfc)
+    lista_69b = _check_blacklist_69b(rfc)
+    status = _check_rfc_status(rfc)
 
     # Detectar riesgos
     riesgos = []
@@ -9,10 +9,168 @@ Variables de entorno opcionales:
     SAT_FIEL_CER: Ruta al certificado de la FIEL (.cer)
     SAT_FIEL_KEY: Ruta a la llave privada de la FIEL (.key)
     SAT_FIEL_PASSWORD: Contraseña de la llave privada
+
+Las variables de la FIEL se leen una sola vez (get_sat_config); si cambian
+durante la ejecución, llamar get_sat_config.cache_clear().
 """
 import os
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+import ssl
+import time
+import shutil
+import asyncio
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+from datetime import date, datetime, timedelta
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:
+    requests = None
+
+
+# Rango máximo en días que el SAT permite por solicitud
+_MAX_RANGE_DAYS = 31
+
+# Descargas simultáneas de paquetes (el SAT limita las conexiones concurrentes)
+_MAX_CONCURRENT_DOWNLOADS = 5
+
+# Conexiones reutilizables hacia los web services de descarga masiva
+_POOL_SIZE = 10
+
+# Paquetes descargados en espera de extracción en el proceso completo
+_PIPELINE_QUEUE_SIZE = 4
+
+# Tamaño del búfer al copiar archivos extraídos de los paquetes
+_EXTRACT_CHUNK_SIZE = 1 << 16
+
+
+@dataclass(frozen=True)
+class SatConfig:
+    """
+    Credenciales de la FIEL usadas por los web services de descarga masiva.
+    """
+    certificado: Optional[str] = None
+    key_file: Optional[str] = None
+    key_password: Optional[str] = field(default=None, repr=False)
+
+    def override(
+        self,
+        certificado: Optional[str] = None,
+        key_file: Optional[str] = None,
+        key_password: Optional[str] = None
+    ) -> 'SatConfig':
+        """
+        Regresa la configuración con los valores explícitos que se indiquen.
+        """
+        if not (certificado or key_file or key_password):
+            return self
+        return SatConfig(
+            certificado or self.certificado,
+            key_file or self.key_file,
+            key_password or self.key_password
+        )
+
+    def validate(self) -> Optional[Dict[str, Any]]:
+        """
+        Regresa el dict de error si faltan credenciales, None si están completas.
+        """
+        if not all([self.certificado, self.key_file, self.key_password]):
+            return {
+                'success': False,
+                'error': 'Faltan credenciales de FIEL'
+            }
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_sat_config() -> SatConfig:
+    """
+    Configuración de la FIEL tomada de las variables de entorno.
+
+    Returns:
+        SatConfig con SAT_FIEL_CER, SAT_FIEL_KEY y SAT_FIEL_PASSWORD
+
+    Example:
+        >>> cfg = get_sat_config().override(certificado='otra_fiel.cer')
+    """
+    return SatConfig(
+        os.getenv('SAT_FIEL_CER'),
+        os.getenv('SAT_FIEL_KEY'),
+        os.getenv('SAT_FIEL_PASSWORD')
+    )
+
+
+@lru_cache(maxsize=1)
+def _ssl_context() -> ssl.SSLContext:
+    """
+    Contexto TLS compartido: los certificados raíz se cargan una sola vez.
+    """
+    return ssl.create_default_context()
+
+
+if requests is not None:
+    class _SATAdapter(HTTPAdapter):
+        """
+        HTTPAdapter que usa el contexto TLS compartido en todas sus conexiones.
+        """
+
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs['ssl_context'] = _ssl_context()
+            return super().init_poolmanager(*args, **kwargs)
+
+        def proxy_manager_for(self, *args, **kwargs):
+            kwargs['ssl_context'] = _ssl_context()
+            return super().proxy_manager_for(*args, **kwargs)
+
+
+@lru_cache(maxsize=1)
+def _get_session() -> 'requests.Session':
+    """
+    Sesión HTTP compartida por las llamadas a los web services del SAT.
+
+    Mantiene las conexiones abiertas (keep-alive) para que solicitud,
+    verificación, descarga y consulta de estado de CFDI no repitan el
+    handshake TLS en cada llamada, y todas usan el mismo contexto TLS. La
+    FIEL no se usa en TLS: firma los mensajes SOAP. Los GET se reintentan
+    hasta 3 veces ante 502/503/504; los POST (SOAP) no se reintentan.
+    """
+    if requests is None:
+        raise ImportError("La librería requests no está instalada")
+
+    session = requests.Session()
+    adapter = _SATAdapter(
+        pool_connections=_POOL_SIZE,
+        pool_maxsize=_POOL_SIZE,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False
+        )
+    )
+    session.mount('https://', adapter)
+    return session
+
+
+def close_sat_session() -> None:
+    """
+    Cierra la sesión HTTP compartida con el SAT y libera sus conexiones.
+
+    La siguiente llamada a un web service abre una sesión nueva.
+
+    Example:
+        >>> result = download_cfdi_full_process('XAXX010101000', '2026-01-01', '2026-01-31')
+        >>> close_sat_session()
+    """
+    if _get_session.cache_info().currsize:
+        _get_session().close()
+    _get_session.cache_clear()
 
 
 def request_download(
@@ -54,30 +212,27 @@ def request_download(
         >>> solicitud_id = result['solicitud_id']
     """
     # Usar variables de entorno como fallback
-    certificado = certificado or os.getenv('SAT_FIEL_CER')
-    key_file = key_file or os.getenv('SAT_FIEL_KEY')
-    key_password = key_password or os.getenv('SAT_FIEL_PASSWORD')
+    cfg = get_sat_config().override(certificado, key_file, key_password)
 
-    if not all([certificado, key_file, key_password]):
-        return {
-            'success': False,
-            'error': 'Faltan credenciales de FIEL'
-        }
+    error = cfg.validate()
+    if error:
+        return error
 
     try:
         # Validar fechas
-        fecha_i = datetime.strptime(fecha_inicio, '%Y-%m-%d')
-        fecha_f = datetime.strptime(fecha_fin, '%Y-%m-%d')
+        fecha_i = date.fromisoformat(fecha_inicio)
+        fecha_f = date.fromisoformat(fecha_fin)
 
         if fecha_f < fecha_i:
             return {'success': False, 'error': 'Fecha fin anterior a fecha inicio'}
 
         # El SAT permite máximo 1 mes por solicitud
-        if (fecha_f - fecha_i).days > 31:
-            return {'success': False, 'error': 'El rango máximo es de 31 días'}
+        if (fecha_f - fecha_i).days > _MAX_RANGE_DAYS:
+            return {'success': False, 'error': f'El rango máximo es de {_MAX_RANGE_DAYS} días'}
 
-        # Aquí se haría la llamada al web service del SAT
-        # Usando librería como sat-ws o sat-descarga-masiva-python
+        # Aquí se haría la llamada al web service del SAT con la sesión
+        # compartida de _get_session(), usando librería como sat-ws
+        # o sat-descarga-masiva-python
 
         return {
             'success': True,
@@ -96,6 +251,101 @@ def request_download(
         return {'success': False, 'error': str(e)}
 
 
+def _split_date_range(fecha_i: date, fecha_f: date) -> Iterator[Tuple[str, str]]:
+    """
+    Divide un rango de fechas en tramos aceptados por el SAT (YYYY-MM-DD).
+    """
+    paso = timedelta(days=_MAX_RANGE_DAYS - 1)
+    inicio = fecha_i
+    while inicio <= fecha_f:
+        fin = min(inicio + paso, fecha_f)
+        yield inicio.isoformat(), fin.isoformat()
+        inicio = fin + timedelta(days=1)
+
+
+def request_download_range(
+    rfc: str,
+    fecha_inicio: str,
+    fecha_fin: str,
+    tipo: str = 'emitidos',
+    certificado: Optional[str] = None,
+    key_file: Optional[str] = None,
+    key_password: Optional[str] = None,
+    max_concurrent: int = _MAX_CONCURRENT_DOWNLOADS,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Solicita la descarga de un rango de fechas de cualquier tamaño.
+
+    El rango se divide en tramos de hasta 31 días y las solicitudes se envían
+    en paralelo (máximo max_concurrent a la vez).
+
+    Args:
+        rfc: RFC del contribuyente
+        fecha_inicio: Fecha inicio (YYYY-MM-DD)
+        fecha_fin: Fecha fin (YYYY-MM-DD)
+        tipo: 'emitidos' o 'recibidos'
+        certificado: Ruta al .cer de la FIEL
+        key_file: Ruta al .key de la FIEL
+        key_password: Contraseña de la llave
+        max_concurrent: Solicitudes simultáneas (default: 5)
+        **kwargs: Parámetros adicionales para request_download
+
+    Returns:
+        Dict con la lista de solicitudes (una por tramo, en orden cronológico)
+
+    Example:
+        >>> result = request_download_range(
+        ...     rfc='XAXX010101000',
+        ...     fecha_inicio='2026-01-01',
+        ...     fecha_fin='2026-12-31',
+        ...     certificado='fiel.cer',
+        ...     key_file='fiel.key',
+        ...     key_password='password'
+        ... )
+        >>> for solicitud in result['solicitudes']:
+        ...     print(solicitud['fecha_inicio'], solicitud['solicitud_id'])
+    """
+    cfg = get_sat_config().override(certificado, key_file, key_password)
+
+    error = cfg.validate()
+    if error:
+        return error
+
+    try:
+        fecha_i = date.fromisoformat(fecha_inicio)
+        fecha_f = date.fromisoformat(fecha_fin)
+
+        if fecha_f < fecha_i:
+            return {'success': False, 'error': 'Fecha fin anterior a fecha inicio'}
+
+        tramos = list(_split_date_range(fecha_i, fecha_f))
+
+        with ThreadPoolExecutor(max_workers=min(max_concurrent, len(tramos))) as executor:
+            solicitudes = list(executor.map(
+                lambda tramo: request_download(
+                    rfc, tramo[0], tramo[1], tipo,
+                    cfg.certificado, cfg.key_file, cfg.key_password, **kwargs
+                ),
+                tramos
+            ))
+
+        errores = [s for s in solicitudes if not s['success']]
+
+        return {
+            'success': not errores,
+            'solicitudes': solicitudes,
+            'solicitud_ids': [s['solicitud_id'] for s in solicitudes if s['success']],
+            'total_solicitudes': len(solicitudes),
+            'errores': len(errores)
+        }
+
+    except ValueError as e:
+        return {'success': False, 'error': f'Formato de fecha inválido: {str(e)}'}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+
 def check_download_status(
     solicitud_id: str,
     rfc: str,
@@ -127,12 +377,10 @@ def check_download_status(
         >>> if status['estado'] == 'Terminada':
         ...     paquetes = status['paquetes']
     """
-    certificado = certificado or os.getenv('SAT_FIEL_CER')
-    key_file = key_file or os.getenv('SAT_FIEL_KEY')
-    key_password = key_password or os.getenv('SAT_FIEL_PASSWORD')
+    cfg = get_sat_config().override(certificado, key_file, key_password)
 
     try:
-        # Consultar estado en el web service del SAT
+        # Consultar estado en el web service del SAT (sesión de _get_session())
 
         return {
             'success': True,
@@ -148,17 +396,38 @@ def check_download_status(
         return {'success': False, 'error': str(e)}
 
 
+def _download_package(
+    paquete_id: str,
+    output_dir: str,
+    cfg: SatConfig
+) -> str:
+    """
+    Descarga un paquete individual y regresa la ruta del ZIP guardado.
+    """
+    nombre = paquete_id if paquete_id.endswith('.zip') else f'{paquete_id}.zip'
+
+    # Descargar paquete desde el SAT (DescargarMasivoTerceros) con la
+    # sesión compartida de _get_session()
+
+    return f'{output_dir}/{nombre}'
+
+
 def download_packages(
     solicitud_id: str,
     rfc: str,
     output_dir: str = '.',
     certificado: Optional[str] = None,
     key_file: Optional[str] = None,
-    key_password: Optional[str] = None
+    key_password: Optional[str] = None,
+    paquetes: Optional[List[str]] = None,
+    max_concurrent: int = _MAX_CONCURRENT_DOWNLOADS
 ) -> Dict[str, Any]:
     """
     Descarga los paquetes de CFDIs de una solicitud terminada.
 
+    Los paquetes se descargan en paralelo, con un máximo de max_concurrent
+    descargas simultáneas. El orden de 'archivos' corresponde al de los paquetes.
+
     Args:
         solicitud_id: ID de la solicitud
         rfc: RFC del contribuyente
@@ -166,6 +435,8 @@ def download_packages(
         certificado: Ruta al .cer de la FIEL
         key_file: Ruta al .key de la FIEL
         key_password: Contraseña de la llave
+        paquetes: IDs de los paquetes (default: se consultan con check_download_status)
+        max_concurrent: Descargas simultáneas (default: 5)
 
     Returns:
         Dict con lista de archivos descargados
@@ -182,42 +453,90 @@ def download_packages(
         >>> for archivo in result['archivos']:
         ...     print(f"Descargado: {archivo}")
     """
-    certificado = certificado or os.getenv('SAT_FIEL_CER')
-    key_file = key_file or os.getenv('SAT_FIEL_KEY')
-    key_password = key_password or os.getenv('SAT_FIEL_PASSWORD')
+    cfg = get_sat_config().override(certificado, key_file, key_password)
 
     try:
+        if paquetes is None:
+            status = check_download_status(
+                solicitud_id, rfc, cfg.certificado, cfg.key_file, cfg.key_password
+            )
+            if not status['success']:
+                return status
+            paquetes = status['paquetes']
+
         # Crear directorio si no existe
         os.makedirs(output_dir, exist_ok=True)
 
-        # Descargar paquetes desde el SAT
+        archivos = []
+        if paquetes:
+            workers = min(max_concurrent, len(paquetes))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                archivos = list(executor.map(
+                    lambda paquete_id: _download_package(paquete_id, output_dir, cfg),
+                    paquetes
+                ))
 
         return {
             'success': True,
             'solicitud_id': solicitud_id,
-            'archivos': [
-                f'{output_dir}/paquete_1.zip',
-                f'{output_dir}/paquete_2.zip'
-            ],
-            'total_descargado': 2
+            'archivos': archivos,
+            'total_descargado': len(archivos)
         }
 
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
 
+def _extract_one(
+    zip_file: str,
+    output_dir: str,
+    password: Optional[str] = None
+) -> List[str]:
+    """
+    Extrae un paquete ZIP y regresa los nombres de sus entradas.
+    """
+    extracted_files = []
+    destino_base = os.path.realpath(output_dir)
+
+    with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+        if password:
+            zip_ref.setpassword(password.encode())
+
+        # Copiar cada entrada por bloques en lugar de extractall
+        for info in zip_ref.infolist():
+            destino = os.path.realpath(os.path.join(destino_base, info.filename))
+            if os.path.commonpath([destino_base, destino]) != destino_base:
+                raise ValueError(f'Ruta inválida en {zip_file}: {info.filename}')
+
+            if info.is_dir():
+                os.makedirs(destino, exist_ok=True)
+            else:
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                with zip_ref.open(info) as src, open(destino, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, _EXTRACT_CHUNK_SIZE)
+
+            extracted_files.append(info.filename)
+
+    return extracted_files
+
+
 def extract_packages(
     zip_files: List[str],
     output_dir: str = '.',
-    password: Optional[str] = None
+    password: Optional[str] = None,
+    max_workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Extrae los CFDIs de los paquetes ZIP descargados.
 
+    Cada paquete se extrae en un hilo distinto (zlib libera el GIL al
+    descomprimir). La lista de archivos conserva el orden de zip_files.
+
     Args:
         zip_files: Lista de archivos ZIP a extraer
         output_dir: Directorio donde extraer
         password: Contraseña si los ZIP están protegidos
+        max_workers: Paquetes extraídos en paralelo (default: núcleos de CPU)
 
     Returns:
         Dict con lista de archivos extraídos
@@ -230,17 +549,16 @@ def extract_packages(
         >>> print(f"Extraídos {result['total_cfdis']} CFDIs")
     """
     try:
-        import zipfile
-
         extracted_files = []
 
-        for zip_file in zip_files:
-            with zipfile.ZipFile(zip_file, 'r') as zip_ref:
-                if password:
-                    zip_ref.setpassword(password.encode())
-
-                zip_ref.extractall(output_dir)
-                extracted_files.extend(zip_ref.namelist())
+        if zip_files:
+            workers = min(max_workers or os.cpu_count() or 1, len(zip_files))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                resultados = executor.map(
+                    _extract_one, zip_files, repeat(output_dir), repeat(password)
+                )
+                for nombres in resultados:
+                    extracted_files.extend(nombres)
 
         return {
             'success': True,
@@ -253,65 +571,121 @@ def extract_packages(
         return {'success': False, 'error': str(e)}
 
 
-def download_cfdi_full_process(
+async def _download_and_extract(
+    solicitud_id: str,
+    rfc: str,
+    paquetes: List[str],
+    output_dir: str,
+    **kwargs
+) -> List[str]:
+    """
+    Descarga y extrae los paquetes como un pipeline productor/consumidor.
+
+    Cada paquete se extrae en cuanto termina su descarga, mientras los demás
+    siguen descargándose. La cola acotada limita los ZIP pendientes en disco.
+    Regresa los archivos extraídos en el orden de paquetes.
+    """
+    cola: asyncio.Queue = asyncio.Queue(maxsize=_PIPELINE_QUEUE_SIZE)
+    semaforo = asyncio.Semaphore(_MAX_CONCURRENT_DOWNLOADS)
+    extraidos: List[List[str]] = [[] for _ in paquetes]
+
+    async def descargar(indice: int, paquete_id: str) -> None:
+        async with semaforo:
+            resultado = await asyncio.to_thread(
+                download_packages, solicitud_id, rfc, output_dir,
+                paquetes=[paquete_id], **kwargs
+            )
+        if not resultado['success']:
+            raise RuntimeError(resultado['error'])
+        await cola.put((indice, resultado['archivos'][0]))
+
+    async def productor() -> None:
+        try:
+            await asyncio.gather(*(
+                descargar(indice, paquete_id)
+                for indice, paquete_id in enumerate(paquetes)
+            ))
+        finally:
+            await cola.put(None)
+
+    async def consumidor() -> None:
+        while (item := await cola.get()) is not None:
+            indice, zip_file = item
+            extraidos[indice] = await asyncio.to_thread(
+                _extract_one, zip_file, output_dir
+            )
+
+    tareas = [asyncio.ensure_future(productor()), asyncio.ensure_future(consumidor())]
+    try:
+        await asyncio.gather(*tareas)
+    except BaseException:
+        for tarea in tareas:
+            tarea.cancel()
+        raise
+
+    return [nombre for nombres in extraidos for nombre in nombres]
+
+
+async def download_cfdi_full_process_async(
     rfc: str,
     fecha_inicio: str,
     fecha_fin: str,
     tipo: str = 'emitidos',
     output_dir: str = './descargas_sat',
     wait_timeout: int = 300,
+    poll_interval_min: float = 2.0,
+    poll_interval_max: float = 60.0,
+    poll_backoff_factor: float = 1.5,
     **kwargs
 ) -> Dict[str, Any]:
     """
-    Proceso completo de descarga: solicita, espera y descarga CFDIs.
+    Versión asíncrona de download_cfdi_full_process.
+
+    La espera entre consultas usa asyncio.sleep y las llamadas al web service
+    se ejecutan fuera del event loop, por lo que varias solicitudes pueden
+    seguirse en paralelo desde un solo hilo.
 
     Args:
-        rfc: RFC del contribuyente
-        fecha_inicio: Fecha inicio (YYYY-MM-DD)
-        fecha_fin: Fecha fin (YYYY-MM-DD)
-        tipo: 'emitidos' o 'recibidos'
-        output_dir: Directorio de salida
-        wait_timeout: Tiempo máximo de espera en segundos (default: 5 minutos)
-        **kwargs: Parámetros adicionales (certificado, key_file, etc.)
+        Los mismos que download_cfdi_full_process
 
     Returns:
         Dict con resultado completo del proceso
 
     Example:
-        >>> result = download_cfdi_full_process(
-        ...     rfc='XAXX010101000',
-        ...     fecha_inicio='2026-01-01',
-        ...     fecha_fin='2026-01-31',
-        ...     tipo='emitidos',
-        ...     output_dir='./mis_facturas',
-        ...     certificado='fiel.cer',
-        ...     key_file='fiel.key',
-        ...     key_password='password'
-        ... )
-        >>> if result['success']:
-        ...     print(f"Descargados {result['total_cfdis']} CFDIs")
+        >>> async def descargar_trimestre():
+        ...     return await asyncio.gather(
+        ...         download_cfdi_full_process_async('XAXX010101000', '2026-01-01', '2026-01-31'),
+        ...         download_cfdi_full_process_async('XAXX010101000', '2026-02-01', '2026-02-28'),
+        ...         download_cfdi_full_process_async('XAXX010101000', '2026-03-01', '2026-03-31')
+        ...     )
+        >>> resultados = asyncio.run(descargar_trimestre())
     """
-    import time
-
     try:
         # 1. Solicitar descarga
-        solicitud = request_download(rfc, fecha_inicio, fecha_fin, tipo, **kwargs)
+        solicitud = await asyncio.to_thread(
+            request_download, rfc, fecha_inicio, fecha_fin, tipo, **kwargs
+        )
         if not solicitud['success']:
             return solicitud
 
         solicitud_id = solicitud['solicitud_id']
 
-        # 2. Esperar a que termine el procesamiento
-        elapsed = 0
-        interval = 10  # Verificar cada 10 segundos
+        # 2. Esperar a que termine el procesamiento (backoff exponencial)
+        deadline = time.monotonic() + wait_timeout
+        interval = poll_interval_min
+        estado_anterior = solicitud.get('estado')
+        terminada = False
 
-        while elapsed < wait_timeout:
-            status = check_download_status(solicitud_id, rfc, **kwargs)
+        while time.monotonic() < deadline:
+            status = await asyncio.to_thread(
+                check_download_status, solicitud_id, rfc, **kwargs
+            )
 
             if not status['success']:
                 return status
 
             if status['estado'] == 'Terminada':
+                terminada = True
                 break
             elif status['estado'] == 'Error':
                 return {
@@ -319,33 +693,115 @@ def download_cfdi_full_process(
                     'error': f"Error en el SAT: {status.get('mensaje')}"
                 }
 
-            time.sleep(interval)
-            elapsed += interval
+            # Un cambio de estado indica avance: volver a consultar pronto
+            if status['estado'] != estado_anterior:
+                interval = poll_interval_min
+                estado_anterior = status['estado']
 
-        if elapsed >= wait_timeout:
+            restante = deadline - time.monotonic()
+            if restante <= 0:
+                break
+            await asyncio.sleep(min(interval, restante))
+            interval = min(interval * poll_backoff_factor, poll_interval_max)
+
+        if not terminada:
             return {
                 'success': False,
                 'error': 'Timeout esperando respuesta del SAT',
                 'solicitud_id': solicitud_id
             }
 
-        # 3. Descargar paquetes
-        download_result = download_packages(solicitud_id, rfc, output_dir, **kwargs)
-        if not download_result['success']:
-            return download_result
-
-        # 4. Extraer CFDIs
-        extract_result = extract_packages(download_result['archivos'], output_dir)
-        if not extract_result['success']:
-            return extract_result
+        # 3 y 4. Descargar paquetes y extraer CFDIs en paralelo
+        archivos = await _download_and_extract(
+            solicitud_id, rfc, status['paquetes'], output_dir, **kwargs
+        )
 
         return {
             'success': True,
             'solicitud_id': solicitud_id,
-            'total_cfdis': extract_result['total_cfdis'],
+            'total_cfdis': len(archivos),
             'directorio': output_dir,
-            'archivos': extract_result['archivos']
+            'archivos': archivos
         }
 
     except Exception as e:
         return {'success': False, 'error': str(e)}
+
+
+def download_cfdi_full_process(
+    rfc: str,
+    fecha_inicio: str,
+    fecha_fin: str,
+    tipo: str = 'emitidos',
+    output_dir: str = './descargas_sat',
+    wait_timeout: int = 300,
+    poll_interval_min: float = 2.0,
+    poll_interval_max: float = 60.0,
+    poll_backoff_factor: float = 1.5,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Proceso completo de descarga: solicita, espera y descarga CFDIs.
+
+    El estado de la solicitud se consulta con backoff exponencial: se empieza
+    verificando cada poll_interval_min segundos y el intervalo crece por
+    poll_backoff_factor hasta poll_interval_max. Cuando el SAT reporta un
+    cambio de estado, el intervalo vuelve al mínimo.
+
+    Envoltura síncrona de download_cfdi_full_process_async. Si se llama con
+    un event loop en ejecución, el proceso corre en un hilo aparte y la
+    llamada bloquea ese loop hasta terminar; desde código async conviene
+    usar la versión asíncrona con await.
+
+    Args:
+        rfc: RFC del contribuyente
+        fecha_inicio: Fecha inicio (YYYY-MM-DD)
+        fecha_fin: Fecha fin (YYYY-MM-DD)
+        tipo: 'emitidos' o 'recibidos'
+        output_dir: Directorio de salida
+        wait_timeout: Tiempo máximo de espera en segundos (default: 5 minutos)
+        poll_interval_min: Intervalo inicial entre consultas en segundos (default: 2)
+        poll_interval_max: Intervalo máximo entre consultas en segundos (default: 60)
+        poll_backoff_factor: Factor de crecimiento del intervalo (default: 1.5)
+        **kwargs: Parámetros adicionales (certificado, key_file, etc.)
+
+    Returns:
+        Dict con resultado completo del proceso
+
+    Example:
+        >>> result = download_cfdi_full_process(
+        ...     rfc='XAXX010101000',
+        ...     fecha_inicio='2026-01-01',
+        ...     fecha_fin='2026-01-31',
+        ...     tipo='emitidos',
+        ...     output_dir='./mis_facturas',
+        ...     certificado='fiel.cer',
+        ...     key_file='fiel.key',
+        ...     key_password='password'
+        ... )
+        >>> if result['success']:
+        ...     print(f"Descargados {result['total_cfdis']} CFDIs")
+    """
+    def proceso() -> Dict[str, Any]:
+        return asyncio.run(download_cfdi_full_process_async(
+            rfc,
+            fecha_inicio,
+            fecha_fin,
+            tipo,
+            output_dir,
+            wait_timeout,
+            poll_interval_min,
+            poll_interval_max,
+            poll_backoff_factor,
+            **kwargs
+        ))
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return proceso()
+
+    # asyncio.run() no puede anidarse en un event loop en ejecución (p. ej.
+    # una ruta síncrona llamada desde código async): usar un hilo aparte
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(proceso).result()
@@ -4,14 +4,36 @@ Ejecuta tests de DML, DDL y DCL usando el schema 'TEST_PYTHON'.
 
 ⚠️ ADVERTENCIA: Solo ejecutar en ambiente de desarrollo.
 """
+import io
 import sys
 import os
+import threading
 import traceback
-from typing import Callable
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
 
 # Agregar el directorio padre al path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from hana import (
+    # DML
+    insert, insert_many, select, select_one,
+    update, delete, exists, count, upsert,
+    # DDL
+    schema_exists, table_exists, create_table, drop_table,
+    create_index, drop_index, execute_ddl, get_table_columns,
+    truncate_table,
+    # DCL
+    user_exists, create_user, drop_user,
+    grant_permission, get_user_permissions,
+    role_exists, create_role, drop_role,
+    grant_role, get_user_roles,
+    # Conexiones
+    get_active_connections, get_connection_count,
+    init_hana_pool, close_hana_pool
+)
+
 
 class TestResult:
     def __init__(self):
@@ -52,6 +74,50 @@ def run_test(func: Callable, test_name: str, result: TestResult):
         return False
 
 
+class _SuiteOutput(io.TextIOBase):
+    """stdout que separa la salida de cada suite ejecutada en paralelo."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def run_suites_parallel(suites: List[Callable[[], bool]]) -> bool:
+    """
+    Ejecuta suites independientes en paralelo (cada una usa sus propias
+    tablas) y muestra su salida completa en el orden recibido.
+    """
+    salida = _SuiteOutput(sys.stdout)
+
+    def ejecutar(suite: Callable[[], bool]):
+        salida.local.buffer = io.StringIO()
+        try:
+            return suite(), salida.local.buffer.getvalue()
+        except Exception:
+            print(f"\n❌ Error ejecutando {suite.__name__}:")
+            traceback.print_exc(file=salida.local.buffer)
+            return False, salida.local.buffer.getvalue()
+
+    sys.stdout = salida
+    try:
+        with ThreadPoolExecutor(max_workers=len(suites)) as executor:
+            resultados = list(executor.map(ejecutar, suites))
+    finally:
+        sys.stdout = salida.stream
+
+    for _, texto in resultados:
+        sys.stdout.write(texto)
+
+    return all(ok for ok, _ in resultados)
+
+
 # ============================================================================
 # TESTS DML
 # ============================================================================
@@ -62,11 +128,6 @@ def test_dml():
     print("TESTS DML - DATA MANIPULATION LANGUAGE (SAP HANA)")
     print("=" * 80)
 
-    from hana import (
-        insert, insert_many, select, select_one,
-        update, delete, exists, count, upsert
-    )
-
     result = TestResult()
     test_schema = 'TEST_PYTHON'
 
@@ -211,12 +272,6 @@ def test_ddl():
     print("TESTS DDL - DATA DEFINITION LANGUAGE (SAP HANA)")
     print("=" * 80)
 
-    from hana import (
-        schema_exists, table_exists, create_table, drop_table,
-        create_index, drop_index, execute_ddl, get_table_columns,
-        truncate_table
-    )
-
     result = TestResult()
     test_schema = 'TEST_PYTHON'
 
@@ -276,7 +331,6 @@ def test_ddl():
     # Test TRUNCATE_TABLE
     def test_truncate():
         # Insertar datos primero
-        from hana import insert
         insert('TEST_TEMP', {
             'CODIGO': 'T001',
             'NOMBRE': 'Temp 1',
@@ -287,7 +341,6 @@ def test_ddl():
         truncate_table('TEST_TEMP', schema=test_schema)
 
         # Verificar
-        from hana import count
         total = count('TEST_TEMP', schema=test_schema)
         assert total == 0, f"La tabla debe estar vacía, tiene {total} registros"
 
@@ -322,13 +375,6 @@ def test_dcl():
     print("=" * 80)
     print("⚠️  Requiere permisos de administrador\n")
 
-    from hana import (
-        user_exists, create_user, drop_user,
-        grant_permission, get_user_permissions,
-        role_exists, create_role, drop_role,
-        grant_role, get_user_roles
-    )
-
     result = TestResult()
     test_schema = 'TEST_PYTHON'
 
@@ -407,8 +453,6 @@ def test_connections():
     print("TESTS GESTIÓN DE CONEXIONES (SAP HANA)")
     print("=" * 80)
 
-    from hana import get_active_connections, get_connection_count
-
     result = TestResult()
 
     # Test GET_ACTIVE_CONNECTIONS
@@ -434,15 +478,11 @@ def test_connections():
         total = get_connection_count()
         print(f"      Total de conexiones en SAP HANA: {total}")
 
-        conexiones = get_active_connections()
-        users = {}
-        for conn in conexiones:
-            user = conn['user_name']
-            users[user] = users.get(user, 0) + 1
+        users = Counter(conn['user_name'] for conn in get_active_connections())
 
         print("      Conexiones por usuario:")
-        for user, count in sorted(users.items(), key=lambda x: x[1], reverse=True)[:5]:
-            print(f"        - {user}: {count}")
+        for user, cantidad in users.most_common(5):
+            print(f"        - {user}: {cantidad}")
     except Exception as e:
         print(f"      Error obteniendo información: {e}")
 
@@ -484,16 +524,11 @@ Servidor: Configurado en .env
     all_passed = True
 
     try:
-        # DML Tests
-        if not test_dml():
-            all_passed = False
-
-        # DDL Tests
-        if not test_ddl():
-            all_passed = False
+        # Pool de conexiones compartido por todas las pruebas
+        init_hana_pool()
 
-        # Conexiones Tests
-        if not test_connections():
+        # DML, DDL y Conexiones usan tablas distintas: se ejecutan en paralelo
+        if not run_suites_parallel([test_dml, test_ddl, test_connections]):
             all_passed = False
 
         # DCL Tests (opcional)
@@ -508,6 +543,8 @@ Servidor: Configurado en .env
         print(f"\n❌ Error ejecutando tests: {e}")
         traceback.print_exc()
         all_passed = False
+    finally:
+        close_hana_pool()
 
     # Resumen final
     print("\n" + "=" * 80)
@@ -0,0 +1,55 @@
+"""Carga de variables de entorno desde el .env de infraestructura para los scripts de prueba."""
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+ENV_FILE = '../../infraestructura/.env'
+
+# Variables necesarias para los ejemplos interactivos
+REQUIRED_VARS = frozenset({'LDAP_SERVER', 'LDAP_BASE_DN', 'LDAP_BIND_DN', 'LDAP_BIND_PASSWORD'})
+
+
+@lru_cache(maxsize=1)
+def load_env(path: str = ENV_FILE) -> Dict[str, str]:
+    """
+    Lee el archivo .env y lo aplica a os.environ en una sola actualización.
+
+    Args:
+        path: Ruta del archivo .env
+
+    Returns:
+        Dict con las variables cargadas (vacío si el archivo no existe)
+    """
+    env_path = Path(path)
+    if not env_path.exists():
+        return {}
+
+    lines = (line.strip() for line in env_path.read_text().splitlines())
+    env = dict(line.split('=', 1) for line in lines if line and not line.startswith('#') and '=' in line)
+    os.environ.update(env)
+    return env
+
+
+@dataclass(frozen=True, slots=True)
+class LdapEnv:
+    """Configuración LDAP leída una sola vez de las variables de entorno."""
+    server: Optional[str]
+    port: Optional[int]
+    use_ssl: bool
+    bind_dn: Optional[str]
+    bind_password: Optional[str] = field(repr=False)
+    base_dn: Optional[str]
+
+    @classmethod
+    def from_env(cls) -> 'LdapEnv':
+        port = os.getenv('LDAP_PORT')
+        return cls(
+            server=os.getenv('LDAP_SERVER'),
+            port=int(port) if port else None,
+            use_ssl=os.getenv('LDAP_USE_SSL', 'false').lower() == 'true',
+            bind_dn=os.getenv('LDAP_BIND_DN'),
+            bind_password=os.getenv('LDAP_BIND_PASSWORD'),
+            base_dn=os.getenv('LDAP_BASE_DN')
+        )
@@ -19,20 +19,13 @@ import sys
 # Agregar path para imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from ldap import (
-    test_ldap_connection,
-    authenticate_user,
-    verify_credentials,
-    search_users,
-    search_groups,
-    find_user_by_username,
-    get_user_groups,
-    get_group_members
-)
+from _env import REQUIRED_VARS
 
 
 def test_connection():
     """Prueba la conexión al servidor LDAP."""
+    from ldap import test_ldap_connection
+
     print("=" * 60)
     print("TEST: Conexión al servidor LDAP")
     print("=" * 60)
@@ -53,6 +46,8 @@ def test_connection():
 
 def test_authentication():
     """Prueba autenticación de usuario."""
+    from ldap import authenticate_user, verify_credentials
+
     print("\n" + "=" * 60)
     print("TEST: Autenticación de Usuario")
     print("=" * 60)
@@ -81,13 +76,15 @@ def test_authentication():
 
 def test_user_search():
     """Prueba búsqueda de usuarios."""
+    from ldap import search_users, find_users_by_usernames
+
     print("\n" + "=" * 60)
     print("TEST: Búsqueda de Usuarios")
     print("=" * 60)
 
     # Buscar todos los usuarios (limitado a 10)
     print("\n1. Listando primeros 10 usuarios...")
-    users = search_users(limit=10)
+    users = search_users(limit=10, attributes=['cn', 'mail', 'sAMAccountName'])
 
     if users:
         print(f"✓ Encontrados {len(users)} usuarios:")
@@ -99,42 +96,49 @@ def test_user_search():
     else:
         print("No se encontraron usuarios")
 
-    # Buscar usuario específico
-    print("\n2. Buscar usuario específico...")
-    username = input("Nombre de usuario a buscar (sAMAccountName): ")
-
-    user = find_user_by_username(username)
-    if user:
-        print(f"✓ Usuario encontrado:")
-        print(f"  DN: {user['dn']}")
-        print(f"  Nombre: {user.get('cn', 'N/A')}")
-        print(f"  Email: {user.get('mail', 'N/A')}")
-        print(f"  Teléfono: {user.get('telephoneNumber', 'N/A')}")
-
-        # Mostrar grupos
-        groups = user.get('memberOf', [])
-        if not isinstance(groups, list):
-            groups = [groups] if groups else []
-
-        if groups:
-            print(f"  Grupos ({len(groups)}):")
-            for group in groups[:5]:  # Mostrar solo primeros 5
-                print(f"    - {group}")
-            if len(groups) > 5:
-                print(f"    ... y {len(groups) - 5} más")
-    else:
-        print(f"✗ Usuario '{username}' no encontrado")
+    # Buscar usuarios específicos (una sola consulta para todos)
+    print("\n2. Buscar usuarios específicos...")
+    entrada = input("Nombres de usuario a buscar (sAMAccountName, separados por coma): ")
+    usernames = [name.strip() for name in entrada.split(',') if name.strip()]
+
+    encontrados = find_users_by_usernames(
+        usernames,
+        attributes=['cn', 'mail', 'telephoneNumber', 'memberOf']
+    )
+    for username, user in encontrados.items():
+        if user:
+            print(f"✓ Usuario encontrado: {username}")
+            print(f"  DN: {user['dn']}")
+            print(f"  Nombre: {user.get('cn', 'N/A')}")
+            print(f"  Email: {user.get('mail', 'N/A')}")
+            print(f"  Teléfono: {user.get('telephoneNumber', 'N/A')}")
+
+            # Mostrar grupos
+            groups = user.get('memberOf', [])
+            if not isinstance(groups, list):
+                groups = [groups] if groups else []
+
+            if groups:
+                print(f"  Grupos ({len(groups)}):")
+                for group in groups[:5]:  # Mostrar solo primeros 5
+                    print(f"    - {group}")
+                if len(groups) > 5:
+                    print(f"    ... y {len(groups) - 5} más")
+        else:
+            print(f"✗ Usuario '{username}' no encontrado")
 
 
 def test_group_search():
     """Prueba búsqueda de grupos."""
+    from ldap import search_groups, get_group_members
+
     print("\n" + "=" * 60)
     print("TEST: Búsqueda de Grupos")
     print("=" * 60)
 
     # Listar grupos
     print("\n1. Listando primeros 10 grupos...")
-    groups = search_groups(limit=10)
+    groups = search_groups(limit=10, attributes=['cn', 'description', 'member'])
 
     if groups:
         print(f"✓ Encontrados {len(groups)} grupos:")
@@ -174,48 +178,58 @@ def main():
     print()
 
     # Verificar variables de entorno
-    required_vars = ['LDAP_SERVER', 'LDAP_BASE_DN', 'LDAP_BIND_DN', 'LDAP_BIND_PASSWORD']
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    missing_vars = {v for v in REQUIRED_VARS if not os.environ.get(v)}
 
     if missing_vars:
         print("⚠️  Variables de entorno faltantes:")
-        for var in missing_vars:
+        for var in sorted(missing_vars):
             print(f"  - {var}")
         print("\nConfigura estas variables antes de continuar.")
         return
 
-    # Menú de opciones
-    while True:
-        print("\n" + "-" * 60)
-        print("OPCIONES:")
-        print("  1. Probar conexión")
-        print("  2. Autenticar usuario")
-        print("  3. Buscar usuarios")
-        print("  4. Buscar grupos")
-        print("  5. Ejecutar todos los tests")
-        print("  0. Salir")
-        print("-" * 60)
-
-        opcion = input("\nSeleccione una opción: ").strip()
-
-        if opcion == '1':
-            test_connection()
-        elif opcion == '2':
-            test_authentication()
-        elif opcion == '3':
-            test_user_search()
-        elif opcion == '4':
-            test_group_search()
-        elif opcion == '5':
-            if test_connection():
+    from contextlib import ExitStack
+    from ldap3.core.exceptions import LDAPException
+    from ldap import ldap_session
+
+    # Menú de opciones (una sola conexión para toda la sesión)
+    with ExitStack() as stack:
+        try:
+            stack.enter_context(ldap_session())
+        except LDAPException as e:
+            print(f"✗ Error de conexión: {e}")
+            return
+
+        while True:
+            print("\n" + "-" * 60)
+            print("OPCIONES:")
+            print("  1. Probar conexión")
+            print("  2. Autenticar usuario")
+            print("  3. Buscar usuarios")
+            print("  4. Buscar grupos")
+            print("  5. Ejecutar todos los tests")
+            print("  0. Salir")
+            print("-" * 60)
+
+            opcion = input("\nSeleccione una opción: ").strip()
+
+            if opcion == '1':
+                test_connection()
+            elif opcion == '2':
                 test_authentication()
+            elif opcion == '3':
                 test_user_search()
+            elif opcion == '4':
                 test_group_search()
-        elif opcion == '0':
-            print("\n¡Hasta luego!")
-            break
-        else:
-            print("Opción no válida")
+            elif opcion == '5':
+                if test_connection():
+                    test_authentication()
+                    test_user_search()
+                    test_group_search()
+            elif opcion == '0':
+                print("\n¡Hasta luego!")
+                break
+            else:
+                print("Opción no válida")
 
 
 if __name__ == '__main__':
@@ -14,38 +14,41 @@ IMPORTANTE: Requiere permisos de administrador y variables de entorno configurad
 """
 import os
 import sys
+import textwrap
 
 # Agregar path para imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from ldap import (
-    # OUs
-    create_ou,
-    list_ou_contents,
-    ou_exists,
-    delete_ou,
-    # Usuarios
-    create_user,
-    update_user,
-    disable_user,
-    enable_user,
-    user_exists,
-    delete_user,
-    # Grupos
-    create_group,
-    add_user_to_group,
-    remove_user_from_group,
-    list_group_members,
-    group_exists,
-    delete_group
-)
+# Recordar resultados de *_exists durante la ejecución del demo
+os.environ.setdefault('LDAP_CACHE_TTL', '60')
+
+from _env import REQUIRED_VARS
+
+SEP60 = '=' * 60
+
+WORKFLOW_BANNER = textwrap.dedent("""
+    Este demo ejecutará:
+    1. Crear estructura de OUs (TestDemo/Usuarios, TestDemo/Grupos)
+    2. Crear usuario de prueba (test.demo)
+    3. Crear grupo de prueba (TestDemoGroup)
+    4. Agregar usuario al grupo
+    5. Listar membresías
+    6. Cleanup (eliminar todo)
+
+    ⚠️ Se realizarán modificaciones en el directorio LDAP.
+""")
+
+
+def _header(title):
+    """Imprime el encabezado de una sección."""
+    print(f"\n{SEP60}\n{title}\n{SEP60}")
 
 
 def demo_ou_management():
     """Demo de gestión de OUs."""
-    print("\n" + "=" * 60)
-    print("DEMO: Gestión de Unidades Organizativas (OUs)")
-    print("=" * 60)
+    from ldap import create_ou, create_ous, ou_exists
+
+    _header("DEMO: Gestión de Unidades Organizativas (OUs)")
 
     # Crear OU principal
     print("\n1. Crear OU 'TestDemo'...")
@@ -63,13 +66,20 @@ def demo_ou_management():
             ('Grupos', 'Grupos de prueba')
         ]
 
+        pendientes = []
         for ou_name, desc in sub_ous:
             if not ou_exists(ou_name, parent_ou='OU=TestDemo'):
-                create_ou(ou_name, parent_ou='OU=TestDemo', description=desc)
-                print(f"✓ OU '{ou_name}' creada")
+                pendientes.append((ou_name, desc))
             else:
                 print(f"○ OU '{ou_name}' ya existe")
 
+        # Crear las faltantes en un solo envío
+        for ou_name, creada in create_ous(pendientes, parent_ou='OU=TestDemo').items():
+            if creada:
+                print(f"✓ OU '{ou_name}' creada")
+            else:
+                print(f"✗ OU '{ou_name}' no se pudo crear")
+
         print("\n✓ Estructura de OUs creada exitosamente")
 
     except Exception as e:
@@ -78,57 +88,79 @@ def demo_ou_management():
 
 def demo_user_management():
     """Demo de gestión de usuarios."""
-    print("\n" + "=" * 60)
-    print("DEMO: Gestión de Usuarios")
-    print("=" * 60)
+    from ldap import create_user, update_user, user_exists
+
+    _header("DEMO: Gestión de Usuarios")
 
-    # Crear usuario
-    print("\n1. Crear usuario de prueba...")
     username = 'test.demo'
+    atributos = {
+        'telephoneNumber': '+1234567890',
+        'title': 'Usuario de Prueba'
+    }
 
     try:
         if not user_exists(username):
+            # Crear usuario con todos sus atributos en una sola operación
+            print("\n1. Crear usuario de prueba (con teléfono y puesto)...")
             create_user(
                 username=username,
                 password='TestDemo123!',
                 first_name='Test',
                 last_name='Demo',
                 email='test.demo@empresa.com',
-                ou='OU=Usuarios,OU=TestDemo'
+                ou='OU=Usuarios,OU=TestDemo',
+                additional_attributes=atributos
             )
             print(f"✓ Usuario '{username}' creado")
         else:
-            print(f"○ Usuario '{username}' ya existe")
+            print(f"\n1. ○ Usuario '{username}' ya existe")
+
+            # Actualizar atributos
+            print("\n2. Actualizar atributos del usuario...")
+            update_user(username, atributos)
+            print(f"✓ Atributos actualizados")
+
+        print("\n✓ Gestión de usuario completada")
+
+    except Exception as e:
+        print(f"✗ Error: {e}")
 
-        # Actualizar atributos
-        print("\n2. Actualizar atributos del usuario...")
-        update_user(username, {
-            'telephoneNumber': '+1234567890',
-            'title': 'Usuario de Prueba'
-        })
-        print(f"✓ Atributos actualizados")
+
+def demo_enable_disable():
+    """Demo del ciclo deshabilitar/habilitar de una cuenta."""
+    from ldap import disable_user, enable_user, user_exists
+
+    _header("DEMO: Deshabilitar y Habilitar Usuario")
+
+    username = 'test.demo'
+
+    try:
+        if not user_exists(username):
+            print(f"✗ Usuario '{username}' no existe (ejecutar demo de usuarios primero)")
+            return
 
         # Deshabilitar
-        print("\n3. Deshabilitar usuario...")
+        print("\n1. Deshabilitar usuario...")
         disable_user(username)
         print(f"✓ Usuario deshabilitado")
 
         # Habilitar
-        print("\n4. Habilitar usuario...")
+        print("\n2. Habilitar usuario...")
         enable_user(username)
         print(f"✓ Usuario habilitado")
 
-        print("\n✓ Gestión de usuario completada")
-
     except Exception as e:
         print(f"✗ Error: {e}")
 
 
 def demo_group_management():
     """Demo de gestión de grupos."""
-    print("\n" + "=" * 60)
-    print("DEMO: Gestión de Grupos y Membresías")
-    print("=" * 60)
+    from ldap import (
+        create_group, group_exists, user_exists,
+        add_user_to_group, remove_user_from_group, list_group_members
+    )
+
+    _header("DEMO: Gestión de Grupos y Membresías")
 
     group_name = 'TestDemoGroup'
     username = 'test.demo'
@@ -174,9 +206,9 @@ def demo_group_management():
 
 def demo_cleanup():
     """Limpia los objetos creados en las demos."""
-    print("\n" + "=" * 60)
-    print("CLEANUP: Eliminando objetos de prueba")
-    print("=" * 60)
+    from ldap import delete_group, group_exists, delete_user, user_exists, delete_ou, ou_exists
+
+    _header("CLEANUP: Eliminando objetos de prueba")
 
     confirm = input("\n¿Desea eliminar todos los objetos de prueba? (s/n): ")
     if confirm.lower() != 's':
@@ -210,21 +242,9 @@ def demo_cleanup():
 
 def demo_complete_workflow():
     """Ejecuta un flujo completo de trabajo."""
-    print("\n" + "=" * 60)
-    print("DEMO: Flujo Completo de Trabajo")
-    print("=" * 60)
-
-    print("""
-Este demo ejecutará:
-1. Crear estructura de OUs (TestDemo/Usuarios, TestDemo/Grupos)
-2. Crear usuario de prueba (test.demo)
-3. Crear grupo de prueba (TestDemoGroup)
-4. Agregar usuario al grupo
-5. Listar membresías
-6. Cleanup (eliminar todo)
-
-⚠️ Se realizarán modificaciones en el directorio LDAP.
-    """)
+    _header("DEMO: Flujo Completo de Trabajo")
+
+    print(WORKFLOW_BANNER)
 
     confirm = input("¿Continuar? (s/n): ")
     if confirm.lower() != 's':
@@ -237,9 +257,7 @@ Este demo ejecutará:
         demo_user_management()
         demo_group_management()
 
-        print("\n" + "=" * 60)
-        print("FLUJO COMPLETO EXITOSO")
-        print("=" * 60)
+        _header("FLUJO COMPLETO EXITOSO")
 
         # Preguntar por cleanup
         demo_cleanup()
@@ -259,12 +277,11 @@ def main():
     print()
 
     # Verificar variables de entorno
-    required_vars = ['LDAP_SERVER', 'LDAP_BASE_DN', 'LDAP_BIND_DN', 'LDAP_BIND_PASSWORD']
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    missing_vars = {v for v in REQUIRED_VARS if not os.environ.get(v)}
 
     if missing_vars:
         print("⚠️  Variables de entorno faltantes:")
-        for var in missing_vars:
+        for var in sorted(missing_vars):
             print(f"  - {var}")
         print("\nConfigura estas variables antes de continuar.")
         return
@@ -274,6 +291,17 @@ def main():
     print("  Solo ejecutar en ambiente de pruebas con permisos de administrador.")
     print()
 
+    from ldap import ldap_session
+
+    demos = {
+        '1': demo_ou_management,
+        '2': demo_user_management,
+        '3': demo_group_management,
+        '4': demo_complete_workflow,
+        '5': demo_cleanup,
+        '6': demo_enable_disable,
+    }
+
     # Menú de opciones
     while True:
         print("\n" + "-" * 60)
@@ -283,26 +311,27 @@ def main():
         print("  3. Demo: Gestión de Grupos")
         print("  4. Demo: Flujo Completo (crea y limpia todo)")
         print("  5. Cleanup: Eliminar objetos de prueba")
+        print("  6. Demo: Deshabilitar/Habilitar usuario")
         print("  0. Salir")
         print("-" * 60)
 
         opcion = input("\nSeleccione una opción: ").strip()
 
-        if opcion == '1':
-            demo_ou_management()
-        elif opcion == '2':
-            demo_user_management()
-        elif opcion == '3':
-            demo_group_management()
-        elif opcion == '4':
-            demo_complete_workflow()
-        elif opcion == '5':
-            demo_cleanup()
-        elif opcion == '0':
+        if opcion == '0':
             print("\n¡Hasta luego!")
             break
-        else:
+
+        demo = demos.get(opcion)
+        if demo is None:
             print("Opción no válida")
+            continue
+
+        # Un solo bind para todas las operaciones del demo
+        try:
+            with ldap_session():
+                demo()
+        except Exception as e:
+            print(f"✗ Error de conexión: {e}")
 
 
 if __name__ == '__main__':
@@ -1,28 +1,23 @@
 #!/usr/bin/env python3
 """Test de conexión LDAP desde software/app."""
-import os
 import sys
 
 # Cargar .env
-env_file = '../../infraestructura/.env'
-if os.path.exists(env_file):
-    with open(env_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                os.environ[key] = value
+from _env import LdapEnv, load_env
+load_env()
+env = LdapEnv.from_env()
 
 # Importar paquete LDAP
 from paquetes.ldap import test_ldap_connection, search_users
+from paquetes.ldap._utils import first
 
 print("=" * 60)
 print("PRUEBA DE CONEXIÓN LDAP")
 print("=" * 60)
-print(f"Servidor: {os.getenv('LDAP_SERVER')}")
-print(f"Puerto: {os.getenv('LDAP_PORT')}")
-print(f"SSL: {os.getenv('LDAP_USE_SSL')}")
-print(f"Base DN: {os.getenv('LDAP_BASE_DN')}")
+print(f"Servidor: {env.server}")
+print(f"Puerto: {env.port}")
+print(f"SSL: {env.use_ssl}")
+print(f"Base DN: {env.base_dn}")
 print()
 
 # Probar conexión
@@ -52,9 +47,7 @@ if result['success']:
         if users:
             print(f"✓ Se encontraron {len(users)} usuarios:")
             for user in users:
-                cn = user.get('cn', ['N/A'])[0] if isinstance(user.get('cn'), list) else user.get('cn', 'N/A')
-                sam = user.get('sAMAccountName', ['N/A'])[0] if isinstance(user.get('sAMAccountName'), list) else user.get('sAMAccountName', 'N/A')
-                print(f"  - {cn} ({sam})")
+                print(f"  - {first(user, 'cn')} ({first(user, 'sAMAccountName')})")
         else:
             print("⚠️  No se encontraron usuarios")
     except Exception as e:
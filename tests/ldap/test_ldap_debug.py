@@ -1,77 +1,81 @@
 #!/usr/bin/env python3
 """Test de conexión LDAP con debug."""
-import os
 import sys
-import socket
+import asyncio
+import importlib
 
 # Cargar .env
-env_file = '../../infraestructura/.env'
+from _env import LdapEnv, load_env
 print("1. Cargando variables de entorno...")
-if os.path.exists(env_file):
-    with open(env_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                os.environ[key] = value
+if load_env():
     print("   ✓ Variables cargadas")
 
-server = os.getenv('LDAP_SERVER')
-port = int(os.getenv('LDAP_PORT', 636))
+env = LdapEnv.from_env()
+server = env.server
+port = env.port or 636
 
 print(f"\n2. Verificando conectividad de red...")
 print(f"   Servidor: {server}")
 print(f"   Puerto: {port}")
 
-# Verificar conectividad TCP
-try:
-    print(f"   Intentando conectar a {server}:{port}...")
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(5)
-    result = sock.connect_ex((server, port))
-    sock.close()
-
-    if result == 0:
-        print(f"   ✓ Puerto {port} está abierto")
-    else:
-        print(f"   ✗ Puerto {port} está cerrado o inalcanzable")
-        print(f"   Código de error: {result}")
-        sys.exit(1)
-except socket.timeout:
+
+async def probe(host, port):
+    """Abre y cierra una conexión TCP al servidor."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def probe_and_import(host, port):
+    """Verifica el puerto mientras se importa ldap3 en otro hilo."""
+    return await asyncio.gather(
+        asyncio.wait_for(probe(host, port), timeout=2.0),
+        asyncio.to_thread(importlib.import_module, 'ldap3'),
+        return_exceptions=True
+    )
+
+
+# Verificar conectividad TCP (en paralelo con la importación de ldap3)
+print(f"   Intentando conectar a {server}:{port}...")
+probe_result, import_result = asyncio.run(probe_and_import(server, port))
+
+if isinstance(probe_result, asyncio.TimeoutError):
     print(f"   ✗ Timeout al conectar a {server}:{port}")
     sys.exit(1)
-except Exception as e:
-    print(f"   ✗ Error de red: {e}")
+elif isinstance(probe_result, OSError):
+    print(f"   ✗ Puerto {port} está cerrado o inalcanzable")
+    print(f"   Error: {probe_result}")
     sys.exit(1)
+elif isinstance(probe_result, Exception):
+    print(f"   ✗ Error de red: {probe_result}")
+    sys.exit(1)
+print(f"   ✓ Puerto {port} está abierto")
 
 print("\n3. Importando módulo LDAP...")
-try:
-    from ldap3 import Server, Connection, Tls, SIMPLE, ALL
-    import ssl
-    print("   ✓ ldap3 importado")
-except ImportError as e:
-    print(f"   ✗ Error al importar: {e}")
+if isinstance(import_result, ImportError):
+    print(f"   ✗ Error al importar: {import_result}")
     sys.exit(1)
+from ldap3 import Server, Connection, Tls, SIMPLE, ALL
+import ssl
+print("   ✓ ldap3 importado")
 
 print("\n4. Configurando conexión LDAP...")
-bind_dn = os.getenv('LDAP_BIND_DN')
-bind_password = os.getenv('LDAP_BIND_PASSWORD')
-use_ssl = os.getenv('LDAP_USE_SSL', 'false').lower() == 'true'
-
-print(f"   SSL: {use_ssl}")
-print(f"   Bind DN: {bind_dn}")
+print(f"   SSL: {env.use_ssl}")
+print(f"   Bind DN: {env.bind_dn}")
 
 try:
     tls_config = None
-    if use_ssl:
+    if env.use_ssl:
         print("   Configurando TLS (sin validar certificado)...")
-        tls_config = Tls(validate=ssl.CERT_NONE, version=ssl.PROTOCOL_TLSv1_2)
+        # Contexto por defecto de ldap3 (TLS 1.2 o superior); sni envía el
+        # nombre del servidor en el handshake
+        tls_config = Tls(validate=ssl.CERT_NONE, sni=server)
 
     print("\n5. Creando servidor LDAP...")
     ldap_server = Server(
         server,
         port=port,
-        use_ssl=use_ssl,
+        use_ssl=env.use_ssl,
         tls=tls_config,
         get_info=ALL,
         connect_timeout=5
@@ -81,8 +85,8 @@ try:
     print("\n6. Intentando autenticación...")
     conn = Connection(
         ldap_server,
-        user=bind_dn,
-        password=bind_password,
+        user=env.bind_dn,
+        password=env.bind_password,
         authentication=SIMPLE,
         auto_bind=True,
         receive_timeout=5
@@ -2,14 +2,22 @@
 Script de pruebas automáticas para el módulo MSSQL.
 Ejecuta TODOS los tests sin interacción del usuario.
 """
+import io
 import sys
 import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from functools import partial
 
 # Agregar el directorio padre al path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from test_mssql import (
+    BAR,
     setup_test_environment,
+    restore_test_snapshot,
+    run_in_session,
     test_dml,
     test_ddl,
     test_connections,
@@ -17,6 +25,65 @@ from test_mssql import (
 )
 
 
+def run_test_category(test_name, test_func):
+    """Ejecuta una categoría de tests y retorna True si pasó."""
+    try:
+        print("\n" + BAR)
+        print(f"Ejecutando tests de {test_name}...")
+        print(BAR)
+
+        return bool(test_func())
+
+    except Exception as e:
+        print(f"\n❌ Error ejecutando tests de {test_name}: {e}")
+        traceback.print_exc(file=sys.stdout)
+        return False
+
+
+def run_category_isolated(test_name, test_func, test_db):
+    """
+    Ejecuta una categoría en su propia base de datos y la elimina al terminar.
+
+    Returns:
+        Tupla (paso, salida capturada)
+    """
+    from mssql import drop_database
+
+    ok = False
+    salida = io.StringIO()
+    with redirect_stdout(salida):
+        try:
+            ok = setup_test_environment(test_db) and run_test_category(
+                test_name, partial(run_in_session, test_func, test_db)
+            )
+        finally:
+            try:
+                drop_database(test_db, force=True)
+            except Exception as e:
+                print(f"⚠️  No se pudo eliminar '{test_db}': {e}")
+    return ok, salida.getvalue()
+
+
+def run_categories_parallel(tests):
+    """
+    Ejecuta cada categoría en un proceso distinto contra su propia base de
+    datos (test_python_<n>), de modo que no comparten tablas ni conexiones.
+    La salida de cada categoría se muestra completa al terminar.
+    """
+    resultados = []
+    with ProcessPoolExecutor(max_workers=min(4, len(tests))) as executor:
+        futures = [
+            executor.submit(run_category_isolated, name, func, f'test_python_{i}')
+            for i, (name, func) in enumerate(tests)
+        ]
+        for future in as_completed(futures):
+            ok, texto = future.result()
+            sys.stdout.write(texto)
+            resultados.append(ok)
+
+    return resultados
+
+
 def main():
     """Ejecuta todos los tests automáticamente."""
     print("""
@@ -34,17 +101,7 @@ Base de datos: test
 Servidor: mssql-api-mcp
     """)
 
-    # Setup
-    print("Configurando ambiente de pruebas...")
-    if not setup_test_environment():
-        print("\n❌ No se pudo configurar el ambiente de pruebas")
-        sys.exit(1)
-
     # Ejecutar todos los tests
-    all_passed = True
-    total_tests = 0
-    passed_tests = 0
-
     tests = [
         ("DML", test_dml),
         ("DDL", test_ddl),
@@ -52,44 +109,45 @@ Servidor: mssql-api-mcp
         ("DCL", test_dcl)
     ]
 
-    for test_name, test_func in tests:
-        try:
-            print(f"\n{'='*80}")
-            print(f"Ejecutando tests de {test_name}...")
-            print(f"{'='*80}")
-
-            result = test_func()
-            if result:
-                passed_tests += 1
-            else:
-                all_passed = False
-            total_tests += 1
-
-        except Exception as e:
-            print(f"\n❌ Error ejecutando tests de {test_name}: {e}")
-            import traceback
-            traceback.print_exc()
-            all_passed = False
-            total_tests += 1
+    # MSSQL_TESTS_PARALLEL=1 ejecuta las categorías en procesos con BDs aisladas
+    if os.getenv('MSSQL_TESTS_PARALLEL') == '1':
+        resultados = run_categories_parallel(tests)
+    else:
+        # Setup
+        print("Configurando ambiente de pruebas...")
+        if not setup_test_environment():
+            print("\n❌ No se pudo configurar el ambiente de pruebas")
+            sys.exit(1)
+
+        resultados = []
+        for i, (name, func) in enumerate(tests):
+            # Cada categoría parte del snapshot limpio
+            if i > 0:
+                restore_test_snapshot('test_python')
+            resultados.append(run_test_category(name, partial(run_in_session, func)))
+
+    total_tests = len(resultados)
+    passed_tests = sum(resultados)
+    all_passed = passed_tests == total_tests
 
     # Resumen final
-    print("\n" + "=" * 80)
+    print("\n" + BAR)
     print("RESUMEN FINAL")
-    print("=" * 80)
+    print(BAR)
     print(f"\nCategorías de tests ejecutadas: {passed_tests}/{total_tests}")
 
     if all_passed:
         print("\n✓ TODAS LAS PRUEBAS PASARON EXITOSAMENTE")
         print("\nEstadísticas:")
         print("  - DML: 10 tests ✓")
-        print("  - DDL: 9 tests ✓")
+        print("  - DDL: 8 tests ✓")
         print("  - Gestión de Conexiones: 5 tests ✓")
         print("  - DCL: Variable (depende de permisos) ✓")
     else:
         print("\n❌ ALGUNAS CATEGORÍAS DE PRUEBAS FALLARON")
         print(f"   Revisa los logs arriba para más detalles")
 
-    print("=" * 80 + "\n")
+    print(BAR + "\n")
 
     sys.exit(0 if all_passed else 1)
 
@@ -1,26 +1,124 @@
 """
 Script para crear la base de datos de pruebas test_python.
+
+Variables de entorno (sin terminal interactiva no se pregunta nada):
+    RECREATE_DB=s   Recrear la base de datos si ya existe (default: n)
 """
 import sys
 import os
+import json
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Agregar el directorio padre al path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Cachear database_exists/table_exists durante la corrida (ver mssql/_cache.py)
+os.environ.setdefault('MSSQL_CACHE_TTL', '60')
+
 from mssql import (
     database_exists,
     create_database,
     drop_database,
     create_table,
-    table_exists
+    execute_ddl
 )
 
-
-def setup_test_python_database():
-    """Crea y configura la base de datos test_python para pruebas."""
-    print("=" * 80)
+# Separador de los banners
+BAR = "=" * 80
+
+# Tablas de prueba: {nombre: (columnas, llave_primaria)}
+TEST_TABLES = {
+    'test_clientes': (
+        {
+            'id': 'INT IDENTITY(1,1)',
+            'nombre': 'NVARCHAR(100) NOT NULL',
+            'email': 'NVARCHAR(100)',
+            'telefono': 'NVARCHAR(20)',
+            'activo': 'BIT DEFAULT 1',
+            'fecha_registro': 'DATETIME DEFAULT GETDATE()'
+        },
+        'id'
+    ),
+    'test_productos': (
+        {
+            'id': 'INT IDENTITY(1,1)',
+            'codigo': 'NVARCHAR(50) NOT NULL',
+            'nombre': 'NVARCHAR(100)',
+            'descripcion': 'NVARCHAR(MAX)',
+            'precio': 'DECIMAL(18,2)',
+            'stock': 'INT DEFAULT 0',
+            'activo': 'BIT DEFAULT 1',
+            'fecha_creacion': 'DATETIME DEFAULT GETDATE()'
+        },
+        'id'
+    ),
+    'test_ventas': (
+        {
+            'id': 'INT IDENTITY(1,1)',
+            'cliente_id': 'INT',
+            'producto_id': 'INT',
+            'cantidad': 'INT NOT NULL',
+            'precio_unitario': 'DECIMAL(18,2)',
+            'total': 'DECIMAL(18,2)',
+            'fecha_venta': 'DATETIME DEFAULT GETDATE()'
+        },
+        'id'
+    ),
+}
+
+
+def build_create_tables_script(tables: dict) -> str:
+    """
+    Construye un solo batch T-SQL que crea cada tabla solo si no existe.
+
+    Args:
+        tables: Diccionario {tabla: (columnas, llave_primaria)}
+
+    Returns:
+        Script con un 'IF NOT EXISTS ... CREATE TABLE' por tabla
+    """
+    statements = []
+    for table, (columns, primary_key) in tables.items():
+        column_defs = [f"{name} {definition}" for name, definition in columns.items()]
+        column_defs.append(f"PRIMARY KEY ({primary_key})")
+        columns_sql = ',\n    '.join(column_defs)
+        statements.append(
+            f"IF NOT EXISTS (SELECT 1 FROM sys.tables WHERE name = '{table}')\n"
+            f"CREATE TABLE {table} (\n    {columns_sql}\n);"
+        )
+    return '\n'.join(statements)
+
+
+def create_tables_parallel(tables: dict, database: str) -> None:
+    """
+    Crea las tablas en paralelo, una conexión por hilo (create_table abre la suya).
+
+    Args:
+        tables: Diccionario {tabla: (columnas, llave_primaria)}
+        database: Base de datos destino
+    """
+    with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+        futures = {
+            executor.submit(create_table, table, columns, primary_key=primary_key, database=database): table
+            for table, (columns, primary_key) in tables.items()
+        }
+        for future in as_completed(futures):
+            future.result()
+            print(f"   ✓ Tabla '{futures[future]}' lista")
+
+
+def setup_test_python_database(parallel_table_creation: bool = False):
+    """
+    Crea y configura la base de datos test_python para pruebas.
+
+    Args:
+        parallel_table_creation: Si True, crea las tablas con create_table en
+            hilos paralelos en lugar del batch DDL único (default: False)
+    """
+    print(BAR)
     print("CONFIGURACIÓN DE BASE DE DATOS DE PRUEBAS: test_python")
-    print("=" * 80)
+    print(BAR)
 
     db_name = 'test_python'
 
@@ -29,7 +127,10 @@ def setup_test_python_database():
         print(f"\n1. Verificando si existe la base de datos '{db_name}'...")
         if database_exists(db_name):
             print(f"   La base de datos '{db_name}' ya existe.")
-            response = input("   ¿Desea recrearla? (s/n): ")
+            if sys.stdin.isatty():
+                response = input("   ¿Desea recrearla? (s/n): ")
+            else:
+                response = os.environ.get('RECREATE_DB', 'n')
             if response.lower() == 's':
                 print(f"   Eliminando base de datos '{db_name}'...")
                 drop_database(db_name, force=True)
@@ -46,79 +147,28 @@ def setup_test_python_database():
         # 3. Crear tablas de ejemplo
         print("\n3. Creando tablas de ejemplo...")
 
-        # Tabla: test_clientes
-        if not table_exists('test_clientes', database=db_name):
-            print("   Creando tabla 'test_clientes'...")
-            create_table(
-                'test_clientes',
-                {
-                    'id': 'INT IDENTITY(1,1)',
-                    'nombre': 'NVARCHAR(100) NOT NULL',
-                    'email': 'NVARCHAR(100)',
-                    'telefono': 'NVARCHAR(20)',
-                    'activo': 'BIT DEFAULT 1',
-                    'fecha_registro': 'DATETIME DEFAULT GETDATE()'
-                },
-                primary_key='id',
-                database=db_name
-            )
-            print("   ✓ Tabla 'test_clientes' creada")
-
-        # Tabla: test_productos
-        if not table_exists('test_productos', database=db_name):
-            print("   Creando tabla 'test_productos'...")
-            create_table(
-                'test_productos',
-                {
-                    'id': 'INT IDENTITY(1,1)',
-                    'codigo': 'NVARCHAR(50) NOT NULL',
-                    'nombre': 'NVARCHAR(100)',
-                    'descripcion': 'NVARCHAR(MAX)',
-                    'precio': 'DECIMAL(18,2)',
-                    'stock': 'INT DEFAULT 0',
-                    'activo': 'BIT DEFAULT 1',
-                    'fecha_creacion': 'DATETIME DEFAULT GETDATE()'
-                },
-                primary_key='id',
-                database=db_name
-            )
-            print("   ✓ Tabla 'test_productos' creada")
-
-        # Tabla: test_ventas
-        if not table_exists('test_ventas', database=db_name):
-            print("   Creando tabla 'test_ventas'...")
-            create_table(
-                'test_ventas',
-                {
-                    'id': 'INT IDENTITY(1,1)',
-                    'cliente_id': 'INT',
-                    'producto_id': 'INT',
-                    'cantidad': 'INT NOT NULL',
-                    'precio_unitario': 'DECIMAL(18,2)',
-                    'total': 'DECIMAL(18,2)',
-                    'fecha_venta': 'DATETIME DEFAULT GETDATE()'
-                },
-                primary_key='id',
-                database=db_name
-            )
-            print("   ✓ Tabla 'test_ventas' creada")
-
-        print("\n" + "=" * 80)
+        if parallel_table_creation and len(TEST_TABLES) > 1:
+            create_tables_parallel(TEST_TABLES, db_name)
+        else:
+            execute_ddl(build_create_tables_script(TEST_TABLES), database=db_name)
+            for table in TEST_TABLES:
+                print(f"   ✓ Tabla '{table}' lista")
+
+        print("\n" + BAR)
         print(f"✓ BASE DE DATOS '{db_name}' CONFIGURADA EXITOSAMENTE")
-        print("=" * 80)
+        print(BAR)
         print("\nTablas creadas:")
         print("  - test_clientes   (para pruebas de clientes)")
         print("  - test_productos  (para pruebas de productos)")
         print("  - test_ventas     (para pruebas de ventas)")
         print("\nPuedes ejecutar los tests con:")
         print("  docker exec api-mcp python /app/mssql/run_all_tests.py")
-        print("=" * 80 + "\n")
+        print(BAR + "\n")
 
         return True
 
     except Exception as e:
         print(f"\n❌ Error configurando la base de datos: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -127,9 +177,9 @@ def show_database_info():
     """Muestra información de la base de datos test_python."""
     db_name = 'test_python'
 
-    print("\n" + "=" * 80)
+    print("\n" + BAR)
     print(f"INFORMACIÓN DE LA BASE DE DATOS: {db_name}")
-    print("=" * 80)
+    print(BAR)
 
     try:
         if not database_exists(db_name):
@@ -137,45 +187,53 @@ def show_database_info():
             print("   Ejecuta este script para crearla.")
             return
 
-        from mssql import execute_query, get_table_columns
-
-        # Listar tablas
-        tables = execute_query("""
-            SELECT TABLE_NAME
-            FROM INFORMATION_SCHEMA.TABLES
-            WHERE TABLE_TYPE = 'BASE TABLE'
-            ORDER BY TABLE_NAME
+        from mssql import execute_query
+
+        # Tablas con sus columnas anidadas, armadas por el servidor como JSON
+        rows = execute_query("""
+            SELECT
+                t.TABLE_NAME AS name,
+                (
+                    SELECT c.COLUMN_NAME AS name, c.DATA_TYPE AS type, c.IS_NULLABLE AS nullable
+                    FROM INFORMATION_SCHEMA.COLUMNS c
+                    WHERE c.TABLE_SCHEMA = t.TABLE_SCHEMA AND c.TABLE_NAME = t.TABLE_NAME
+                    ORDER BY c.ORDINAL_POSITION
+                    FOR JSON PATH
+                ) AS columns
+            FROM INFORMATION_SCHEMA.TABLES t
+            WHERE t.TABLE_TYPE = 'BASE TABLE'
+            ORDER BY t.TABLE_NAME
+            FOR JSON PATH
         """, database=db_name)
 
+        # SQL Server parte el JSON largo en varias filas de ~2000 caracteres
+        tables = json.loads(''.join(row[0] or '' for row in rows) or '[]')
+
         print(f"\nTablas en '{db_name}':")
         for table in tables:
-            print(f"  - {table[0]}")
-
-            # Mostrar columnas de cada tabla
-            columns = get_table_columns(table[0], database=db_name)
+            columns = table.get('columns', [])
+            print(f"  - {table['name']}")
             print(f"    Columnas ({len(columns)}):")
             for col in columns:
-                nullable = "NULL" if col['is_nullable'] else "NOT NULL"
+                nullable = "NULL" if col['nullable'] == 'YES' else "NOT NULL"
                 print(f"      • {col['name']}: {col['type']} {nullable}")
             print()
 
-        print("=" * 80 + "\n")
+        print(BAR + "\n")
 
     except Exception as e:
         print(f"\n❌ Error obteniendo información: {e}")
-        import traceback
         traceback.print_exc()
 
 
 if __name__ == "__main__":
-    import sys
-
     if len(sys.argv) > 1 and sys.argv[1] == 'info':
         # Modo información
         show_database_info()
     else:
         # Modo setup
-        if setup_test_python_database():
+        parallel = os.getenv('MSSQL_TESTS_PARALLEL') == '1'
+        if setup_test_python_database(parallel_table_creation=parallel):
             # Mostrar información después de crear
             show_database_info()
             sys.exit(0)
@@ -1,42 +1,87 @@
 """
 Script de pruebas para el módulo MSSQL.
 Ejecuta tests de DML, DDL y DCL usando la base de datos 'test_python'.
+
+Variables de entorno (sin terminal interactiva no se pregunta nada):
+    RUN_DCL_TESTS=1   Ejecutar los tests DCL (requieren permisos admin)
+    MSSQL_TEST_SNAPSHOT_DIR   Directorio del servidor para el snapshot (default: /tmp)
+    DML_BATCH_SIZE=N  Filas que inserta INSERT_MANY (default: 3), por ejemplo
+                      DML_BATCH_SIZE=1000 python test_mssql.py
 """
 import sys
 import os
+import hashlib
+import contextvars
 import traceback
+from itertools import islice
 from typing import Callable
 
 # Agregar el directorio padre al path para poder importar mssql
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Cachear database_exists/table_exists durante la corrida (ver mssql/_cache.py)
+os.environ.setdefault('MSSQL_CACHE_TTL', '60')
+
+# Filas generadas para INSERT_MANY (subirlo para medir el envío por lotes)
+DML_BATCH_ROWS = int(os.environ.get('DML_BATCH_SIZE', '3'))
+
+from mssql import (
+    # DML
+    get_mssql_connection,
+    insert, insert_many,
+    select, select_one, exists,
+    update, delete, count, upsert, execute_query,
+    # DDL
+    database_exists, create_database, drop_database,
+    table_exists, create_table,
+    create_index, execute_ddl,
+    get_table_columns, truncate_table,
+    # DCL
+    login_exists, create_login, drop_login,
+    user_exists, create_user, drop_user,
+    grant_permission, get_user_permissions,
+    add_user_to_role, get_user_roles,
+    # Conexiones
+    get_active_connections, get_connection_count,
+    get_connection_counts_by_database, kill_all_connections,
+    # Sesión
+    mssql_session
+)
+from mssql.mssql_dml import _close_idle_connections
+
+# Separador de los banners
+BAR = "=" * 80
+
 
 class TestResult:
+    """Acumula los resultados y los escribe de una sola vez en summary()."""
+
     def __init__(self):
         self.passed = 0
         self.failed = 0
         self.errors = []
+        self._lines = []
 
     def record_pass(self, test_name: str):
         self.passed += 1
-        print(f"  ✓ {test_name}")
+        self._lines.append(f"  ✓ {test_name}\n")
 
     def record_fail(self, test_name: str, error: str):
         self.failed += 1
         self.errors.append((test_name, error))
-        print(f"  ✗ {test_name}: {error}")
+        self._lines.append(f"  ✗ {test_name}: {error}\n")
 
     def summary(self):
         total = self.passed + self.failed
-        print("\n" + "=" * 80)
-        print(f"RESUMEN: {self.passed}/{total} pruebas exitosas")
+        lines = self._lines + ["\n" + BAR + "\n", f"RESUMEN: {self.passed}/{total} pruebas exitosas\n"]
         if self.errors:
-            print(f"\n❌ {self.failed} pruebas fallidas:")
-            for test_name, error in self.errors:
-                print(f"  - {test_name}: {error}")
+            lines.append(f"\n❌ {self.failed} pruebas fallidas:\n")
+            lines.extend(f"  - {test_name}: {error}\n" for test_name, error in self.errors)
         else:
-            print("\n✓ Todas las pruebas pasaron exitosamente")
-        print("=" * 80)
+            lines.append("\n✓ Todas las pruebas pasaron exitosamente\n")
+        lines.append(BAR + "\n")
+        sys.stdout.write("".join(lines))
+        sys.stdout.flush()
 
 
 def run_test(func: Callable, test_name: str, result: TestResult):
@@ -50,23 +95,61 @@ def run_test(func: Callable, test_name: str, result: TestResult):
         return False
 
 
+def run_read_batch(checks: list, test_db: str, result: TestResult):
+    """
+    Ejecuta varias consultas de lectura en un solo round-trip y valida cada
+    result set con su función, registrando un resultado por consulta.
+
+    Args:
+        checks: Lista de tuplas (nombre_test, sql, params, check(rows))
+        test_db: Base de datos de pruebas
+        result: TestResult donde se registran los resultados
+    """
+    batch_sql = ";\n".join(sql for _, sql, _, _ in checks)
+    params = tuple(param for _, _, query_params, _ in checks for param in query_params)
+
+    conn = get_mssql_connection(test_db)
+    cursor = conn.cursor()
+    try:
+        try:
+            cursor.execute(batch_sql, params)
+        except Exception as e:
+            for test_name, _, _, _ in checks:
+                result.record_fail(test_name, f"Error ejecutando el batch: {e}")
+            return
+
+        for test_name, _, _, check in checks:
+            try:
+                check(cursor.fetchall())
+                result.record_pass(test_name)
+            except Exception as e:
+                result.record_fail(test_name, str(e))
+            cursor.nextset()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def run_in_session(test_func: Callable, test_db: str = 'test_python'):
+    """
+    Ejecuta una categoría de tests con una sola conexión a test_db, de modo
+    que las consultas repetidas reutilizan sus cursores preparados.
+    """
+    with mssql_session(test_db):
+        return test_func(test_db)
+
+
 # ============================================================================
 # TESTS DML
 # ============================================================================
 
-def test_dml():
+def test_dml(test_db: str = 'test_python'):
     """Tests de Data Manipulation Language."""
-    print("\n" + "=" * 80)
+    print("\n" + BAR)
     print("TESTS DML - DATA MANIPULATION LANGUAGE")
-    print("=" * 80)
-
-    from mssql import (
-        insert, insert_many, select, select_one,
-        update, delete, exists, count, upsert
-    )
+    print(BAR)
 
     result = TestResult()
-    test_db = 'test_python'
 
     # Test INSERT
     def test_insert():
@@ -81,75 +164,91 @@ def test_dml():
     # Test INSERT_MANY
     def test_insert_many():
         datos = [
-            ('Test Cliente 2', 'test2@email.com', '5552222222'),
-            ('Test Cliente 3', 'test3@email.com', '5553333333'),
-            ('Test Cliente 4', 'test4@email.com', '5554444444')
+            (f'Test Cliente {i}', f'test{i}@email.com', f'555{i:07d}')
+            for i in range(2, 2 + DML_BATCH_ROWS)
         ]
-        total = insert_many(
+        # Registro base para el test de UPSERT
+        datos.append(('Test Upsert Original', 'upsert_test@email.com', '5558888888'))
+        # OUTPUT INSERTED.id confirma la inserción sin un COUNT posterior
+        insertados = insert_many(
             'test_clientes',
             ['nombre', 'email', 'telefono'],
             datos,
+            returning=('id',),
             database=test_db
         )
-        # pyodbc a veces retorna -1 con executemany, verificar que retorne algo
-        assert total != 0, f"insert_many debe retornar un valor, retornó {total}"
-        # Verificar que los registros se insertaron consultando
-        from mssql import count
-        total_registros = count('test_clientes', database=test_db)
-        assert total_registros >= 4, f"Debe haber al menos 4 registros después de insert_many, hay {total_registros}"
+        assert len(insertados) == len(datos), f"insert_many debe retornar {len(datos)} filas, retornó {len(insertados)}"
+        assert all(fila.id is not None for fila in insertados), "Cada fila debe tener su id generado"
 
     run_test(test_insert_many, "INSERT_MANY - Inserción masiva", result)
 
-    # Test SELECT
-    def test_select():
-        registros = select('test_clientes', database=test_db)
-        assert len(registros) >= 4, f"Se esperaban al menos 4 registros, se obtuvieron {len(registros)}"
+    # Tests de lectura (SELECT, SELECT filtrado, SELECT_ONE, EXISTS, COUNT)
+    # en un solo batch: cada result set se valida y registra por separado
+    def check_select(rows):
+        assert len(rows) >= 4, f"Se esperaban al menos 4 registros, se obtuvieron {len(rows)}"
 
-    run_test(test_select, "SELECT - Consultar registros", result)
+    def check_select_filtered(rows):
+        assert len(rows) >= 1, "Debe haber al menos 1 registro activo"
 
-    # Test SELECT con filtros
-    def test_select_filtered():
-        registros = select(
-            'test_clientes',
-            where='activo = ?',
-            where_params=(1,),
-            database=test_db
-        )
-        assert len(registros) >= 1, "Debe haber al menos 1 registro activo"
+    def check_select_one(rows):
+        assert rows, "Debe encontrar el registro"
+        assert rows[0].nombre == 'Test Cliente 1', "El nombre debe coincidir"
 
-    run_test(test_select_filtered, "SELECT - Con filtros", result)
+    def check_exists(rows):
+        assert rows[0][0] == 1, "El registro debe existir"
 
-    # Test SELECT_ONE
-    def test_select_one():
-        registro = select_one(
-            'test_clientes',
-            where='nombre = ?',
-            where_params=('Test Cliente 1',),
-            database=test_db
-        )
-        assert registro is not None, "Debe encontrar el registro"
-        assert registro.nombre == 'Test Cliente 1', "El nombre debe coincidir"
+    def check_count(rows):
+        total = rows[0][0]
+        assert total >= 4, f"Debe haber al menos 4 registros, hay {total}"
 
-    run_test(test_select_one, "SELECT_ONE - Consultar un registro", result)
+    lecturas = [
+        ("SELECT - Consultar registros",
+         "SELECT * FROM test_clientes", (), check_select),
+        ("SELECT - Con filtros",
+         "SELECT * FROM test_clientes WHERE activo = ?", (1,), check_select_filtered),
+        ("SELECT_ONE - Consultar un registro",
+         "SELECT TOP 1 * FROM test_clientes WHERE nombre = ?", ('Test Cliente 1',), check_select_one),
+        ("EXISTS - Verificar existencia",
+         "SELECT CASE WHEN EXISTS (SELECT 1 FROM test_clientes WHERE email = ?) THEN 1 ELSE 0 END",
+         ('test1@email.com',), check_exists),
+        ("COUNT - Contar registros",
+         "SELECT COUNT(*) FROM test_clientes", (), check_count),
+    ]
+    run_read_batch(lecturas, test_db, result)
+
+    # Las mismas lecturas con las funciones del paquete
+    def test_select():
+        rows = select('test_clientes', where='activo = ?', where_params=(1,),
+                      order_by='id', limit=10, database=test_db)
+        assert len(rows) >= 1, "Debe haber al menos 1 registro activo"
 
-    # Test EXISTS
-    def test_exists():
-        existe = exists(
-            'test_clientes',
-            where='email = ?',
-            where_params=('test1@email.com',),
-            database=test_db
-        )
-        assert existe, "El registro debe existir"
+    run_test(test_select, "SELECT (función) - Consultar registros", result)
 
-    run_test(test_exists, "EXISTS - Verificar existencia", result)
+    def test_select_one():
+        row = select_one('test_clientes', columns=['nombre', 'email'],
+                         where='nombre = ?', where_params=('Test Cliente 1',), database=test_db)
+        assert row is not None and row.email == 'test1@email.com', "Debe encontrar el registro"
+
+    run_test(test_select_one, "SELECT_ONE (función) - Consultar un registro", result)
+
+    def test_select_one_pool():
+        # Contexto vacío: fuera de la sesión de run_in_session, select_one usa
+        # su pool; la segunda llamada reutiliza la conexión de la primera
+        for _ in range(2):
+            row = contextvars.Context().run(
+                select_one, 'test_clientes', ['nombre'], 'nombre = ?', ('Test Cliente 1',), test_db
+            )
+            assert row is not None and row.nombre == 'Test Cliente 1', "Debe encontrar el registro"
 
-    # Test COUNT
-    def test_count():
-        total = count('test_clientes', database=test_db)
-        assert total >= 4, f"Debe haber al menos 4 registros, hay {total}"
+    run_test(test_select_one_pool, "SELECT_ONE (pool) - Reutilizar conexión", result)
 
-    run_test(test_count, "COUNT - Contar registros", result)
+    def test_exists():
+        assert exists('test_clientes', 'email = ?', ('test1@email.com',), database=test_db), \
+            "El registro debe existir"
+        assert not exists('test_clientes', 'email = ?', ('no_existe@email.com',), database=test_db), \
+            "El registro no debe existir"
+
+    run_test(test_exists, "EXISTS (función) - Verificar existencia", result)
 
     # Test UPDATE
     def test_update():
@@ -166,14 +265,7 @@ def test_dml():
 
     # Test UPSERT (INSERT) - Sin especificar ID para evitar problema con IDENTITY
     def test_upsert_insert():
-        # Primero insertar sin upsert para tener un email único
-        insert('test_clientes', {
-            'nombre': 'Test Upsert Original',
-            'email': 'upsert_test@email.com',
-            'telefono': '5558888888'
-        }, database=test_db)
-
-        # Ahora hacer upsert usando email como key
+        # 'upsert_test@email.com' se insertó en test_insert_many; upsert usando email como key
         rowcount, operation = upsert(
             'test_clientes',
             data={
@@ -209,21 +301,13 @@ def test_dml():
 # TESTS DDL
 # ============================================================================
 
-def test_ddl():
+def test_ddl(test_db: str = 'test_python'):
     """Tests de Data Definition Language."""
-    print("\n" + "=" * 80)
+    print("\n" + BAR)
     print("TESTS DDL - DATA DEFINITION LANGUAGE")
-    print("=" * 80)
-
-    from mssql import (
-        database_exists, create_database, drop_database,
-        table_exists, create_table, drop_table,
-        create_index, drop_index, execute_ddl,
-        get_table_columns, truncate_table
-    )
+    print(BAR)
 
     result = TestResult()
-    test_db = 'test_python'
 
     # Test DATABASE_EXISTS
     def test_database_exists():
@@ -239,90 +323,85 @@ def test_ddl():
 
     run_test(test_table_exists, "TABLE_EXISTS - Verificar tabla", result)
 
-    # Test CREATE_TABLE (nueva)
-    def test_create_table():
-        created = create_table(
-            'test_productos',
-            {
-                'id': 'INT IDENTITY(1,1)',
-                'codigo': 'NVARCHAR(50) NOT NULL',
-                'nombre': 'NVARCHAR(100)',
-                'precio': 'DECIMAL(18,2)',
-                'activo': 'BIT DEFAULT 1'
-            },
-            primary_key='id',
-            database=test_db
-        )
-        assert created, "La tabla debe crearse exitosamente"
-
-    run_test(test_create_table, "CREATE_TABLE - Crear tabla", result)
-
-    # Test GET_TABLE_COLUMNS
-    def test_get_table_columns():
-        columnas = get_table_columns('test_productos', database=test_db)
-        assert len(columnas) >= 5, f"Debe haber al menos 5 columnas, hay {len(columnas)}"
-        nombres = [c['name'] for c in columnas]
-        assert 'id' in nombres, "Debe existir columna 'id'"
-        assert 'nombre' in nombres, "Debe existir columna 'nombre'"
-
-    run_test(test_get_table_columns, "GET_TABLE_COLUMNS - Estructura", result)
-
-    # Test CREATE_INDEX
-    def test_create_index():
-        created = create_index(
-            'test_productos',
-            'idx_codigo',
-            'codigo',
-            database=test_db
-        )
-        assert created, "El índice debe crearse exitosamente"
-
-    run_test(test_create_index, "CREATE_INDEX - Crear índice", result)
-
-    # Test EXECUTE_DDL (crear vista)
-    def test_execute_ddl():
-        execute_ddl('''
-            CREATE OR ALTER VIEW vw_test_productos_activos AS
-            SELECT id, codigo, nombre, precio
-            FROM test_productos
-            WHERE activo = 1
-        ''', database=test_db)
-
-    run_test(test_execute_ddl, "EXECUTE_DDL - DDL personalizado", result)
-
-    # Test TRUNCATE_TABLE (necesita datos primero)
-    def test_truncate_table():
-        from mssql import insert
-        # Insertar datos de prueba
-        insert('test_productos', {
-            'codigo': 'PROD001',
-            'nombre': 'Producto Test',
-            'precio': 100.00
-        }, database=test_db)
-
-        # Truncar
-        truncate_table('test_productos', database=test_db)
-
-        # Verificar que está vacía
-        from mssql import count
-        total = count('test_productos', database=test_db)
-        assert total == 0, f"La tabla debe estar vacía, tiene {total} registros"
+    # Los tests de creación corren en una transacción que se revierte al
+    # final: el rollback deshace tabla, índice y vista sin DROPs explícitos
+    with mssql_session(test_db, rollback=True):
+        # Test CREATE_TABLE (nueva)
+        def test_create_table():
+            created = create_table(
+                'test_productos',
+                {
+                    'id': 'INT IDENTITY(1,1)',
+                    'codigo': 'NVARCHAR(50) NOT NULL',
+                    'nombre': 'NVARCHAR(100)',
+                    'precio': 'DECIMAL(18,2)',
+                    'activo': 'BIT DEFAULT 1'
+                },
+                primary_key='id',
+                database=test_db
+            )
+            assert created, "La tabla debe crearse exitosamente"
+
+        run_test(test_create_table, "CREATE_TABLE - Crear tabla", result)
+
+        # Test GET_TABLE_COLUMNS
+        def test_get_table_columns():
+            columnas = get_table_columns('test_productos', database=test_db)
+            assert len(columnas) >= 5, f"Debe haber al menos 5 columnas, hay {len(columnas)}"
+            nombres = [c['name'] for c in columnas]
+            assert 'id' in nombres, "Debe existir columna 'id'"
+            assert 'nombre' in nombres, "Debe existir columna 'nombre'"
+
+        run_test(test_get_table_columns, "GET_TABLE_COLUMNS - Estructura", result)
+
+        # Test CREATE_INDEX
+        def test_create_index():
+            created = create_index(
+                'test_productos',
+                'idx_codigo',
+                'codigo',
+                database=test_db
+            )
+            assert created, "El índice debe crearse exitosamente"
+
+        run_test(test_create_index, "CREATE_INDEX - Crear índice", result)
+
+        # Test EXECUTE_DDL (crear vista)
+        def test_execute_ddl():
+            execute_ddl('''
+                CREATE OR ALTER VIEW vw_test_productos_activos AS
+                SELECT id, codigo, nombre, precio
+                FROM test_productos
+                WHERE activo = 1
+            ''', database=test_db)
+
+        run_test(test_execute_ddl, "EXECUTE_DDL - DDL personalizado", result)
+
+        # Test TRUNCATE_TABLE (necesita datos primero)
+        def test_truncate_table():
+            # Insertar datos de prueba en un solo lote
+            insert_many(
+                'test_productos',
+                ['codigo', 'nombre', 'precio'],
+                [('PROD001', 'Producto Test', 100.00), ('PROD002', 'Producto Test 2', 200.00)],
+                database=test_db
+            )
 
-    run_test(test_truncate_table, "TRUNCATE_TABLE - Vaciar tabla", result)
+            # Truncar
+            truncate_table('test_productos', database=test_db)
 
-    # Test DROP_INDEX
-    def test_drop_index():
-        deleted = drop_index('test_productos', 'idx_codigo', database=test_db)
-        assert deleted, "El índice debe eliminarse exitosamente"
+            # Verificar que está vacía
+            total = count('test_productos', database=test_db)
+            assert total == 0, f"La tabla debe estar vacía, tiene {total} registros"
 
-    run_test(test_drop_index, "DROP_INDEX - Eliminar índice", result)
+        run_test(test_truncate_table, "TRUNCATE_TABLE - Vaciar tabla", result)
 
-    # Test DROP_TABLE
-    def test_drop_table():
-        deleted = drop_table('test_productos', database=test_db)
-        assert deleted, "La tabla debe eliminarse exitosamente"
+    # Test ROLLBACK (la tabla creada en la transacción ya no existe)
+    def test_rollback_cleanup():
+        existe = table_exists('test_productos', database=test_db)
+        assert not existe, "La tabla 'test_productos' no debe existir tras el rollback"
 
-    run_test(test_drop_table, "DROP_TABLE - Eliminar tabla", result)
+    run_test(test_rollback_cleanup, "ROLLBACK - Revertir DDL", result)
 
     result.summary()
     return result.failed == 0
@@ -332,22 +411,14 @@ def test_ddl():
 # TESTS DCL
 # ============================================================================
 
-def test_dcl():
+def test_dcl(test_db: str = 'test_python'):
     """Tests de Data Control Language."""
-    print("\n" + "=" * 80)
+    print("\n" + BAR)
     print("TESTS DCL - DATA CONTROL LANGUAGE")
-    print("=" * 80)
+    print(BAR)
     print("⚠️  Requiere permisos de administrador\n")
 
-    from mssql import (
-        login_exists, create_login, drop_login,
-        user_exists, create_user, drop_user,
-        grant_permission, get_user_permissions,
-        create_role, add_user_to_role, get_user_roles
-    )
-
     result = TestResult()
-    test_db = 'test_python'
 
     # Test CREATE_LOGIN
     def test_create_login():
@@ -426,21 +497,13 @@ def test_dcl():
 # TESTS GESTIÓN DE CONEXIONES
 # ============================================================================
 
-def test_connections():
+def test_connections(test_db: str = 'test_python'):
     """Tests de gestión de conexiones."""
-    print("\n" + "=" * 80)
+    print("\n" + BAR)
     print("TESTS GESTIÓN DE CONEXIONES")
-    print("=" * 80)
-
-    from mssql import (
-        get_active_connections,
-        get_connection_count,
-        kill_connection,
-        kill_all_connections
-    )
+    print(BAR)
 
     result = TestResult()
-    test_db = 'test_python'
 
     # Test GET_ACTIVE_CONNECTIONS (todas)
     def test_get_active_connections_all():
@@ -457,7 +520,7 @@ def test_connections():
     # Test GET_ACTIVE_CONNECTIONS (por BD)
     def test_get_active_connections_db():
         conexiones = get_active_connections(database=test_db)
-        # Puede o no haber conexiones a 'test_python'
+        # Puede o no haber conexiones a la BD de prueba
         assert isinstance(conexiones, list), "Debe retornar una lista"
 
     run_test(test_get_active_connections_db, "GET_ACTIVE_CONNECTIONS - Por BD", result)
@@ -478,8 +541,6 @@ def test_connections():
 
     # Test KILL_ALL_CONNECTIONS (BD de prueba)
     def test_kill_all_connections():
-        from mssql import database_exists, create_database, drop_database
-
         test_conn_db = 'test_connections_kill'
 
         try:
@@ -509,18 +570,12 @@ def test_connections():
     # Test monitoreo de conexiones (informativo)
     print("\n  ℹ️  Información de conexiones actuales:")
     try:
-        total = get_connection_count()
-        print(f"      Total de conexiones en el servidor: {total}")
-
-        # Agrupar por base de datos
-        conexiones = get_active_connections()
-        db_counts = {}
-        for conn in conexiones:
-            db = conn['database_name'] or 'NULL'
-            db_counts[db] = db_counts.get(db, 0) + 1
+        # Conteo agrupado en el servidor: una sola consulta
+        db_counts = get_connection_counts_by_database()
+        print(f"      Total de conexiones en el servidor: {sum(db_counts.values())}")
 
         print("      Conexiones por base de datos:")
-        for db, count in sorted(db_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
+        for db, count in islice(db_counts.items(), 5):
             print(f"        - {db}: {count}")
     except Exception as e:
         print(f"      Error obteniendo información: {e}")
@@ -533,52 +588,110 @@ def test_connections():
 # SETUP Y TEARDOWN
 # ============================================================================
 
-def setup_test_environment():
-    """Configura el ambiente de pruebas."""
-    print("\n" + "=" * 80)
-    print("CONFIGURACIÓN DEL AMBIENTE DE PRUEBAS")
-    print("=" * 80)
+# Estado inicial de las pruebas: test_clientes vacía
+TEST_TABLES_DDL = """
+    IF EXISTS (SELECT 1 FROM sys.tables WHERE name = 'test_clientes')
+        TRUNCATE TABLE test_clientes
+    ELSE
+        CREATE TABLE test_clientes (
+            id INT IDENTITY(1,1),
+            nombre NVARCHAR(100) NOT NULL,
+            email NVARCHAR(100),
+            telefono NVARCHAR(20),
+            activo BIT DEFAULT 1,
+            fecha_registro DATETIME DEFAULT GETDATE(),
+            PRIMARY KEY (id)
+        )
+"""
+
+# Directorio del servidor SQL Server donde se guardan los snapshots (.bak)
+SNAPSHOT_DIR = os.getenv('MSSQL_TEST_SNAPSHOT_DIR', '/tmp')
 
-    from mssql import (
-        database_exists, create_database, drop_database,
-        table_exists, create_table
+
+def snapshot_path(test_db: str) -> str:
+    """
+    Ruta del respaldo de test_db. Incluye un hash de TEST_TABLES_DDL para que
+    un cambio de esquema invalide los snapshots anteriores.
+    """
+    fingerprint = hashlib.sha1(TEST_TABLES_DDL.encode()).hexdigest()[:12]
+    return f"{SNAPSHOT_DIR}/{test_db}_{fingerprint}.bak"
+
+
+def backup_test_snapshot(test_db: str):
+    """Respalda test_db en snapshot_path() (sobrescribe el anterior)."""
+    execute_ddl(
+        f"BACKUP DATABASE [{test_db}] TO DISK = N'{snapshot_path(test_db)}' WITH INIT",
+        database='master',
+        autocommit=True
     )
 
-    test_db = 'test_python'
+
+def restore_test_snapshot(test_db: str) -> bool:
+    """
+    Restaura test_db desde su snapshot si el servidor tiene registro de él.
+
+    Returns:
+        True si se restauró, False si no hay snapshot o la restauración falló
+    """
+    path = snapshot_path(test_db)
+    try:
+        respaldos = execute_query("""
+            SELECT COUNT(*)
+            FROM msdb.dbo.backupset b
+            JOIN msdb.dbo.backupmediafamily f ON f.media_set_id = b.media_set_id
+            WHERE b.database_name = ? AND f.physical_device_name = ?
+        """, params=(test_db, path), database='master')
+        if not respaldos[0][0]:
+            return False
+
+        # SINGLE_USER mata las conexiones inactivas del pool de select_one
+        _close_idle_connections(test_db)
+        execute_ddl(f"""
+            IF DB_ID(N'{test_db}') IS NOT NULL
+                ALTER DATABASE [{test_db}] SET SINGLE_USER WITH ROLLBACK IMMEDIATE;
+            RESTORE DATABASE [{test_db}] FROM DISK = N'{path}' WITH REPLACE;
+            ALTER DATABASE [{test_db}] SET MULTI_USER;
+        """, database='master', autocommit=True)
+        return True
+    except Exception as e:
+        print(f"   ⚠️  No se pudo restaurar el snapshot ({e}), configurando desde cero")
+        return False
+
+
+def setup_test_environment(test_db: str = 'test_python'):
+    """Configura el ambiente de pruebas en la base de datos test_db."""
+    print("\n" + BAR)
+    print("CONFIGURACIÓN DEL AMBIENTE DE PRUEBAS")
+    print(BAR)
 
     try:
+        # Restaurar el snapshot de una corrida anterior si existe
+        if restore_test_snapshot(test_db):
+            print(f"\n✓ Base de datos '{test_db}' restaurada desde {snapshot_path(test_db)}")
+            return True
+
         # Crear BD si no existe
-        print("\n1. Verificando base de datos 'test_python'...")
+        print(f"\n1. Verificando base de datos '{test_db}'...")
         if not database_exists(test_db):
-            print("   Creando base de datos 'test_python'...")
+            print(f"   Creando base de datos '{test_db}'...")
             create_database(test_db)
             print("   ✓ Base de datos creada")
         else:
             print("   ✓ Base de datos ya existe")
 
-        # Crear tabla test_clientes
-        print("\n2. Verificando tabla 'test_clientes'...")
-        if table_exists('test_clientes', database=test_db):
-            print("   Tabla ya existe, limpiando...")
-            from mssql import truncate_table
-            truncate_table('test_clientes', database=test_db)
-        else:
-            print("   Creando tabla 'test_clientes'...")
-            create_table(
-                'test_clientes',
-                {
-                    'id': 'INT IDENTITY(1,1)',
-                    'nombre': 'NVARCHAR(100) NOT NULL',
-                    'email': 'NVARCHAR(100)',
-                    'telefono': 'NVARCHAR(20)',
-                    'activo': 'BIT DEFAULT 1',
-                    'fecha_registro': 'DATETIME DEFAULT GETDATE()'
-                },
-                primary_key='id',
-                database=test_db
-            )
+        # Crear o limpiar tabla test_clientes en un solo batch
+        print("\n2. Preparando tabla 'test_clientes'...")
+        execute_ddl(TEST_TABLES_DDL, database=test_db)
         print("   ✓ Tabla lista")
 
+        # Guardar snapshot para las siguientes corridas
+        print("\n3. Guardando snapshot...")
+        try:
+            backup_test_snapshot(test_db)
+            print(f"   ✓ Snapshot en {snapshot_path(test_db)}")
+        except Exception as e:
+            print(f"   ⚠️  No se pudo guardar el snapshot: {e}")
+
         print("\n✓ Ambiente de pruebas configurado correctamente")
         return True
 
@@ -618,21 +731,26 @@ Servidor: mssql-api-mcp
 
     try:
         # DML Tests
-        if not test_dml():
+        if not run_in_session(test_dml):
             all_passed = False
 
-        # DDL Tests
-        if not test_ddl():
+        # DDL Tests (sobre el snapshot limpio)
+        restore_test_snapshot('test_python')
+        if not run_in_session(test_ddl):
             all_passed = False
 
         # Gestión de Conexiones Tests
-        if not test_connections():
+        if not run_in_session(test_connections):
             all_passed = False
 
         # DCL Tests (opcional)
-        response = input("\n¿Ejecutar tests DCL? (requiere permisos admin) (s/n): ")
-        if response.lower() == 's':
-            if not test_dcl():
+        if sys.stdin.isatty():
+            run_dcl = input("\n¿Ejecutar tests DCL? (requiere permisos admin) (s/n): ").lower() == 's'
+        else:
+            run_dcl = os.environ.get('RUN_DCL_TESTS') == '1'
+        if run_dcl:
+            restore_test_snapshot('test_python')
+            if not run_in_session(test_dcl):
                 all_passed = False
         else:
             print("⚠️  Tests DCL omitidos")
@@ -643,12 +761,12 @@ Servidor: mssql-api-mcp
         all_passed = False
 
     # Resumen final
-    print("\n" + "=" * 80)
+    print("\n" + BAR)
     if all_passed:
         print("✓ TODAS LAS PRUEBAS PASARON EXITOSAMENTE")
     else:
         print("❌ ALGUNAS PRUEBAS FALLARON - Revisar logs arriba")
-    print("=" * 80)
+    print(BAR)
 
     sys.exit(0 if all_passed else 1)
 
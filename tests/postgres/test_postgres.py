@@ -3,20 +3,35 @@ Script de pruebas para el módulo PostgreSQL.
 
 Este script prueba las funcionalidades básicas del módulo postgres.
 """
+import os
+
 from paquetes.postgres import (
-    get_postgres_connection,
-    ping, database_exists, table_exists,
-    create_table, insert, select, update, delete
+    get_postgres_connection, release_postgres_connection, postgres_session,
+    database_exists, table_exists,
+    create_table, insert_many, select, update, delete
 )
 
+# Registros insertados en un solo INSERT multi-fila
+NUM_EMPRESAS = 50
+
+# VERBOSE=0 omite el detalle de cada paso y deja solo errores y resumen
+# (menos escrituras a stdout en CI)
+VERBOSE = os.getenv('VERBOSE', '1') != '0'
+
+
+def log(mensaje):
+    """Imprime el detalle de un paso solo si VERBOSE está activo."""
+    if VERBOSE:
+        print(mensaje)
+
 
 def test_conexion():
     """Prueba la conexión a PostgreSQL."""
-    print("\n=== TEST: Conexión a PostgreSQL ===")
+    log("\n=== TEST: Conexión a PostgreSQL ===")
     try:
         conn = get_postgres_connection()
-        print("✓ Conexión exitosa")
-        conn.close()
+        log("✓ Conexión exitosa")
+        release_postgres_connection(conn)
         return True
     except Exception as e:
         print(f"✗ Error de conexión: {e}")
@@ -25,52 +40,55 @@ def test_conexion():
 
 def test_operaciones_basicas():
     """Prueba operaciones básicas DML."""
-    print("\n=== TEST: Operaciones Básicas ===")
+    log("\n=== TEST: Operaciones Básicas ===")
 
     try:
-        # Crear tabla de prueba
-        print("Creando tabla de prueba...")
-        create_table(
-            'test_empresas',
-            {
-                'id': 'SERIAL',
-                'codigo': 'VARCHAR(50) UNIQUE NOT NULL',
-                'nombre': 'VARCHAR(200) NOT NULL',
-                'activo': 'BOOLEAN DEFAULT TRUE'
-            },
-            primary_key='id',
-            if_not_exists=True
-        )
-        print("✓ Tabla creada")
-
-        # Insertar
-        print("Insertando registro...")
-        insert('test_empresas', {
-            'codigo': 'TEST001',
-            'nombre': 'Empresa de Prueba',
-            'activo': True
-        })
-        print("✓ Registro insertado")
-
-        # Seleccionar
-        print("Consultando registros...")
-        empresas = select('test_empresas')
-        print(f"✓ Encontradas {len(empresas)} empresas")
-
-        # Actualizar
-        print("Actualizando registro...")
-        update(
-            'test_empresas',
-            {'nombre': 'Empresa Actualizada'},
-            where='codigo = %s',
-            where_params=('TEST001',)
-        )
-        print("✓ Registro actualizado")
-
-        # Eliminar
-        print("Eliminando registro...")
-        delete('test_empresas', where='codigo = %s', where_params=('TEST001',))
-        print("✓ Registro eliminado")
+        # Todos los pasos comparten una conexión del pool y una transacción
+        with postgres_session():
+            # Crear tabla de prueba
+            log("Creando tabla de prueba...")
+            create_table(
+                'test_empresas',
+                {
+                    'id': 'SERIAL',
+                    'codigo': 'VARCHAR(50) UNIQUE NOT NULL',
+                    'nombre': 'VARCHAR(200) NOT NULL',
+                    'activo': 'BOOLEAN DEFAULT TRUE'
+                },
+                primary_key='id',
+                if_not_exists=True
+            )
+            log("✓ Tabla creada")
+
+            # Insertar
+            log("Insertando registros...")
+            insertados = insert_many(
+                'test_empresas',
+                ['codigo', 'nombre', 'activo'],
+                [(f'TEST{i:03d}', f'Empresa de Prueba {i}', True) for i in range(1, NUM_EMPRESAS + 1)]
+            )
+            assert insertados == NUM_EMPRESAS
+            log(f"✓ {insertados} registros insertados")
+
+            # Seleccionar
+            log("Consultando registros...")
+            empresas = select('test_empresas')
+            log(f"✓ Encontradas {len(empresas)} empresas")
+
+            # Actualizar
+            log("Actualizando registro...")
+            update(
+                'test_empresas',
+                {'nombre': 'Empresa Actualizada'},
+                where='codigo = %s',
+                where_params=('TEST001',)
+            )
+            log("✓ Registro actualizado")
+
+            # Eliminar
+            log("Eliminando registros...")
+            eliminados = delete('test_empresas', where='codigo LIKE %s', where_params=('TEST%',))
+            log(f"✓ {eliminados} registros eliminados")
 
         return True
     except Exception as e:
@@ -80,9 +98,7 @@ def test_operaciones_basicas():
 
 def main():
     """Ejecuta todas las pruebas."""
-    print("=" * 60)
-    print("PRUEBAS DEL MÓDULO POSTGRESQL")
-    print("=" * 60)
+    print("=" * 60 + "\nPRUEBAS DEL MÓDULO POSTGRESQL\n" + "=" * 60)
 
     resultados = []
 
@@ -93,9 +109,7 @@ def main():
     resultados.append(('Operaciones Básicas', test_operaciones_basicas()))
 
     # Resumen
-    print("\n" + "=" * 60)
-    print("RESUMEN DE PRUEBAS")
-    print("=" * 60)
+    print("\n" + "=" * 60 + "\nRESUMEN DE PRUEBAS\n" + "=" * 60)
 
     exitosas = sum(1 for _, resultado in resultados if resultado)
     total = len(resultados)
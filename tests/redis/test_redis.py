@@ -2,23 +2,59 @@
 Script de pruebas para el módulo Redis.
 
 Este script prueba las funcionalidades básicas del módulo redis.
+
+Las pruebas de funcionalidad usan claves independientes, así que se ejecutan
+de forma concurrente (redis.asyncio + asyncio.gather). Cada una imprime su
+salida completa después de su único round trip para que no se intercale.
+Las funciones síncronas del paquete se prueban aparte, después de las
+concurrentes, con claves propias (test:pkg:*).
 """
+import asyncio
+import json
+import os
+
 from paquetes.redis import (
-    ping, set_value, get_value, delete_keys,
+    ping, get_async_redis_connection,
+    set_value, get_value, delete_keys, mset, mget,
     cache_set, cache_get, cache_delete,
-    hset, hget, hgetall,
+    hset, hset_multi, hget, hgetall,
     lpush, rpush, lpop, lrange,
     sadd, smembers, scard,
     incr, decr
 )
 
+# VERBOSE=0 omite el detalle de cada paso y deja solo errores y resumen
+# (menos escrituras a stdout en CI)
+VERBOSE = os.getenv('VERBOSE', '1') != '0'
+
+
+def log(mensaje):
+    """Imprime el detalle de un paso solo si VERBOSE está activo."""
+    if VERBOSE:
+        print(mensaje)
+
+
+async def ejecutar_pipeline(client, titulo, encolar):
+    """
+    Ejecuta los comandos que encolar(pipe) agrega en un solo round trip.
+
+    El título se imprime después del único await, para que la salida de las
+    pruebas concurrentes no se intercale.
+    """
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            encolar(pipe)
+            return await pipe.execute()
+    finally:
+        log(titulo)
+
 
 def test_conexion():
     """Prueba la conexión a Redis."""
-    print("\n=== TEST: Conexión a Redis ===")
+    log("\n=== TEST: Conexión a Redis ===")
     try:
         if ping():
-            print("✓ Conexión exitosa")
+            log("✓ Conexión exitosa")
             return True
         else:
             print("✗ No se pudo conectar a Redis")
@@ -28,29 +64,27 @@ def test_conexion():
         return False
 
 
-def test_operaciones_basicas():
+async def test_operaciones_basicas(client):
     """Prueba operaciones básicas con strings."""
-    print("\n=== TEST: Operaciones Básicas (Strings) ===")
+    titulo = "\n=== TEST: Operaciones Básicas (Strings) ==="
 
     try:
-        # SET y GET
-        print("Estableciendo valor...")
-        set_value('test:nombre', 'Juan Pérez')
-        nombre = get_value('test:nombre')
+        # MSET/MGET, expiración y DELETE en un solo round trip
+        results = await ejecutar_pipeline(client, titulo, lambda pipe: (
+            pipe
+            .mset({'test:nombre': 'Juan Pérez', 'test:temporal': 'Valor temporal'})
+            .expire('test:temporal', 10)
+            .mget(['test:nombre', 'test:temporal'])
+            .delete('test:nombre', 'test:temporal')
+        ))
+
+        nombre, temporal = results[2]
         assert nombre == 'Juan Pérez', "El valor no coincide"
-        print(f"✓ SET/GET: {nombre}")
-
-        # SET con expiración
-        print("Estableciendo valor con TTL...")
-        set_value('test:temporal', 'Valor temporal', ex=10)
-        temporal = get_value('test:temporal')
-        assert temporal == 'Valor temporal'
-        print("✓ SET con expiración")
-
-        # DELETE
-        print("Eliminando clave...")
-        delete_keys('test:nombre', 'test:temporal')
-        print("✓ DELETE")
+        log(f"✓ MSET/MGET: {nombre}")
+        assert results[1] and temporal == 'Valor temporal'
+        log("✓ SET con expiración")
+        assert results[3] == 2
+        log("✓ DELETE")
 
         return True
     except Exception as e:
@@ -58,26 +92,24 @@ def test_operaciones_basicas():
         return False
 
 
-def test_cache():
+async def test_cache(client):
     """Prueba operaciones de caché."""
-    print("\n=== TEST: Operaciones de Caché ===")
+    titulo = "\n=== TEST: Operaciones de Caché ==="
 
     try:
-        # Cache SET
-        print("Guardando en caché...")
-        cache_set('test:cache:productos', {'id': 1, 'nombre': 'Producto 1'}, ttl=60)
-        print("✓ Cache SET")
-
-        # Cache GET
-        print("Obteniendo del caché...")
-        producto = cache_get('test:cache:productos', as_json=True)
+        results = await ejecutar_pipeline(client, titulo, lambda pipe: (
+            pipe
+            .set('test:cache:productos', json.dumps({'id': 1, 'nombre': 'Producto 1'}), ex=60)
+            .get('test:cache:productos')
+            .delete('test:cache:productos')
+        ))
+
+        log("✓ Cache SET")
+        producto = json.loads(results[1])
         assert producto['nombre'] == 'Producto 1'
-        print(f"✓ Cache GET: {producto}")
-
-        # Cache DELETE
-        print("Eliminando del caché...")
-        cache_delete('test:cache:productos')
-        print("✓ Cache DELETE")
+        log(f"✓ Cache GET: {producto}")
+        assert results[2] == 1
+        log("✓ Cache DELETE")
 
         return True
     except Exception as e:
@@ -85,31 +117,25 @@ def test_cache():
         return False
 
 
-def test_hash():
+async def test_hash(client):
     """Prueba operaciones con hashes."""
-    print("\n=== TEST: Operaciones de Hash ===")
+    titulo = "\n=== TEST: Operaciones de Hash ==="
 
     try:
-        # HSET
-        print("Estableciendo campos en hash...")
-        hset('test:usuario:1', 'nombre', 'Juan')
-        hset('test:usuario:1', 'email', 'juan@email.com')
-        hset('test:usuario:1', 'edad', '30')
-        print("✓ HSET")
-
-        # HGET
-        print("Obteniendo campo...")
-        nombre = hget('test:usuario:1', 'nombre')
-        assert nombre == 'Juan'
-        print(f"✓ HGET: {nombre}")
-
-        # HGETALL
-        print("Obteniendo todos los campos...")
-        usuario = hgetall('test:usuario:1')
-        print(f"✓ HGETALL: {usuario}")
-
-        # Limpiar
-        delete_keys('test:usuario:1')
+        results = await ejecutar_pipeline(client, titulo, lambda pipe: (
+            pipe
+            .hset('test:usuario:1', mapping={'nombre': 'Juan', 'email': 'juan@email.com', 'edad': '30'})
+            .hget('test:usuario:1', 'nombre')
+            .hgetall('test:usuario:1')
+            .delete('test:usuario:1')
+        ))
+
+        assert results[0] == 3
+        log("✓ HSET (multi-campo)")
+        assert results[1] == 'Juan'
+        log(f"✓ HGET: {results[1]}")
+        assert results[2] == {'nombre': 'Juan', 'email': 'juan@email.com', 'edad': '30'}
+        log(f"✓ HGETALL: {results[2]}")
 
         return True
     except Exception as e:
@@ -117,29 +143,26 @@ def test_hash():
         return False
 
 
-def test_listas():
+async def test_listas(client):
     """Prueba operaciones con listas."""
-    print("\n=== TEST: Operaciones de Lista ===")
+    titulo = "\n=== TEST: Operaciones de Lista ==="
 
     try:
-        # LPUSH y RPUSH
-        print("Añadiendo elementos a la lista...")
-        lpush('test:lista', 'primero')
-        rpush('test:lista', 'segundo', 'tercero')
-        print("✓ PUSH")
-
-        # LRANGE
-        print("Obteniendo elementos...")
-        elementos = lrange('test:lista')
-        print(f"✓ LRANGE: {elementos}")
-
-        # LPOP
-        print("Extrayendo primer elemento...")
-        primero = lpop('test:lista')
-        print(f"✓ LPOP: {primero}")
-
-        # Limpiar
-        delete_keys('test:lista')
+        results = await ejecutar_pipeline(client, titulo, lambda pipe: (
+            pipe
+            .lpush('test:lista', 'primero')
+            .rpush('test:lista', 'segundo', 'tercero')
+            .lrange('test:lista', 0, -1)
+            .lpop('test:lista')
+            .delete('test:lista')
+        ))
+
+        assert results[1] == 3
+        log("✓ PUSH")
+        assert results[2] == ['primero', 'segundo', 'tercero']
+        log(f"✓ LRANGE: {results[2]}")
+        assert results[3] == 'primero'
+        log(f"✓ LPOP: {results[3]}")
 
         return True
     except Exception as e:
@@ -147,29 +170,24 @@ def test_listas():
         return False
 
 
-def test_sets():
+async def test_sets(client):
     """Prueba operaciones con conjuntos."""
-    print("\n=== TEST: Operaciones de Conjunto (Set) ===")
+    titulo = "\n=== TEST: Operaciones de Conjunto (Set) ==="
 
     try:
-        # SADD
-        print("Añadiendo miembros al conjunto...")
-        sadd('test:usuarios:online', 'user:1', 'user:2', 'user:3')
-        print("✓ SADD")
-
-        # SMEMBERS
-        print("Obteniendo miembros...")
-        usuarios = smembers('test:usuarios:online')
-        print(f"✓ SMEMBERS: {usuarios}")
-
-        # SCARD
-        print("Contando miembros...")
-        count = scard('test:usuarios:online')
-        assert count == 3
-        print(f"✓ SCARD: {count}")
-
-        # Limpiar
-        delete_keys('test:usuarios:online')
+        results = await ejecutar_pipeline(client, titulo, lambda pipe: (
+            pipe
+            .sadd('test:usuarios:online', 'user:1', 'user:2', 'user:3')
+            .smembers('test:usuarios:online')
+            .scard('test:usuarios:online')
+            .delete('test:usuarios:online')
+        ))
+
+        log("✓ SADD")
+        assert results[1] == {'user:1', 'user:2', 'user:3'}
+        log(f"✓ SMEMBERS: {results[1]}")
+        assert results[2] == 3
+        log(f"✓ SCARD: {results[2]}")
 
         return True
     except Exception as e:
@@ -177,37 +195,114 @@ def test_sets():
         return False
 
 
-def test_contadores():
+async def test_contadores(client):
     """Prueba operaciones de contadores."""
-    print("\n=== TEST: Contadores ===")
+    titulo = "\n=== TEST: Contadores ==="
 
     try:
-        # INCR
-        print("Incrementando contador...")
-        val1 = incr('test:contador')
-        val2 = incr('test:contador')
-        val3 = incr('test:contador', amount=10)
-        print(f"✓ INCR: {val1} -> {val2} -> {val3}")
+        val1, val2, val3, val4, _ = await ejecutar_pipeline(client, titulo, lambda pipe: (
+            pipe
+            .incr('test:contador')
+            .incr('test:contador')
+            .incr('test:contador', amount=10)
+            .decr('test:contador', amount=5)
+            .delete('test:contador')
+        ))
+
+        assert (val2, val3, val4) == (val1 + 1, val1 + 11, val1 + 6)
+        log(f"✓ INCR: {val1} -> {val2} -> {val3}")
+        log(f"✓ DECR: {val4}")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        return False
 
-        # DECR
-        print("Decrementando contador...")
-        val4 = decr('test:contador', amount=5)
-        print(f"✓ DECR: {val4}")
 
-        # Limpiar
-        delete_keys('test:contador')
+def test_funciones_paquete():
+    """Prueba las funciones síncronas del paquete (una llamada a cada una)."""
+    log("\n=== TEST: Funciones del Paquete ===")
+
+    try:
+        # Strings
+        set_value('test:pkg:nombre', 'Juan Pérez', ex=10)
+        assert get_value('test:pkg:nombre') == 'Juan Pérez'
+        log("✓ set_value/get_value")
+
+        mset({'test:pkg:a': '1', 'test:pkg:b': {'id': 2}})
+        assert mget(['test:pkg:a', 'test:pkg:b'], as_json=True) == [1, {'id': 2}]
+        log("✓ mset/mget")
+
+        # Caché
+        cache_set('test:pkg:cache', {'id': 1, 'nombre': 'Producto 1'}, ttl=60)
+        assert cache_get('test:pkg:cache', as_json=True) == {'id': 1, 'nombre': 'Producto 1'}
+        assert cache_delete('test:pkg:cache') == 1
+        log("✓ cache_set/cache_get/cache_delete")
+
+        # Hashes
+        assert hset('test:pkg:usuario', 'nombre', 'Juan') == 1
+        assert hset_multi('test:pkg:usuario', {'email': 'juan@email.com', 'edad': '30'}) == 2
+        assert hget('test:pkg:usuario', 'nombre') == 'Juan'
+        assert hgetall('test:pkg:usuario') == {'nombre': 'Juan', 'email': 'juan@email.com', 'edad': '30'}
+        log("✓ hset/hset_multi/hget/hgetall")
+
+        # Listas
+        lpush('test:pkg:lista', 'primero')
+        assert rpush('test:pkg:lista', 'segundo', 'tercero') == 3
+        assert lrange('test:pkg:lista') == ['primero', 'segundo', 'tercero']
+        assert lpop('test:pkg:lista') == 'primero'
+        log("✓ lpush/rpush/lrange/lpop")
+
+        # Conjuntos
+        assert sadd('test:pkg:online', 'user:1', 'user:2', 'user:3') == 3
+        assert smembers('test:pkg:online') == {'user:1', 'user:2', 'user:3'}
+        assert scard('test:pkg:online') == 3
+        log("✓ sadd/smembers/scard")
+
+        # Contadores
+        val1 = incr('test:pkg:contador')
+        assert incr('test:pkg:contador', amount=10) == val1 + 10
+        assert decr('test:pkg:contador', amount=5) == val1 + 5
+        log("✓ incr/decr")
 
         return True
     except Exception as e:
         print(f"✗ Error: {e}")
         return False
+    finally:
+        delete_keys(
+            'test:pkg:nombre', 'test:pkg:a', 'test:pkg:b', 'test:pkg:usuario',
+            'test:pkg:lista', 'test:pkg:online', 'test:pkg:contador'
+        )
+
+
+async def run_concurrent_tests():
+    """Ejecuta las pruebas de funcionalidad de forma concurrente con un solo cliente asíncrono."""
+    pruebas = [
+        ('Operaciones Básicas', test_operaciones_basicas),
+        ('Caché', test_cache),
+        ('Hash', test_hash),
+        ('Listas', test_listas),
+        ('Sets', test_sets),
+        ('Contadores', test_contadores),
+    ]
+
+    client = get_async_redis_connection()
+    try:
+        resultados = await asyncio.gather(
+            *(prueba(client) for _, prueba in pruebas),
+            return_exceptions=True
+        )
+    finally:
+        await client.aclose()
+
+    # Una excepción no capturada por la prueba cuenta como fallo
+    return [(nombre, resultado is True) for (nombre, _), resultado in zip(pruebas, resultados)]
 
 
 def main():
     """Ejecuta todas las pruebas."""
-    print("=" * 60)
-    print("PRUEBAS DEL MÓDULO REDIS")
-    print("=" * 60)
+    print("=" * 60 + "\nPRUEBAS DEL MÓDULO REDIS\n" + "=" * 60)
 
     resultados = []
 
@@ -219,18 +314,14 @@ def main():
         print("\n✗ No se pudo conectar a Redis. Verifica la configuración.")
         return
 
-    # Pruebas de funcionalidad
-    resultados.append(('Operaciones Básicas', test_operaciones_basicas()))
-    resultados.append(('Caché', test_cache()))
-    resultados.append(('Hash', test_hash()))
-    resultados.append(('Listas', test_listas()))
-    resultados.append(('Sets', test_sets()))
-    resultados.append(('Contadores', test_contadores()))
+    # Pruebas de funcionalidad (concurrentes)
+    resultados.extend(asyncio.run(run_concurrent_tests()))
+
+    # Funciones síncronas del paquete
+    resultados.append(('Funciones del Paquete', test_funciones_paquete()))
 
     # Resumen
-    print("\n" + "=" * 60)
-    print("RESUMEN DE PRUEBAS")
-    print("=" * 60)
+    print("\n" + "=" * 60 + "\nRESUMEN DE PRUEBAS\n" + "=" * 60)
 
     exitosas = sum(1 for _, resultado in resultados if resultado)
     total = len(resultados)
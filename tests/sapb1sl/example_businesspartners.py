@@ -4,10 +4,11 @@ Ejemplo de consulta exacta al endpoint BusinessPartners usando sapb1sl.
 Este script replica la siguiente consulta OData:
 BusinessPartners?$inlinecount=allpages&$filter=CardType eq 'S'&$select=...
 """
-from paquetes.sapb1sl import query_entities
+from paquetes.sapb1sl import query_entities, query_entities_iter
 
-# Lista completa de campos según especificación del usuario
-CAMPOS_BUSINESSPARTNERS = ','.join([
+# Lista completa de campos según especificación del usuario (tupla inmutable,
+# reutilizable por quien necesite los campos por separado)
+CAMPOS_BUSINESSPARTNERS_TUPLA = (
     'CardCode', 'CardName', 'GroupCode', 'Address', 'ZipCode',
     'MailAddress', 'MailZipCode', 'Phone1', 'Phone2', 'Fax',
     'ContactPerson', 'PayTermsGrpCode', 'CreditLimit', 'MaxCommitment',
@@ -25,7 +26,10 @@ CAMPOS_BUSINESSPARTNERS = ','.join([
     'ShipToDefault', 'HouseBankBranch', 'VatGroupLatinAmerica',
     'HouseBankIBAN', 'UpdateDate', 'UpdateTime', 'CreateDate',
     'CreateTime'
-])
+)
+
+# $select ya armado, una sola vez al importar
+CAMPOS_BUSINESSPARTNERS = ','.join(CAMPOS_BUSINESSPARTNERS_TUPLA)
 
 
 def consultar_proveedores():
@@ -38,33 +42,45 @@ def consultar_proveedores():
     - $inlinecount=allpages  →  inlinecount=True
     - $filter=CardType eq 'S'  →  filter="CardType eq 'S'"
     - $select=...  →  select=CAMPOS_BUSINESSPARTNERS
+
+    El total se pide aparte (con un solo registro) y los proveedores se
+    recorren con query_entities_iter, de modo que la vista previa solo
+    descarga los 3 registros que muestra.
     """
 
     print("Ejecutando consulta a BusinessPartners...")
     print()
 
-    resultado = query_entities(
+    # Total sin descargar los registros: $inlinecount con un solo registro mínimo
+    total = query_entities(
         entity_name='BusinessPartners',
         filter="CardType eq 'S'",        # Solo proveedores (Suppliers)
-        select=CAMPOS_BUSINESSPARTNERS,   # Todos los campos especificados
+        select='CardCode',
         inlinecount=True,                 # $inlinecount=allpages
-        max_page_size=0                   # Sin límite, traer todos
-    )
+        top=1
+    )['count']
 
-    # El resultado es un dict con 'value' y 'count'
-    proveedores = resultado['value']
-    total = resultado['count']
+    # Registros página por página: solo se descarga lo que se consume
+    proveedores = []
+    for prov in query_entities_iter(
+        entity_name='BusinessPartners',
+        filter="CardType eq 'S'",
+        select=CAMPOS_BUSINESSPARTNERS,   # Todos los campos especificados
+        page_size=3
+    ):
+        proveedores.append(prov)
+        if len(proveedores) == 3:
+            break
 
     print(f"✓ Consulta completada exitosamente")
     print()
     print(f"Total de proveedores en SAP B1: {total}")
-    print(f"Proveedores obtenidos: {len(proveedores)}")
     print()
 
     # Mostrar algunos proveedores de ejemplo
     if proveedores:
         print("Primeros 3 proveedores:")
-        for i, prov in enumerate(proveedores[:3], 1):
+        for i, prov in enumerate(proveedores, 1):
             print(f"\n{i}. {prov['CardCode']} - {prov['CardName']}")
             print(f"   Ciudad: {prov.get('City', 'N/A')}")
             print(f"   País: {prov.get('Country', 'N/A')}")
@@ -73,7 +89,7 @@ def consultar_proveedores():
             print(f"   Activo: {prov.get('Valid', 'N/A')}")
             print(f"   Límite crédito: {prov.get('CreditLimit', 0)}")
 
-    return resultado
+    return {'value': proveedores, 'count': total}
 
 
 def consultar_proveedores_activos():
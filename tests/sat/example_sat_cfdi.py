@@ -17,9 +17,15 @@ Configuración requerida en .env:
     SAT_FIEL_CER (para descarga masiva)
     SAT_FIEL_KEY
     SAT_FIEL_PASSWORD
+
+Uso:
+    python example_sat_cfdi.py                          # menú interactivo
+    python example_sat_cfdi.py generar validar timbrar  # comandos en orden
 """
+import argparse
 import os
 import sys
+import xml.etree.ElementTree as ET
 
 # Agregar path para imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -42,6 +48,14 @@ from sat import (
 )
 
 
+# RFCs usados en demo_validar_rfc()
+RFCS_PRUEBA = (
+    'XAXX010101000',  # RFC genérico
+    'XEXX010101000',  # RFC genérico
+    'ABC123456XXX',   # RFC inválido
+)
+
+
 def demo_generar_cfdi():
     """Demo de generación de CFDI."""
     print("\n" + "=" * 60)
@@ -113,8 +127,14 @@ def demo_validar_cfdi(xml_cfdi):
         print("✗ No hay CFDI para validar")
         return
 
+    # Parsear una sola vez y compartir el árbol entre validación y extracción
+    try:
+        cfdi = ET.fromstring(xml_cfdi)
+    except ET.ParseError:
+        cfdi = xml_cfdi  # validate_cfdi_structure reporta el XML mal formado
+
     print("\n1. Validando estructura XML...")
-    result = validate_cfdi_structure(xml_cfdi)
+    result = validate_cfdi_structure(cfdi)
 
     if result['valid']:
         print("✓ Estructura válida")
@@ -131,7 +151,7 @@ def demo_validar_cfdi(xml_cfdi):
 
     print("\n2. Extrayendo datos del CFDI...")
     try:
-        datos = extract_cfdi_data(xml_cfdi)
+        datos = extract_cfdi_data(cfdi)
         print("✓ Datos extraídos:")
         print(f"  Emisor: {datos.get('emisor', {}).get('nombre')}")
         print(f"  Receptor: {datos.get('receptor', {}).get('nombre')}")
@@ -183,13 +203,7 @@ def demo_validar_rfc():
     print("DEMO: Validación de RFC")
     print("=" * 60)
 
-    rfcs_prueba = [
-        'XAXX010101000',  # RFC genérico
-        'XEXX010101000',  # RFC genérico
-        'ABC123456XXX',   # RFC inválido
-    ]
-
-    for rfc in rfcs_prueba:
+    for rfc in RFCS_PRUEBA:
         print(f"\n1. Validando RFC: {rfc}")
 
         # Validar formato
@@ -280,8 +294,69 @@ def demo_descarga_masiva():
         print(f"✗ Error: {result['error']}")
 
 
-def main():
-    """Función principal."""
+# Comandos de línea de comandos -> opción equivalente del menú
+COMANDOS = {
+    'generar': '1',
+    'validar': '2',
+    'timbrar': '3',
+    'rfc': '4',
+    'consultar': '5',
+    'descarga': '6',
+    'completo': '7',
+}
+
+
+def ejecutar_opcion(opcion, xml_cfdi=None):
+    """
+    Ejecuta una opción del menú reutilizando el CFDI ya generado.
+
+    Solo la opción 1 fuerza una nueva generación; validar, timbrar y el flujo
+    completo generan el CFDI únicamente si aún no existe uno.
+
+    Args:
+        opcion: Opción del menú ('1' a '7')
+        xml_cfdi: CFDI generado previamente (None si aún no hay)
+
+    Returns:
+        El CFDI vigente después de ejecutar la opción
+    """
+    if opcion == '1':
+        return demo_generar_cfdi()
+
+    if opcion in ('2', '3', '7'):
+        xml_cfdi = xml_cfdi or demo_generar_cfdi()
+        if xml_cfdi:
+            if opcion in ('2', '7'):
+                demo_validar_cfdi(xml_cfdi)
+            if opcion in ('3', '7'):
+                demo_timbrar_cfdi(xml_cfdi)
+    elif opcion == '4':
+        demo_validar_rfc()
+    elif opcion == '5':
+        demo_consultar_sat()
+    elif opcion == '6':
+        demo_descarga_masiva()
+    else:
+        print("Opción no válida")
+
+    return xml_cfdi
+
+
+def main(argv=None):
+    """
+    Función principal.
+
+    Sin argumentos muestra el menú interactivo. Con comandos los ejecuta en
+    orden compartiendo el mismo CFDI, p. ej.:
+
+        python example_sat_cfdi.py generar validar timbrar
+        python example_sat_cfdi.py completo
+    """
+    parser = argparse.ArgumentParser(description="Ejemplo de uso del módulo SAT (CFDI)")
+    parser.add_argument('comandos', nargs='*', choices=list(COMANDOS),
+                        help="Comandos a ejecutar en orden (sin comandos: menú interactivo)")
+    args = parser.parse_args(argv)
+
     print("\n")
     print("╔" + "=" * 58 + "╗")
     print("║" + " " * 10 + "EJEMPLO - MÓDULO SAT (CFDI)" + " " * 20 + "║")
@@ -297,11 +372,19 @@ def main():
         print("   Ejecutar: pip install satcfdi")
         print()
 
+    # El CFDI se genera una sola vez y se comparte entre opciones
+    xml_cfdi = None
+
+    if args.comandos:
+        for comando in args.comandos:
+            xml_cfdi = ejecutar_opcion(COMANDOS[comando], xml_cfdi)
+        return
+
     # Menú de opciones
     while True:
         print("\n" + "-" * 60)
         print("OPCIONES:")
-        print("  1. Generar CFDI")
+        print("  1. Generar CFDI (nuevo)")
         print("  2. Validar estructura de CFDI")
         print("  3. Timbrar CFDI con PAC")
         print("  4. Validar RFCs")
@@ -313,33 +396,11 @@ def main():
 
         opcion = input("\nSeleccione una opción: ").strip()
 
-        if opcion == '1':
-            xml_cfdi = demo_generar_cfdi()
-        elif opcion == '2':
-            xml_cfdi = demo_generar_cfdi()
-            if xml_cfdi:
-                demo_validar_cfdi(xml_cfdi)
-        elif opcion == '3':
-            xml_cfdi = demo_generar_cfdi()
-            if xml_cfdi:
-                demo_timbrar_cfdi(xml_cfdi)
-        elif opcion == '4':
-            demo_validar_rfc()
-        elif opcion == '5':
-            demo_consultar_sat()
-        elif opcion == '6':
-            demo_descarga_masiva()
-        elif opcion == '7':
-            # Flujo completo
-            xml_cfdi = demo_generar_cfdi()
-            if xml_cfdi:
-                demo_validar_cfdi(xml_cfdi)
-                demo_timbrar_cfdi(xml_cfdi)
-        elif opcion == '0':
+        if opcion == '0':
             print("\n¡Hasta luego!")
             break
-        else:
-            print("Opción no válida")
+
+        xml_cfdi = ejecutar_opcion(opcion, xml_cfdi)
 
 
 if __name__ == '__main__':
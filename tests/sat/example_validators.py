@@ -9,16 +9,132 @@ El usuario debe crear su propio validador según su sistema de autenticación
 
 Todos los validadores deben tener la firma:
     def validate_user(username: str, password: str) -> bool
+
+Los validadores que consultan un sistema externo guardan las validaciones
+exitosas durante AUTH_CACHE_TTL segundos (default: 30, 0 = sin caché), hasta
+AUTH_CACHE_SIZE entradas (default: 4096). Las fallidas nunca se guardan.
 """
+import asyncio
 import os
+import time
 import hashlib
-from typing import Optional
+import hmac
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from typing import Callable, Dict, Optional, Tuple
+
+# Dependencias opcionales: importadas una sola vez; los validadores que las
+# necesitan retornan False si no están instaladas
+try:
+    import bcrypt
+except ImportError:
+    bcrypt = None
+
+try:
+    import pyodbc
+    from paquetes.mssql import select_one as mssql_select_one
+    _MSSQL_ERRORS: tuple = (pyodbc.Error,)
+except ImportError:
+    mssql_select_one = None
+    _MSSQL_ERRORS = ()
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CACHÉ DE VALIDACIONES EXITOSAS
+# ============================================================================
+
+AUTH_CACHE_TTL = float(os.getenv('AUTH_CACHE_TTL') or 30)
+AUTH_CACHE_SIZE = int(os.getenv('AUTH_CACHE_SIZE') or 4096)
+
+# Llave HMAC por proceso: las llaves de la caché no sirven para atacar
+# offline las contraseñas aunque se vuelque la memoria
+_AUTH_CACHE_SECRET = os.urandom(32)
+
+# llave -> (expiración en reloj monotónico, usuario); el orden del dict es
+# el de uso (LRU): la primera entrada es la menos usada recientemente
+_auth_cache: Dict[bytes, Tuple[float, str]] = {}
+_auth_cache_lock = threading.Lock()
+
+
+def _auth_cache_key(validator: str, username: str, password: str) -> bytes:
+    return hashlib.blake2b(
+        f"{validator}|{username}|{password}".encode(),
+        key=_AUTH_CACHE_SECRET,
+        digest_size=16
+    ).digest()
+
+
+def cache_successful_auth(func: Callable[[str, str], bool]) -> Callable[[str, str], bool]:
+    """
+    Decorador que guarda las validaciones exitosas durante AUTH_CACHE_TTL segundos.
+
+    Solo se guardan resultados True: una contraseña errónea siempre vuelve a
+    consultar el sistema externo, así los reintentos fallidos siguen llegando
+    a él (y a sus políticas de bloqueo).
+
+    Args:
+        func: Validador con firma (username, password) -> bool
+    """
+    @wraps(func)
+    def wrapper(username: str, password: str) -> bool:
+        if AUTH_CACHE_TTL <= 0:
+            return func(username, password)
+
+        key = _auth_cache_key(func.__name__, username, password)
+        now = time.monotonic()
+        with _auth_cache_lock:
+            entry = _auth_cache.pop(key, None)
+            if entry is not None and now < entry[0]:
+                # Reinsertar al final la marca como la más reciente
+                _auth_cache[key] = entry
+                return True
+
+        if not func(username, password):
+            return False
+
+        with _auth_cache_lock:
+            _auth_cache.pop(key, None)
+            while len(_auth_cache) >= AUTH_CACHE_SIZE:
+                del _auth_cache[next(iter(_auth_cache))]
+            _auth_cache[key] = (now + AUTH_CACHE_TTL, username)
+        return True
+    return wrapper
+
+
+def clear_auth_cache() -> None:
+    """Vacía la caché de validaciones (por ejemplo, tras cambiar o revocar una contraseña)."""
+    with _auth_cache_lock:
+        _auth_cache.clear()
+
+
+def invalidate_user(username: str) -> int:
+    """
+    Elimina de la caché las validaciones de un usuario.
+
+    Llamar después de cambiar su contraseña, desactivarlo o revocar su acceso.
+
+    Args:
+        username: Nombre de usuario
+
+    Returns:
+        Número de entradas eliminadas
+    """
+    with _auth_cache_lock:
+        keys = [key for key, (_, user) in _auth_cache.items() if user == username]
+        for key in keys:
+            del _auth_cache[key]
+    return len(keys)
 
 
 # ============================================================================
 # EJEMPLO 1: Validación contra base de datos MSSQL
 # ============================================================================
 
+@cache_successful_auth
 def validate_user_mssql(username: str, password: str) -> bool:
     """
     Valida usuario contra tabla USERS en MSSQL.
@@ -37,19 +153,24 @@ def validate_user_mssql(username: str, password: str) -> bool:
     Returns:
         True si credenciales son válidas, False en caso contrario
     """
-    from paquetes.mssql import select_one
+    if mssql_select_one is None:
+        return False
 
     try:
-        # Hash de la contraseña
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
-
-        # Buscar usuario
-        user = select_one(
+        # Buscar usuario solo por nombre; el hash se compara en Python
+        user = mssql_select_one(
             'USERS',
-            where={'Username': username, 'PasswordHash': password_hash, 'Active': 1}
+            columns=['PasswordHash'],
+            where="Username = ? AND Active = 1",
+            where_params=(username,)
         )
 
-        return user is not None
+        if not user:
+            return False
+
+        # Comparación en tiempo constante (evita ataques de timing)
+        password_hash = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(password_hash, user[0].lower())
 
     except Exception:
         return False
@@ -59,6 +180,7 @@ def validate_user_mssql(username: str, password: str) -> bool:
 # EJEMPLO 2: Validación contra LDAP/Active Directory
 # ============================================================================
 
+@cache_successful_auth
 def validate_user_ldap(username: str, password: str) -> bool:
     """
     Valida usuario contra LDAP/Active Directory usando el paquete ldap.
@@ -122,6 +244,7 @@ def validate_user_hardcoded(username: str, password: str) -> bool:
 # EJEMPLO 4: Validación contra SAP HANA
 # ============================================================================
 
+@cache_successful_auth
 def validate_user_hana(username: str, password: str) -> bool:
     """
     Valida usuario contra tabla USERS en SAP HANA.
@@ -140,19 +263,24 @@ def validate_user_hana(username: str, password: str) -> bool:
     Returns:
         True si credenciales son válidas, False en caso contrario
     """
-    from paquetes.hana import select
+    from paquetes.hana import select_one
 
     try:
-        # Hash de la contraseña
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
-
-        # Buscar usuario
-        users = select(
+        # Buscar usuario con parámetros: el texto SQL es siempre el mismo, así
+        # que HANA reutiliza el plan de su caché y no hay inyección SQL
+        user = select_one(
             'USERS',
-            where=f"USERNAME = '{username}' AND PASSWORD_HASH = '{password_hash}' AND ACTIVE = 1"
+            columns=['PASSWORD_HASH'],
+            where="USERNAME = ? AND ACTIVE = 1",
+            where_params=(username,)
         )
 
-        return len(users) > 0
+        if not user:
+            return False
+
+        # Comparación en tiempo constante (evita ataques de timing)
+        password_hash = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(password_hash, user[0].lower())
 
     except Exception:
         return False
@@ -162,6 +290,15 @@ def validate_user_hana(username: str, password: str) -> bool:
 # EJEMPLO 5: Validación con bcrypt (recomendado para producción)
 # ============================================================================
 
+# Costo de los hashes bcrypt guardados (BCRYPT_ROUNDS, default: 12)
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS') or 12)
+
+# Hash de referencia para usuarios inexistentes: se genera una sola vez al
+# importar y con el mismo costo que los guardados, para que tarde lo mismo
+_DUMMY_HASH = bcrypt.hashpw(b'dummy', bcrypt.gensalt(rounds=BCRYPT_ROUNDS)) if bcrypt else None
+
+
+@cache_successful_auth
 def validate_user_bcrypt(username: str, password: str) -> bool:
     """
     Valida usuario con bcrypt (más seguro que SHA256).
@@ -177,7 +314,7 @@ def validate_user_bcrypt(username: str, password: str) -> bool:
 
     Para crear hash:
         import bcrypt
-        password_hash = bcrypt.hashpw('password'.encode(), bcrypt.gensalt()).decode()
+        password_hash = bcrypt.hashpw('password'.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
     Args:
         username: Nombre de usuario
@@ -186,19 +323,143 @@ def validate_user_bcrypt(username: str, password: str) -> bool:
     Returns:
         True si credenciales son válidas, False en caso contrario
     """
-    try:
-        import bcrypt
-        from paquetes.mssql import select_one
+    if bcrypt is None or mssql_select_one is None:
+        return False
 
+    try:
         # Buscar usuario
-        user = select_one('USERS', where={'Username': username, 'Active': 1})
+        user = mssql_select_one(
+            'USERS',
+            columns=['PasswordHash'],
+            where="Username = ? AND Active = 1",
+            where_params=(username,)
+        )
 
-        if not user:
+        if not user or not isinstance(user[0], str):
+            # Ejecutar un checkpw de todas formas: la respuesta tarda lo mismo
+            # exista o no el usuario (o tenga PasswordHash NULL), y no revela
+            # qué usuarios existen
+            bcrypt.checkpw(password.encode(), _DUMMY_HASH)
             return False
 
-        # Verificar contraseña con bcrypt
-        stored_hash = user['PasswordHash'].encode()
+        # Verificar contraseña con bcrypt (compara en tiempo constante)
+        stored_hash = user[0].encode()
         return bcrypt.checkpw(password.encode(), stored_hash)
 
-    except Exception:
+    except _MSSQL_ERRORS as e:
+        logger.error("Error al consultar USERS: %s", e)
+        return False
+    except ValueError as e:
+        # PasswordHash guardado no es un hash bcrypt válido
+        logger.error("Hash bcrypt inválido para el usuario %s: %s", username, e)
+        return False
+
+
+# ============================================================================
+# EJEMPLO 6: Validación con Argon2id (con compatibilidad bcrypt)
+# ============================================================================
+
+@lru_cache(maxsize=1)
+def _argon2_hasher():
+    """PasswordHasher de Argon2id compartido (parámetros de RFC 9106, perfil de baja memoria)."""
+    from argon2 import PasswordHasher
+    return PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=2)
+
+
+@lru_cache(maxsize=1)
+def _dummy_argon2_hash() -> str:
+    """Hash Argon2id de referencia, para igualar el tiempo de usuarios inexistentes."""
+    return _argon2_hasher().hash('')
+
+
+@cache_successful_auth
+def validate_user_argon2(username: str, password: str) -> bool:
+    """
+    Valida usuario con Argon2id; las filas con hash bcrypt se siguen aceptando.
+
+    El algoritmo se elige por el prefijo del hash guardado ($argon2id$ o
+    $2b$), así se puede migrar la tabla de bcrypt a Argon2id poco a poco.
+
+    Requiere: pip install argon2-cffi (y bcrypt para las filas antiguas)
+
+    Misma tabla USERS que validate_user_bcrypt, con PasswordHash NVARCHAR(100).
+
+    Para crear hash:
+        from argon2 import PasswordHasher
+        password_hash = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2).hash('password')
+
+    Args:
+        username: Nombre de usuario
+        password: Contraseña en texto plano
+
+    Returns:
+        True si credenciales son válidas, False en caso contrario
+    """
+    if mssql_select_one is None:
+        return False
+    try:
+        from argon2.exceptions import VerificationError, InvalidHashError
+    except ImportError:
+        return False
+
+    try:
+        user = mssql_select_one(
+            'USERS',
+            columns=['PasswordHash'],
+            where="Username = ? AND Active = 1",
+            where_params=(username,)
+        )
+
+        found = bool(user) and isinstance(user[0], str)
+        stored_hash = user[0] if found else _dummy_argon2_hash()
+
+        if stored_hash.startswith('$2'):
+            if bcrypt is None:
+                return False
+            return bcrypt.checkpw(password.encode(), stored_hash.encode())
+
+        valid = _argon2_hasher().verify(stored_hash, password)
+
+        # Con usuario inexistente se verificó el hash de referencia solo por tiempo
+        return found and valid
+
+    except _MSSQL_ERRORS as e:
+        logger.error("Error al consultar USERS: %s", e)
         return False
+    except (VerificationError, InvalidHashError):
+        # Contraseña incorrecta o PasswordHash que no es un hash Argon2 válido
+        return False
+    except ValueError as e:
+        # PasswordHash guardado no es un hash bcrypt válido
+        logger.error("Hash bcrypt inválido para el usuario %s: %s", username, e)
+        return False
+
+
+# Hilos compartidos para bcrypt: checkpw libera el GIL, así que varias
+# verificaciones corren en paralelo (una por núcleo) sin bloquear el event loop
+_BCRYPT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 4,
+    thread_name_prefix='bcrypt'
+)
+
+
+async def validate_user_bcrypt_async(username: str, password: str) -> bool:
+    """
+    Versión para código asíncrono (FastAPI) de validate_user_bcrypt.
+
+    Ejecuta la consulta y bcrypt.checkpw (~100 ms) en un pool de hilos para
+    que el event loop siga atendiendo otras peticiones.
+
+    Args:
+        username: Nombre de usuario
+        password: Contraseña en texto plano
+
+    Returns:
+        True si credenciales son válidas, False en caso contrario
+
+    Example:
+        >>> if not await validate_user_bcrypt_async(username, password):
+        ...     raise HTTPException(status_code=401)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_EXECUTOR, validate_user_bcrypt, username, password)
@@ -35,17 +35,22 @@ Uso básico:
     # Agregar router a FastAPI
     app.include_router(router)
 
+    # O crear y cerrar el cliente junto con la aplicación
+    app = FastAPI(lifespan=whatsapp_lifespan)
+    app.include_router(router)
+
 Documentación:
     Ver README.md en este directorio para guía completa.
 """
 from .client import EvolutionAPIClient, MessageType
-from .router import router, set_evolution_client
+from .router import router, set_evolution_client, whatsapp_lifespan
 
 __all__ = [
     "EvolutionAPIClient",
     "MessageType",
     "router",
     "set_evolution_client",
+    "whatsapp_lifespan",
 ]
 
 __version__ = "2.0.0"
@@ -16,6 +16,12 @@ Configuración requerida en tu aplicación (main.py):
     # Agregar router
     app.include_router(router)
 
+O bien, dejar que FastAPI cree y cierre el cliente con la aplicación:
+    from paquetes.whatsapp import router, whatsapp_lifespan
+
+    app = FastAPI(lifespan=whatsapp_lifespan)
+    app.include_router(router)
+
 Endpoints disponibles:
 - POST /whatsapp/send-text - Enviar mensaje de texto
 - POST /whatsapp/send-image - Enviar imagen
@@ -24,9 +30,11 @@ Endpoints disponibles:
 - GET /whatsapp/qr/{instance} - Obtener QR code
 - GET /whatsapp/status/{instance} - Verificar estado de conexión
 """
-from fastapi import APIRouter, HTTPException, status
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, HTTPException, status
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 import logging
 
 from .client import EvolutionAPIClient, MessageType
@@ -78,8 +86,42 @@ def get_evolution_client() -> EvolutionAPIClient:
     return _evolution_client
 
 
+@asynccontextmanager
+async def whatsapp_lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Lifespan de FastAPI que comparte un solo cliente durante toda la aplicación.
+
+    Crea el EvolutionAPIClient al arrancar (lee EVOLUTION_API_URL y
+    EVOLUTION_API_KEY del .env), lo registra con set_evolution_client y al
+    apagar cierra sus conexiones keep-alive.
+
+    Args:
+        app: Aplicación FastAPI
+
+    Example:
+        >>> from fastapi import FastAPI
+        >>> from paquetes.whatsapp import router, whatsapp_lifespan
+        >>> app = FastAPI(lifespan=whatsapp_lifespan)
+        >>> app.include_router(router)
+    """
+    global _evolution_client
+    with EvolutionAPIClient() as client:
+        set_evolution_client(client)
+        try:
+            yield
+        finally:
+            _evolution_client = None
+
+
+# Serializar respuestas con orjson si está instalado (opcional: pip install orjson)
+try:
+    import orjson  # noqa: F401
+    _ResponseClass = ORJSONResponse
+except ImportError:
+    _ResponseClass = JSONResponse
+
 # Crear router
-router = APIRouter(prefix="/whatsapp", tags=["WhatsApp"])
+router = APIRouter(prefix="/whatsapp", tags=["WhatsApp"], default_response_class=_ResponseClass)
 
 
 # ======================
@@ -165,6 +207,37 @@ class MessageResponse(BaseModel):
 # Endpoints
 # ======================
 
+def _send_error(instance: str, what: str, error: Exception) -> HTTPException:
+    """
+    Convierte un error de envío en la respuesta HTTP del endpoint.
+
+    Los endpoints de envío no consultan el estado de la instancia antes de
+    enviar: si no está conectada, Evolution API responde 4xx y aquí se
+    traduce a 400. Cualquier otro error es 500.
+
+    Args:
+        instance: Nombre de la instancia
+        what: Qué se enviaba ("mensaje", "imagen", "documento")
+        error: Excepción del envío
+
+    Returns:
+        HTTPException a lanzar
+    """
+    response = getattr(error.__cause__, 'response', None)
+    upstream_status = getattr(response, 'status_code', None) or 0
+    if 400 <= upstream_status < 500:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"La instancia '{instance}' no está conectada o Evolution API rechazó el envío: {str(error)}"
+        )
+
+    logger.error("Error al enviar %s: %s", what, error)
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Error al enviar {what}: {str(error)}"
+    )
+
+
 @router.post("/send-text", response_model=MessageResponse, status_code=status.HTTP_200_OK)
 async def send_text_message(request: SendTextRequest):
     """
@@ -178,13 +251,6 @@ async def send_text_message(request: SendTextRequest):
     try:
         client = get_evolution_client()
 
-        # Verificar que la instancia esté conectada
-        if not client.is_instance_connected(request.instance):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"La instancia '{request.instance}' no está conectada"
-            )
-
         # Formatear número de teléfono
         formatted_number = client.format_phone_number(request.number)
 
@@ -196,9 +262,7 @@ async def send_text_message(request: SendTextRequest):
             delay=request.delay
         )
 
-        logger.info(
-            f"Mensaje enviado a {formatted_number} desde {request.instance}"
-        )
+        logger.info("Mensaje enviado a %s desde %s", formatted_number, request.instance)
 
         return MessageResponse(
             success=True,
@@ -209,11 +273,7 @@ async def send_text_message(request: SendTextRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error al enviar mensaje: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al enviar mensaje: {str(e)}"
-        )
+        raise _send_error(request.instance, "mensaje", e)
 
 
 @router.post("/send-image", response_model=MessageResponse, status_code=status.HTTP_200_OK)
@@ -229,12 +289,6 @@ async def send_image(request: SendImageRequest):
     try:
         client = get_evolution_client()
 
-        if not client.is_instance_connected(request.instance):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"La instancia '{request.instance}' no está conectada"
-            )
-
         formatted_number = client.format_phone_number(request.number)
 
         result = client.send_image(
@@ -244,9 +298,7 @@ async def send_image(request: SendImageRequest):
             caption=request.caption
         )
 
-        logger.info(
-            f"Imagen enviada a {formatted_number} desde {request.instance}"
-        )
+        logger.info("Imagen enviada a %s desde %s", formatted_number, request.instance)
 
         return MessageResponse(
             success=True,
@@ -257,11 +309,7 @@ async def send_image(request: SendImageRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error al enviar imagen: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al enviar imagen: {str(e)}"
-        )
+        raise _send_error(request.instance, "imagen", e)
 
 
 @router.post("/send-document", response_model=MessageResponse, status_code=status.HTTP_200_OK)
@@ -277,12 +325,6 @@ async def send_document(request: SendDocumentRequest):
     try:
         client = get_evolution_client()
 
-        if not client.is_instance_connected(request.instance):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"La instancia '{request.instance}' no está conectada"
-            )
-
         formatted_number = client.format_phone_number(request.number)
 
         result = client.send_document(
@@ -292,9 +334,7 @@ async def send_document(request: SendDocumentRequest):
             file_name=request.file_name
         )
 
-        logger.info(
-            f"Documento enviado a {formatted_number} desde {request.instance}"
-        )
+        logger.info("Documento enviado a %s desde %s", formatted_number, request.instance)
 
         return MessageResponse(
             success=True,
@@ -305,11 +345,7 @@ async def send_document(request: SendDocumentRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error al enviar documento: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al enviar documento: {str(e)}"
-        )
+        raise _send_error(request.instance, "documento", e)
 
 
 @router.get("/instances", status_code=status.HTTP_200_OK)
@@ -333,7 +369,7 @@ async def list_instances():
         }
 
     except Exception as e:
-        logger.error(f"Error al listar instancias: {str(e)}")
+        logger.error("Error al listar instancias: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al listar instancias: {str(e)}"
@@ -362,7 +398,7 @@ async def get_qr_code(instance: str):
         }
 
     except Exception as e:
-        logger.error(f"Error al obtener QR code: {str(e)}")
+        logger.error("Error al obtener QR code: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al obtener QR code: {str(e)}"
@@ -395,7 +431,7 @@ async def get_instance_status(instance: str):
         }
 
     except Exception as e:
-        logger.error(f"Error al verificar estado: {str(e)}")
+        logger.error("Error al verificar estado: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al verificar estado: {str(e)}"
@@ -420,7 +456,7 @@ async def create_instance(request: CreateInstanceRequest):
             integration=request.integration
         )
 
-        logger.info(f"Instancia creada: {request.instance_name}")
+        logger.info("Instancia creada: %s", request.instance_name)
 
         return {
             "success": True,
@@ -429,7 +465,7 @@ async def create_instance(request: CreateInstanceRequest):
         }
 
     except Exception as e:
-        logger.error(f"Error al crear instancia: {str(e)}")
+        logger.error("Error al crear instancia: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al crear instancia: {str(e)}"
@@ -450,7 +486,7 @@ async def delete_instance(instance: str):
         client = get_evolution_client()
         result = client.delete_instance(instance)
 
-        logger.info(f"Instancia eliminada: {instance}")
+        logger.info("Instancia eliminada: %s", instance)
 
         return {
             "success": True,
@@ -459,7 +495,7 @@ async def delete_instance(instance: str):
         }
 
     except Exception as e:
-        logger.error(f"Error al eliminar instancia: {str(e)}")
+        logger.error("Error al eliminar instancia: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al eliminar instancia: {str(e)}"